@@ -15,6 +15,12 @@ except Exception:
     StreamlitInvalidHeightError = Exception
 import streamlit.components.v1 as components
 
+try:
+    from PIL import Image, features as pil_features
+except Exception:  # Pillow 미설치 시 원본 이미지만 사용
+    Image = None
+    pil_features = None
+
 
 def scroll_to_top(delay_ms: int = 0) -> None:
     """Best-effort scroll-to-top.
@@ -39,490 +45,41 @@ def scroll_to_top(delay_ms: int = 0) -> None:
 
 import os
 import re
+import sys
 import difflib
 import html
 import random
+import math
+import hashlib
+import mimetypes
+import threading
+import zlib
+import gzip
+import atexit
+from collections import deque
+import heapq
+import sqlite3
+from collections import Counter
+from contextlib import closing, contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows 등: 파일 잠금 없이 프로세스 내 잠금만 사용
+    fcntl = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except Exception:  # pyarrow 미설치 시 컬럼형 스냅샷 없이 CSV에서 바로 읽음
+    pa = None
+    pq = None
 
 # =========================================================
 # 1) 페이지 설정 / 스타일
 # =========================================================
 st.set_page_config(page_title="2026 컴플라이언스 어드벤처", layout="wide")
 
-st.markdown("""
-<style>
-.stApp {
-    background-color: #0E1117;
-    color: #EAEAEA;
-}
-.block-container, [data-testid="stMainBlockContainer"] {
-    max-width: 1280px;
-    margin: 0 auto;
-    padding-top: 6.8rem !important;
-    padding-bottom: 2.4rem !important;
-    padding-left: 2.1rem !important;
-    padding-right: 2.1rem !important;
-}
-@media (max-width: 900px) {
-    .block-container, [data-testid="stMainBlockContainer"] {
-        padding-top: 3.2rem !important;
-        padding-left: 0.9rem !important;
-        padding-right: 0.9rem !important;
-    }
-}
-
-/* 전체 가독성(다크 배경) */
-html, body, [data-testid="stAppViewContainer"], [data-testid="stMainBlockContainer"] {
-    color: #F4F7FF !important;
-}
-h1, h2, h3, h4, h5, h6, p, li {
-    color: #F4F7FF !important;
-}
-[data-testid="stMarkdownContainer"] p,
-[data-testid="stMarkdownContainer"] li,
-[data-testid="stMarkdownContainer"] span {
-    color: #F4F7FF !important;
-}
-label, .stCaption, small {
-    color: #DDE6F7 !important;
-}
-
-/* 퀴즈 선택지 / 입력창 가독성 */
-div[role="radiogroup"] label,
-div[role="radiogroup"] label * {
-    color: #F7FAFF !important;
-}
-[data-testid="stRadio"] > label {
-    color: #EAF1FF !important;
-    font-weight: 700 !important;
-    font-size: 1rem !important;
-}
-div[role="radiogroup"] > label {
-    background: #151D29;
-    border: 1px solid #2D3A50;
-    border-radius: 12px;
-    padding: 10px 12px;
-    margin: 0 0 8px 0;
-    line-height: 1.45;
-}
-div[role="radiogroup"] > label:hover {
-    border-color: #3F5C86;
-    background: #182233;
-}
-[data-testid="stTextArea"] textarea,
-[data-testid="stTextInput"] input {
-    background: #161A22 !important;
-    color: #F7FAFF !important;
-    border: 1px solid #334158 !important;
-}
-[data-testid="stTextArea"] textarea::placeholder,
-[data-testid="stTextInput"] input::placeholder {
-    color: #AEBBD0 !important;
-    opacity: 1 !important;
-}
-
-/* 버튼 */
-div.stButton > button[kind="secondary"],
-div.stButton > button[kind="tertiary"],
-div.stButton > button:first-child {
-    background-color: #00C853 !important;
-    color: #FFFFFF !important;
-    border-radius: 12px !important;
-    border: none !important;
-    font-weight: 700 !important;
-    min-height: 44px !important;
-}
-div.stButton > button[kind="secondary"]:hover,
-div.stButton > button[kind="tertiary"]:hover,
-div.stButton > button:first-child:hover {
-    filter: brightness(1.05);
-}
-
-/* Gold blur (subtle) for key action buttons */
-div.stButton > button[kind="primary"] {
-    background: linear-gradient(135deg, rgba(212,175,55,0.35), rgba(212,175,55,0.18)) !important;
-    border: 1px solid rgba(212,175,55,0.42) !important;
-    color: #0E1117 !important;
-    border-radius: 12px !important;
-    font-weight: 800 !important;
-    min-height: 44px !important;
-    box-shadow: 0 6px 18px rgba(212,175,55,0.12) !important;
-}
-div.stButton > button[kind="primary"]:hover {
-    filter: brightness(1.03);
-    box-shadow: 0 8px 22px rgba(212,175,55,0.16) !important;
-}
-
-/* Disabled button readability */
-div.stButton > button:disabled {
-    opacity: 0.55 !important;
-    cursor: not-allowed !important;
-}
- /* 카드 */
-.card {
-    background: #161A22;
-    border: 1px solid #2B3140;
-    border-radius: 14px;
-    padding: 14px 16px;
-    margin-bottom: 10px;
-}
-.card-title {
-    font-weight: 700;
-    margin-bottom: 6px;
-}
-
-/* 미션 헤더 */
-.mission-header {
-    background: linear-gradient(135deg, #17202B, #11151C);
-    border: 1px solid #2A3140;
-    border-left: 6px solid #00C853;
-    border-radius: 14px;
-    padding: 14px 16px;
-    margin-bottom: 10px;
-}
-
-/* 브리핑 카드 */
-.brief-box {
-    background: #151A23;
-    border: 1px solid #2A3140;
-    border-radius: 12px;
-    padding: 12px 14px;
-    min-height: 180px;
-}
-.brief-title {
-    font-weight: 800;
-    margin-bottom: 8px;
-}
-.brief-chip {
-    display: inline-block;
-    background: #243043;
-    color: #D8E6FF;
-    border-radius: 999px;
-    padding: 4px 10px;
-    font-size: 0.82rem;
-    margin-right: 6px;
-    margin-bottom: 6px;
-}
-
-/* 맵 전환 페이드 효과 */
-@keyframes mapFadeIn {
-    0%   { opacity: 0; transform: scale(0.995); }
-    100% { opacity: 1; transform: scale(1); }
-}
-.map-fade-wrap {
-    width: 100%;
-    max-width: 1060px;
-    margin: 0 auto 6px auto;
-}
-.map-fade-img {
-    width: 100%;
-    height: auto;
-    border-radius: 12px;
-    animation: mapFadeIn 0.28s ease-out;
-    display: block;
-}
-
-/* 대시보드 카드 */
-.dash-grid {
-    display: grid;
-    grid-template-columns: repeat(2, minmax(0,1fr));
-    gap: 10px;
-    margin: 8px 0 12px 0;
-}
-.dash-card {
-    background: linear-gradient(135deg, #141B24, #10151D);
-    border: 1px solid #2B3140;
-    border-radius: 14px;
-    padding: 12px 14px;
-}
-.dash-card .label {
-    font-size: 0.8rem;
-    color: #B7C4D8;
-    margin-bottom: 4px;
-}
-.dash-card .value {
-    font-size: 1.15rem;
-    font-weight: 800;
-    color: #F5F7FA;
-}
-.rank-card {
-    background: #131922;
-    border: 1px solid #2B3140;
-    border-radius: 12px;
-    padding: 10px 12px;
-    margin-bottom: 8px;
-}
-.rank-title {
-    font-weight: 700;
-    margin-bottom: 6px;
-}
-.rank-meta {
-    color: #B7C4D8;
-    font-size: 0.82rem;
-    margin-top: 4px;
-}
-.rank-bar {
-    width: 100%;
-    height: 8px;
-    border-radius: 999px;
-    background: #202938;
-    overflow: hidden;
-}
-.rank-fill {
-    height: 100%;
-    background: linear-gradient(90deg, #00C853, #55EFC4);
-}
-.admin-lock {
-    background: linear-gradient(135deg, #1E1A10, #17120B);
-    border: 1px solid #7A5C21;
-    border-radius: 14px;
-    padding: 14px;
-    margin-bottom: 10px;
-}
-
-/* 퀴즈/브리핑 레이아웃 여백 */
-.quiz-question-box {
-    background: #111824;
-    border: 1px solid #2A3344;
-    border-radius: 14px;
-    padding: 14px 16px;
-    margin-bottom: 10px;
-}
-.quiz-question-kicker {
-    color: #9FB2D4;
-    font-size: 0.85rem;
-    font-weight: 700;
-    margin-bottom: 4px;
-}
-.quiz-question-title {
-    color: #F8FBFF;
-    font-size: 1.95rem;
-    font-weight: 800;
-    line-height: 1.22;
-    letter-spacing: -0.01em;
-}
-.quiz-help-text {
-    color: #C6D5EE;
-    font-size: 0.95rem;
-    margin-bottom: 8px;
-}
-.quiz-left-image-wrap {
-    background: #121826;
-    border: 1px solid #2A3344;
-    border-radius: 14px;
-    padding: 10px;
-    margin-bottom: 10px;
-}
-.quiz-left-caption {
-    color: #D7E4FB;
-    text-align: center;
-    margin-top: 6px;
-    font-weight: 600;
-}
-.quiz-side-tip {
-    line-height: 1.55;
-}
-.brief-actions-wrap {
-    margin-top: 6px;
-}
-.stTextArea textarea {
-    font-size: 0.98rem !important;
-    line-height: 1.5 !important;
-}
-@media (max-width: 1200px) {
-    .quiz-question-title {
-        font-size: 1.65rem;
-    }
-}
-@media (max-width: 900px) {
-    .quiz-question-title {
-        font-size: 1.25rem;
-        line-height: 1.3;
-    }
-    div[role="radiogroup"] > label {
-        padding: 8px 10px;
-    }
-}
-
-/* 직원 확인 모달용 읽기 전용 정보 박스 (검은 disabled input 대체) */
-.modal-readonly-field {
-    margin-top: 2px;
-}
-.modal-readonly-label {
-    font-size: 0.82rem;
-    color: #95A4BF !important;
-    font-weight: 700;
-    margin: 0 0 6px 2px;
-}
-.modal-readonly-value {
-    background: #F6F8FC;
-    color: #1A2433 !important;
-    border: 1px solid #D5DEEC;
-    border-radius: 10px;
-    padding: 10px 12px;
-    min-height: 42px;
-    display: flex;
-    align-items: center;
-    font-weight: 600;
-    line-height: 1.25;
-    box-shadow: inset 0 1px 0 rgba(255,255,255,0.7);
-}
-
-
-
-/* 다이얼로그(직원 정보 확인) 가독성 보정 */
-div[data-testid="stDialog"] [role="dialog"] {
-    background: #FFFFFF !important;
-    color: #172233 !important;
-}
-div[data-testid="stDialog"] h1,
-div[data-testid="stDialog"] h2,
-div[data-testid="stDialog"] h3,
-div[data-testid="stDialog"] h4,
-div[data-testid="stDialog"] label,
-div[data-testid="stDialog"] p,
-div[data-testid="stDialog"] span,
-div[data-testid="stDialog"] div,
-div[data-testid="stDialog"] small {
-    color: #172233;
-}
-div[data-testid="stDialog"] [data-testid="stMarkdownContainer"] * {
-    color: #172233 !important;
-}
-div[data-testid="stDialog"] [data-testid="stCaptionContainer"] * {
-    color: #4A5A74 !important;
-}
-div[data-testid="stDialog"] [data-testid="stDataFrame"] * {
-    color: #172233 !important;
-}
-div[data-testid="stDialog"] [data-testid="stSelectbox"] > label,
-div[data-testid="stDialog"] [data-testid="stTextInput"] > label {
-    color: #42526B !important;
-    font-weight: 700 !important;
-}
-div[data-testid="stDialog"] [data-testid="stDialogHeader"] * {
-    color: #172233 !important;
-}
-div[data-testid="stDialog"] button[kind="header"] svg {
-    color: #172233 !important;
-}
-
-/* 인트로 참가자 확인(메인화면) 읽기 전용 정보 카드 */
-.confirm-readonly-field {
-    margin-top: 2px;
-}
-.confirm-readonly-label {
-    font-size: 0.82rem;
-    color: #B8C7E2 !important;
-    font-weight: 700;
-    margin: 0 0 6px 2px;
-}
-.confirm-readonly-value {
-    background: #F6F8FC;
-    color: #1A2433 !important;
-    border: 1px solid #D5DEEC;
-    border-radius: 10px;
-    padding: 10px 12px;
-    min-height: 42px;
-    display: flex;
-    align-items: center;
-    font-weight: 700;
-    line-height: 1.25;
-}
-
-/* 퀴즈 하단 네비게이션 */
-.quiz-nav-wrap {
-    margin-top: 14px;
-    padding-top: 10px;
-    border-top: 1px solid #243044;
-}
-.quiz-nav-hint {
-    color: #AFC3E6;
-    font-size: 0.84rem;
-    margin-bottom: 8px;
-}
-
-
-/* Gold highlight for key phrases */
-.gold {
-    color: #D4AF37 !important;
-    font-weight: 900 !important;
-    background: rgba(212, 175, 55, 0.10) !important;
-    border: 1px solid rgba(212, 175, 55, 0.28) !important;
-    padding: 0.05rem 0.28rem !important;
-    border-radius: 0.45rem !important;
-    text-shadow: 0 0 8px rgba(212,175,55,0.14) !important;
-    white-space: normal;
-}
-
-/* Gold text (no bright blur) */
-.gold-text {
-    color: #D4AF37 !important;
-    font-weight: 900 !important;
-    text-shadow: 0 0 6px rgba(212,175,55,0.10) !important;
-}
-.brief-chip.gold-chip {
-    border-color: rgba(212,175,55,0.55) !important;
-    color: #D4AF37 !important;
-}
-
-/* Toast (top-right popup) readability fix (Streamlit st.toast) */
-div[data-testid="stToast"], div[data-testid="stToast"] > div {
-    background: rgba(17,24,39,0.96) !important;
-    color: rgba(255,255,255,0.96) !important;
-    border: 1px solid rgba(212,175,55,0.25) !important;
-    box-shadow: 0 16px 45px rgba(0,0,0,0.45) !important;
-}
-div[data-testid="stToast"] * {
-    color: rgba(255,255,255,0.96) !important;
-}
-
-/* Fallback selectors for older/newer Streamlit builds */
-.stToast, .stToast > div {
-    background: rgba(17,24,39,0.96) !important;
-    color: rgba(255,255,255,0.96) !important;
-    border: 1px solid rgba(212,175,55,0.25) !important;
-}
-.stToast * { color: rgba(255,255,255,0.96) !important; }
-
-
-
-/* Stage status boxes on map (flow guidance) */
-.stage-box {
-    border-radius: 12px;
-    padding: 10px 12px;
-    border: 1px solid #2B3140;
-    background: #141B24;
-    color: #F4F7FF;
-    font-weight: 800;
-    line-height: 1.2;
-    min-height: 44px;
-    display: flex;
-    align-items: center;
-    justify-content: center;
-    text-align: center;
-}
-.stage-box .stage-title { font-weight: 900; margin-bottom: 4px; }
-.stage-box .stage-sub { font-weight: 700; color: #B7C4D8; font-size: 0.86rem; margin-top: 4px; }
-.stage-clear {
-    background: #0F1622;
-    border-color: #2B3140;
-}
-.stage-locked {
-    background: rgba(0,200,83,0.18);
-    border-color: rgba(0,200,83,0.35);
-    color: #F7FFF9;
-}
-
-/* Sidebar readability (electronic board) */
-[data-testid="stSidebar"] {
-    background-color: #0B1220 !important;
-    color: #EAEAEA !important;
-}
-[data-testid="stSidebar"] * {
-    color: #EAEAEA !important;
-}
-</style>
-""", unsafe_allow_html=True)
+# 스타일은 app.css 에 있다. 메인 화면 분기 직전에 inject_app_styles()로 연결한다.
 
 
 
@@ -584,18 +141,22 @@ def safe_dataframe(data, **kwargs):
 
 
 
-def safe_button(label: str, *, key: str | None = None, use_container_width: bool = False, disabled: bool = False, primary: bool = False) -> bool:
+def safe_button(label: str, *, key: str | None = None, use_container_width: bool = False, disabled: bool = False, primary: bool = False, on_click=None, args: tuple | None = None) -> bool:
     """
     Streamlit 버전별 버튼 API 차이를 흡수하는 안전 래퍼.
     - 최신: st.button(..., type="primary") 지원
     - 구버전: type 인자를 받지 않으므로 자동 fallback
+    - on_click/args: 클릭 시 스크립트 재실행 전에 호출되는 콜백 (st.button과 동일)
     """
+    kwargs = {"key": key, "use_container_width": use_container_width, "disabled": disabled}
+    if on_click is not None:
+        kwargs.update(on_click=on_click, args=tuple(args or ()))
     if not primary:
-        return st.button(label, key=key, use_container_width=use_container_width, disabled=disabled)
+        return st.button(label, **kwargs)
     try:
-        return st.button(label, key=key, use_container_width=use_container_width, disabled=disabled, type="primary")
+        return st.button(label, type="primary", **kwargs)
     except TypeError:
-        return st.button(label, key=key, use_container_width=use_container_width, disabled=disabled)
+        return st.button(label, **kwargs)
 
 
 def render_top_spacer():
@@ -670,9 +231,16 @@ LOG_FIELDNAMES = [
     "awarded_score",
     "max_score",
     "attempt_no_for_mission",
+    "selected_option_index",
+    "content_version",
 ]
 
+ATTEMPT_INDEX_FILE = BASE_DIR / ".compliance_attempt_index.json"
+
 RESULTS_FILE = BASE_DIR / "training_results.csv"
+RESULTS_DB_FILE = BASE_DIR / "training_results.sqlite3"
+# 최종 결과 저장소: sqlite(기본, WAL 모드 upsert) / csv(기존 방식: 파일 전체 재작성)
+RESULTS_BACKEND = os.environ.get("COMPLIANCE_RESULTS_BACKEND", "sqlite").strip().lower()
 RESULT_FIELDNAMES = [
     "employee_no",
     "name",
@@ -688,22 +256,236 @@ RESULT_FIELDNAMES = [
 ]
 
 
+# =========================
+# 프로세스 공유 저장소
+# =========================
+def _new_process_store() -> dict:
+    return {"lock": threading.RLock()}
+
+
+if hasattr(st, "cache_resource"):
+    @st.cache_resource(show_spinner=False)
+    def _process_store(name: str) -> dict:
+        """세션/리런과 무관하게 프로세스 전체에서 공유되는 저장소(dict + lock).
+
+        Streamlit은 리런마다 스크립트를 다시 실행하므로 모듈 전역 변수는 유지되지 않는다.
+        """
+        return _new_process_store()
+else:
+    def _process_store(name: str) -> dict:
+        stores = st.__dict__.setdefault("_compliance_process_stores", {})
+        if name not in stores:
+            stores[name] = _new_process_store()
+        return stores[name]
+
+
+def _file_signature(path: Path):
+    """파일 변경 감지용 (크기, mtime_ns). 파일이 없으면 None."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return [int(stat.st_size), int(stat.st_mtime_ns)]
+
+
+def _write_json_atomic(path: Path, data) -> None:
+    tmp = path.with_name(f"{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+    try:
+        tmp.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+
+
 # =========================
 # Final Results (1인 1레코드)
 # =========================
-def _ensure_results_file():
-    if not RESULTS_FILE.exists():
-        with RESULTS_FILE.open("w", newline="", encoding="utf-8-sig") as f:
-            w = csv.DictWriter(f, fieldnames=RESULT_FIELDNAMES)
-            w.writeheader()
+class _CsvResultsStore:
+    """training_results.csv 한 파일에 1인 1레코드를 보관 (제출마다 전체 재작성)."""
+
+    name = "csv"
+
+    def ensure(self) -> None:
+        if not RESULTS_FILE.exists():
+            with RESULTS_FILE.open("w", newline="", encoding="utf-8-sig") as f:
+                w = csv.DictWriter(f, fieldnames=RESULT_FIELDNAMES)
+                w.writeheader()
+
+    def load_df(self) -> pd.DataFrame:
+        return _read_results_csv(RESULTS_FILE)
+
+    def upsert(self, row: dict):
+        """반환: (기록 직전 서명, 기록 직후 서명) — 둘 다 파일 잠금 안에서 잰다."""
+        self.ensure()
+        with open(RESULTS_FILE, "rb") as lock_f, _file_lock(lock_f):
+            before = self.signature()
+            df = self.load_df()
+            emp = str(row.get("employee_no", "")).strip()
+            if emp:
+                df = df[df["employee_no"].astype(str).str.strip() != emp].copy()
+            df = pd.concat([df, pd.DataFrame([row])], ignore_index=True)
+            if "ended_at" in df.columns:
+                df["_ended_sort"] = pd.to_datetime(df["ended_at"], errors="coerce")
+                df = df.sort_values("_ended_sort", ascending=False).drop(columns=["_ended_sort"])
+            df.to_csv(RESULTS_FILE, index=False, encoding="utf-8-sig")
+            return before, self.signature()
+
+    def signature(self):
+        return [_file_signature(RESULTS_FILE)]
+
+    def export_csv(self, path: Path) -> int:
+        df = self.load_df()
+        if Path(path) != RESULTS_FILE:
+            df.to_csv(path, index=False, encoding="utf-8-sig")
+        return len(df)
+
+
+class _SqliteResultsStore:
+    """SQLite(WAL) 최종 결과 저장소. 사번(없으면 소속|이름) 기준 upsert라 제출 비용이 결과 수와 무관하다.
+
+    - 최초 생성 시 기존 training_results.csv 내용을 한 번 가져온다.
+    - export_csv로 training_results.csv 형식 그대로 내보낼 수 있다.
+    """
 
-def _load_results_df() -> pd.DataFrame:
-    if not RESULTS_FILE.exists():
+    name = "sqlite"
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self._ready = False
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        conn = sqlite3.connect(str(self.db_path), timeout=10.0)
+        conn.execute("PRAGMA busy_timeout=10000")
+        return conn
+
+    def ensure(self) -> None:
+        if self._ready and self.db_path.exists():
+            return
+        with self._lock:
+            cols_sql = ", ".join(f"{c} TEXT NOT NULL DEFAULT ''" for c in RESULT_FIELDNAMES)
+            with closing(self._connect()) as conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+                with conn:
+                    conn.execute(
+                        f"CREATE TABLE IF NOT EXISTS final_results (person_key TEXT PRIMARY KEY, {cols_sql}, updated_at REAL NOT NULL DEFAULT 0)"
+                    )
+                    conn.execute("CREATE INDEX IF NOT EXISTS idx_final_results_ended_at ON final_results(ended_at)")
+                    conn.execute("CREATE TABLE IF NOT EXISTS store_meta (key TEXT PRIMARY KEY, value TEXT)")
+                    imported = conn.execute("SELECT value FROM store_meta WHERE key='csv_imported'").fetchone()
+                    if imported is None:
+                        self._import_csv(conn, RESULTS_FILE)
+                        conn.execute("INSERT OR REPLACE INTO store_meta(key, value) VALUES ('csv_imported', ?)", (datetime.now().strftime("%Y-%m-%d %H:%M:%S"),))
+            self._ready = True
+
+    @staticmethod
+    def _person_key(row: dict) -> str:
+        emp = str(row.get("employee_no", "") or "").strip()
+        if emp:
+            return emp
+        org = str(row.get("organization", "") or "").strip()
+        name = str(row.get("name", "") or "").strip()
+        return f"{org}|{name}"
+
+    @staticmethod
+    def _clean_row(row: dict) -> dict:
+        out = {}
+        for c in RESULT_FIELDNAMES:
+            v = row.get(c)
+            v = "" if v is None else str(v)
+            out[c] = "" if v in ("nan", "NaT") else v
+        return out
+
+    def _upsert_rows(self, conn, rows) -> None:
+        cols = ", ".join(RESULT_FIELDNAMES)
+        marks = ", ".join("?" for _ in RESULT_FIELDNAMES)
+        updates = ", ".join(f"{c}=excluded.{c}" for c in RESULT_FIELDNAMES)
+        now_ts = time.time()
+        params = []
+        for row in rows:
+            clean = self._clean_row(row)
+            params.append([self._person_key(clean)] + [clean[c] for c in RESULT_FIELDNAMES] + [now_ts])
+        conn.executemany(
+            f"INSERT INTO final_results (person_key, {cols}, updated_at) VALUES (?, {marks}, ?) "
+            f"ON CONFLICT(person_key) DO UPDATE SET {updates}, updated_at=excluded.updated_at",
+            params,
+        )
+        conn.execute(
+            "INSERT INTO store_meta(key, value) VALUES ('write_seq', '1') "
+            "ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1"
+        )
+
+    @staticmethod
+    def _write_seq(conn) -> int:
+        row = conn.execute("SELECT value FROM store_meta WHERE key='write_seq'").fetchone()
+        return int(row[0]) if row else 0
+
+    def _import_csv(self, conn, csv_path: Path) -> None:
+        df = _read_results_csv(csv_path)
+        if df.empty:
+            return
+        df = df.fillna("")
+        # 오래된 것부터 넣어 동일인은 최신 종료시각 레코드가 남도록 함
+        df["_ended_sort"] = pd.to_datetime(df["ended_at"], errors="coerce")
+        df = df.sort_values("_ended_sort", ascending=True, na_position="first").drop(columns=["_ended_sort"])
+        self._upsert_rows(conn, df.to_dict("records"))
+
+    def load_df(self) -> pd.DataFrame:
+        self.ensure()
+        cols = ", ".join(RESULT_FIELDNAMES)
+        with closing(self._connect()) as conn:
+            rows = conn.execute(f"SELECT {cols} FROM final_results ORDER BY ended_at DESC").fetchall()
+        return pd.DataFrame(rows, columns=RESULT_FIELDNAMES, dtype=str)
+
+    def upsert(self, row: dict):
+        """반환: (기록 직전 서명, 기록 직후 서명). 둘 다 같은 쓰기 트랜잭션(BEGIN IMMEDIATE) 안에서 잰다."""
+        self.ensure()
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                ino = [self._db_inode()]
+                before = ino + [self._write_seq(conn)]
+                self._upsert_rows(conn, [row])
+                after = ino + [self._write_seq(conn)]
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+        return before, after
+
+    def _db_inode(self):
+        try:
+            return int(self.db_path.stat().st_ino)
+        except OSError:
+            return None
+
+    def signature(self):
+        """(DB 파일 inode, 쓰기 일련번호). WAL 체크포인트/연결 종료만으로는 바뀌지 않는다."""
+        if not self.db_path.exists():
+            return [None, 0]
+        self.ensure()
+        with closing(self._connect()) as conn:
+            return [self._db_inode(), self._write_seq(conn)]
+
+    def export_csv(self, path: Path) -> int:
+        df = self.load_df()
+        tmp = Path(path).with_name(f"{Path(path).name}.{uuid.uuid4().hex[:8]}.tmp")
+        df.to_csv(tmp, index=False, encoding="utf-8-sig")
+        os.replace(tmp, path)
+        return len(df)
+
+
+def _read_results_csv(path: Path) -> pd.DataFrame:
+    if not path.exists():
         return pd.DataFrame(columns=RESULT_FIELDNAMES)
     try:
-        df = pd.read_csv(RESULTS_FILE, dtype=str, encoding="utf-8-sig")
+        df = pd.read_csv(path, dtype=str, encoding="utf-8-sig")
     except Exception:
-        df = pd.read_csv(RESULTS_FILE, dtype=str, encoding="utf-8")
+        df = pd.read_csv(path, dtype=str, encoding="utf-8")
     if df is None:
         return pd.DataFrame(columns=RESULT_FIELDNAMES)
     df = df.copy()
@@ -712,6 +494,64 @@ def _load_results_df() -> pd.DataFrame:
             df[c] = ""
     return df[RESULT_FIELDNAMES].copy()
 
+
+def _results_store():
+    store = _process_store("results_backend")
+    with store["lock"]:
+        backend = store.get("backend")
+        if backend is None or backend.name != RESULTS_BACKEND:
+            backend = _SqliteResultsStore(RESULTS_DB_FILE) if RESULTS_BACKEND == "sqlite" else _CsvResultsStore()
+            store["backend"] = backend
+        return backend
+
+
+def _ensure_results_file():
+    _results_store().ensure()
+
+def _load_results_df() -> pd.DataFrame:
+    return _results_store().load_df()
+
+_BACKUP_RESULT_FILES = [
+    BASE_DIR / "compliance_training_log.csv",
+    ADMIN_BACKUP_RESULTS_FILE,
+]
+_BACKUP_REQUIRED_COLUMNS = ["사번", "소속기관", "참여시각", "종료시각", "참여시간(초)", "최종점수", "득점률(%)", "등급", "시도ID", "회차"]
+
+
+def _sniff_final_result_backup_header(path: Path) -> bool:
+    """첫 줄(헤더)만 읽어 최종결과형 백업 CSV인지 판단. 응시 로그 전체를 읽지 않기 위함."""
+    try:
+        with path.open("rb") as f:
+            first = f.readline(64 * 1024)
+    except OSError:
+        return False
+    text, _enc = _decode_log_bytes(first)
+    if not text:
+        return False
+    try:
+        header = [str(c).strip() for c in next(csv.reader([text.splitlines()[0]]))]
+    except (StopIteration, csv.Error, IndexError):
+        return False
+    return all(c in header for c in _BACKUP_REQUIRED_COLUMNS) and ("이름" in header or "이름.1" in header)
+
+
+def _backup_file_signature(path: Path):
+    """최종결과형 백업 CSV면 파일 서명, 아니면 None. 헤더 판별은 파일 서명이 바뀔 때만 다시 한다."""
+    sig = _file_signature(path)
+    if sig is None:
+        return None
+    store = _process_store("backup_result_files")
+    with store["lock"]:
+        hit = store.get(str(path))
+        if hit is None or hit[0] != sig:
+            hit = store[str(path)] = (sig, _sniff_final_result_backup_header(path))
+    return sig if hit[1] else None
+
+
+def _is_final_result_backup_file(path: Path) -> bool:
+    return _backup_file_signature(path) is not None
+
+
 def _load_backup_results_df() -> pd.DataFrame:
     """관리자 대시보드용 백업 최종결과 로드.
 
@@ -719,14 +559,9 @@ def _load_backup_results_df() -> pd.DataFrame:
     - 기존 compliance_training_log.csv(최종결과형 백업)가 있으면 함께 반영
     - 관리자 업로드 전용 admin_uploaded_results_backup.csv도 함께 반영
     """
-    candidate_files = [
-        BASE_DIR / "compliance_training_log.csv",
-        ADMIN_BACKUP_RESULTS_FILE,
-    ]
-
     frames = []
-    for backup_file in candidate_files:
-        if not backup_file.exists():
+    for backup_file in _BACKUP_RESULT_FILES:
+        if not _is_final_result_backup_file(backup_file):
             continue
         try:
             raw = pd.read_csv(backup_file, dtype=str, encoding="utf-8-sig")
@@ -736,39 +571,8 @@ def _load_backup_results_df() -> pd.DataFrame:
             except Exception:
                 continue
 
-        if raw is None or raw.empty:
-            continue
-
-        cols = {str(c).strip(): c for c in raw.columns}
-        required = ["사번","소속기관","참여시각","종료시각","참여시간(초)","최종점수","득점률(%)","등급","시도ID","회차"]
-        if not all(k in cols for k in required):
-            continue
-
-        name_col = cols.get("이름") or cols.get("이름.1")
-        if not name_col:
-            continue
-
-        out = pd.DataFrame({
-            "employee_no": raw[cols["사번"]].astype(str),
-            "name": raw[name_col].astype(str),
-            "organization": raw[cols["소속기관"]].astype(str),
-            "participated_at": raw[cols["참여시각"]].astype(str),
-            "ended_at": raw[cols["종료시각"]].astype(str),
-            "duration_sec": raw[cols["참여시간(초)"]].astype(str),
-            "final_score": raw[cols["최종점수"]].astype(str),
-            "score_rate": raw[cols["득점률(%)"]].astype(str),
-            "grade": raw[cols["등급"]].astype(str),
-            "training_attempt_id": raw[cols["시도ID"]].astype(str),
-            "attempt_round": raw[cols["회차"]].astype(str),
-        })
-        for c in RESULT_FIELDNAMES:
-            if c not in out.columns:
-                out[c] = ""
-        out = out[RESULT_FIELDNAMES].copy()
-        for c in RESULT_FIELDNAMES:
-            out[c] = out[c].fillna("").astype(str).replace({"nan":"", "NaT":""}).str.strip()
-        out = out[(out["employee_no"] != "") | (out["name"] != "")].copy()
-        if not out.empty:
+        out = _backup_raw_to_results_df(raw)
+        if out is not None and not out.empty:
             frames.append(out)
 
     if not frames:
@@ -779,6 +583,42 @@ def _load_backup_results_df() -> pd.DataFrame:
     return merged[RESULT_FIELDNAMES].copy()
 
 
+def _backup_raw_to_results_df(raw: pd.DataFrame):
+    """최종결과형 백업 CSV(한글 헤더)를 RESULT_FIELDNAMES 형식으로 변환. 형식이 아니면 None."""
+    if raw is None or raw.empty:
+        return None
+
+    cols = {str(c).strip(): c for c in raw.columns}
+    if not all(k in cols for k in _BACKUP_REQUIRED_COLUMNS):
+        return None
+
+    name_col = cols.get("이름") or cols.get("이름.1")
+    if not name_col:
+        return None
+
+    out = pd.DataFrame({
+        "employee_no": raw[cols["사번"]].astype(str),
+        "name": raw[name_col].astype(str),
+        "organization": raw[cols["소속기관"]].astype(str),
+        "participated_at": raw[cols["참여시각"]].astype(str),
+        "ended_at": raw[cols["종료시각"]].astype(str),
+        "duration_sec": raw[cols["참여시간(초)"]].astype(str),
+        "final_score": raw[cols["최종점수"]].astype(str),
+        "score_rate": raw[cols["득점률(%)"]].astype(str),
+        "grade": raw[cols["등급"]].astype(str),
+        "training_attempt_id": raw[cols["시도ID"]].astype(str),
+        "attempt_round": raw[cols["회차"]].astype(str),
+    })
+    for c in RESULT_FIELDNAMES:
+        if c not in out.columns:
+            out[c] = ""
+    out = out[RESULT_FIELDNAMES].copy()
+    for c in RESULT_FIELDNAMES:
+        out[c] = out[c].fillna("").astype(str).replace({"nan":"", "NaT":""}).str.strip()
+    out = out[(out["employee_no"] != "") | (out["name"] != "")].copy()
+    return out
+
+
 def _dedupe_final_result_backup_rows(df: pd.DataFrame) -> pd.DataFrame:
     """최종 결과 백업 CSV를 1인 1건(최신 종료시각 우선) 기준으로 정리."""
     if df is None:
@@ -815,7 +655,11 @@ def _dedupe_final_result_backup_rows(df: pd.DataFrame) -> pd.DataFrame:
     return out
 
 def _merge_results_for_admin() -> pd.DataFrame:
-    """관리자 대시보드용 최종 결과. 현재 데이터 + 백업 데이터 병합."""
+    """관리자 대시보드용 최종 결과. 현재 데이터 + 백업 데이터 병합 (컬럼형 스냅샷 경유)."""
+    return _results_snapshot_frame()[RESULT_FIELDNAMES].copy()
+
+
+def _merge_results_frame() -> pd.DataFrame:
     live = _load_results_df().copy()
     backup = _load_backup_results_df().copy()
     if live.empty and backup.empty:
@@ -837,27 +681,93 @@ def _merge_results_for_admin() -> pd.DataFrame:
     df = df.sort_values("ended_at", ascending=False, na_position="last")
     return df[RESULT_FIELDNAMES].copy()
 
+RESULTS_SOURCES_RECHECK_SEC = 2.0
+
+
+def _results_sources_signature():
+    """최종 결과 원천(결과 저장소 + 백업 CSV) 변경 감지용 서명."""
+    backups = [_backup_file_signature(p) for p in _BACKUP_RESULT_FILES]
+    return [RESULTS_BACKEND, _results_store().signature(), backups]
+
+
+def _results_sources_changed(store: dict):
+    """캐시(store)의 원천 서명이 낡았으면 현재 서명을, 아니면 None을 반환한다. store["lock"] 보유 상태에서 호출.
+
+    다른 인스턴스의 기록은 RESULTS_SOURCES_RECHECK_SEC 간격으로만 stat 해서 확인한다
+    (이 프로세스의 기록은 _note_final_results가 바로 반영).
+    """
+    now_ts = time.time()
+    if store.get("sig") is not None and now_ts - float(store.get("checked_at", 0) or 0) < RESULTS_SOURCES_RECHECK_SEC:
+        return None
+    store["checked_at"] = now_ts
+    sig = _results_sources_signature()
+    return None if sig == store.get("sig") else sig
+
+
+def _completed_employee_set() -> set:
+    """이수 완료 사번 집합 (프로세스 공유). 원천 파일이 바깥에서 바뀐 경우에만 다시 만든다."""
+    store = _process_store("completed_employees")
+    with store["lock"]:
+        sig = _results_sources_changed(store)
+        if sig is not None or store.get("emp") is None:
+            sig = sig if sig is not None else _results_sources_signature()
+            emp = set()
+            for df in (_load_results_df(), _load_backup_results_df()):
+                if df is not None and not df.empty:
+                    emp.update(v for v in df["employee_no"].fillna("").astype(str).str.strip() if v and v != "nan")
+            store["emp"] = emp
+            store["sig"] = sig
+        return store["emp"]
+
+
+def _note_final_results(df: pd.DataFrame, source: str = "live", *, prev_sig=None, new_sig=None) -> None:
+    """직접 기록한 최종 결과(RESULT_FIELDNAMES 형식)를 이수자 집합/기관 전광판 집계에 반영한다.
+
+    source: "live"(결과 저장소 upsert) 또는 "backup"(관리자 백업 병합)
+    prev_sig/new_sig: 기록 직전/직후의 원천 서명(new_sig 생략 시 지금 잰다). 캐시가 prev_sig 기준이면
+    제자리 반영 후 new_sig로 맞추고, 아니면(그 사이 다른 인스턴스가 기록했거나 캐시가 이미 낡았으면)
+    캐시를 무효화해 다음 조회 때 재구성한다.
+    """
+    if df is None or df.empty:
+        return
+    df = _normalize_result_frame(df)
+    sig = new_sig if new_sig is not None else _results_sources_signature()
+
+    store = _process_store("completed_employees")
+    with store["lock"]:
+        if store.get("emp") is not None:
+            if prev_sig is not None and store.get("sig") == prev_sig:
+                store["emp"].update(v for v in df["employee_no"] if v)
+                store["sig"] = sig
+            else:
+                store.update(emp=None, sig=None)
+
+    board = _process_store("org_scoreboard")
+    with board["lock"]:
+        if board.get("persons") is not None:
+            if prev_sig is not None and board.get("sig") == prev_sig:
+                changed = _fold_result_rows(board["persons"], df, source, replace=(source == "live"), members=board["members"])
+                _refresh_scoreboard_orgs(board, changed)
+                board["sig"] = sig
+            else:
+                board.update(persons=None, sig=None)
+
+
 def _has_completed(employee_no: str) -> bool:
     employee_no = str(employee_no or "").strip()
     if not employee_no:
         return False
-    df = _merge_results_for_admin()
-    if df.empty:
-        return False
-    return (df["employee_no"].astype(str).str.strip() == employee_no).any()
+    return employee_no in _completed_employee_set()
 
 def _upsert_final_result(row: dict) -> None:
-    _ensure_results_file()
     row = {k: ("" if row.get(k) is None else row.get(k)) for k in RESULT_FIELDNAMES}
-    df = _load_results_df()
-    emp = str(row.get("employee_no", "")).strip()
-    if emp:
-        df = df[df["employee_no"].astype(str).str.strip() != emp].copy()
-    df = pd.concat([df, pd.DataFrame([row])], ignore_index=True)
-    if "ended_at" in df.columns:
-        df["_ended_sort"] = pd.to_datetime(df["ended_at"], errors="coerce")
-        df = df.sort_values("_ended_sort", ascending=False).drop(columns=["_ended_sort"])
-    df.to_csv(RESULTS_FILE, index=False, encoding="utf-8-sig")
+    backups = [_backup_file_signature(p) for p in _BACKUP_RESULT_FILES]
+    before, after = _results_store().upsert(row)
+    _note_final_results(
+        pd.DataFrame([row]), "live",
+        prev_sig=[RESULTS_BACKEND, before, backups],
+        new_sig=[RESULTS_BACKEND, after, backups],
+    )
 
 def save_final_result_if_needed(force: bool = False) -> None:
     if st.session_state.get("final_result_saved", False) and not force:
@@ -944,6 +854,131 @@ def _load_org_targets() -> dict:
         out[org] = tgt
     return out
 
+# ---------------------------------------------------------
+# 기관 전광판 집계 (프로세스 공유, 증분 갱신)
+#   persons : 인원키 -> {"live": rec, "backup": rec}  (rec = 기관, 사번, 득점률, 종료시각, 정렬용 ts)
+#   members : 기관 -> 인원키 집합
+#   aggs    : 기관 -> 참여자수/득점률 합계/인원수/최근 종료시각
+# 결과가 기록되면 바뀐 기관만 다시 집계하고, 순위/파생 컬럼은 기관 수 만큼만 계산한다.
+# ---------------------------------------------------------
+ORG_SCOREBOARD_COLUMNS = [
+    "rank","organization","participants","target",
+    "participation_rate","participation_rate_score",
+    "avg_score_rate","cumulative_score","score_sum_rate",
+    "last_activity",
+]
+
+
+def _normalize_result_frame(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.copy()
+    for c in RESULT_FIELDNAMES:
+        if c not in df.columns:
+            df[c] = ""
+        df[c] = df[c].fillna("").astype(str).replace({"nan":"", "NaT":""}).str.strip()
+    return df[RESULT_FIELDNAMES]
+
+
+def _score_rate_value(value) -> float:
+    try:
+        x = float(value)
+    except Exception:
+        return 0.0
+    return 0.0 if x != x else x
+
+
+def _effective_result(person: dict):
+    """_merge_results_for_admin과 같은 규칙: 종료시각 최신 우선, 같으면 결과 저장소(live) 우선."""
+    live, backup = person.get("live"), person.get("backup")
+    if live is None or backup is None:
+        return live if backup is None else backup
+    if backup[4] is not None and (live[4] is None or backup[4] > live[4]):
+        return backup
+    return live
+
+
+def _fold_result_rows(persons: dict, df: pd.DataFrame, source: str, *, replace: bool = False, members: dict | None = None) -> set:
+    """정규화된 결과 행을 persons에 반영하고, 영향을 받은 기관 집합을 반환한다.
+
+    같은 인원의 같은 원천 안에서는 종료시각이 더 늦은 행이 이긴다(같으면 먼저 읽은 행 유지).
+    replace=True면 종료시각과 무관하게 대체한다(결과 저장소 upsert와 동일).
+    members(기관 -> 인원키 집합)를 주면 유효 결과의 기관이 바뀐 인원만 옮긴다.
+    """
+    changed = set()
+    if df is None or df.empty:
+        return changed
+    ts_list = [None if pd.isna(t) else int(t.value) for t in pd.to_datetime(df["ended_at"], errors="coerce")]
+    cols = [df[c].tolist() for c in ("employee_no", "organization", "name", "score_rate", "ended_at")]
+    for (emp, org, name, rate, ended), ts in zip(zip(*cols), ts_list):
+        key = emp if emp else f"{org}|{name}"
+        rec = (org, emp, _score_rate_value(rate), ended, ts)
+        person = persons.setdefault(key, {"live": None, "backup": None})
+        before = _effective_result(person)
+        cur = person[source]
+        if replace or cur is None or (ts is not None and (cur[4] is None or ts > cur[4])):
+            person[source] = rec
+        after = _effective_result(person)
+        if before is not after:
+            if before is not None:
+                changed.add(before[0])
+                if members is not None:
+                    old_members = members.get(before[0])
+                    if old_members is not None:
+                        old_members.discard(key)
+                        if not old_members:
+                            members.pop(before[0], None)
+            changed.add(after[0])
+            if members is not None:
+                members.setdefault(after[0], set()).add(key)
+    return changed
+def _org_aggregate(persons: dict, keys) -> dict:
+    recs = [_effective_result(persons[k]) for k in keys]
+    return {
+        "participants": len({r[1] for r in recs}),
+        "count": len(recs),
+        "score_sum_rate": math.fsum(r[2] for r in recs),
+        "last_activity": max(r[3] for r in recs),
+    }
+
+
+def _refresh_scoreboard_orgs(board: dict, orgs) -> None:
+    """바뀐 기관만 aggs를 다시 계산한다 (members는 _fold_result_rows가 제자리 갱신)."""
+    orgs = set(orgs)
+    if not orgs:
+        return
+    members = board["members"]
+    for org in orgs:
+        if org in members:
+            board["aggs"][org] = _org_aggregate(board["persons"], members[org])
+        else:
+            board["aggs"].pop(org, None)
+    board["frame"] = None
+
+
+def _org_scoreboard_state() -> dict:
+    board = _process_store("org_scoreboard")
+    with board["lock"]:
+        sig = _results_sources_changed(board)
+        if sig is not None or board.get("persons") is None:
+            sig = sig if sig is not None else _results_sources_signature()
+            persons, members = {}, {}
+            _fold_result_rows(persons, _normalize_result_frame(_load_results_df()), "live", members=members)
+            _fold_result_rows(persons, _normalize_result_frame(_load_backup_results_df()), "backup", members=members)
+            board.update({"persons": persons, "members": members, "aggs": {}, "frame": None, "sig": sig})
+            _refresh_scoreboard_orgs(board, members.keys())
+        return board
+
+
+def _org_targets_cached():
+    """org_targets.csv 매핑을 파일 서명 기준으로 캐시. 반환: (targets, 서명)"""
+    store = _process_store("org_targets")
+    sig = _file_signature(BASE_DIR / "org_targets.csv")
+    with store["lock"]:
+        if "targets" not in store or store.get("sig") != sig:
+            store["targets"] = _load_org_targets()
+            store["sig"] = sig
+        return store["targets"], sig
+
+
 def compute_org_scoreboard() -> pd.DataFrame:
     """기관별 집계(1인 1레코드 최종결과 기반)
 
@@ -951,31 +986,33 @@ def compute_org_scoreboard() -> pd.DataFrame:
     - 참여율점수 : 목표 대비 참여율(%)을 점수화(5.0~10.0)
     - 누적점수(총점) : 참여율점수 + 평균점수(%)
       (행사 목적상 '참여 독려 + 학습 성과'를 한 지표로 랭킹화)
+
+    기관별 집계는 _org_scoreboard_state()가 증분으로 유지하며, 여기서는 기관 수 만큼만 계산한다.
     """
-    df = _merge_results_for_admin()
-    cols = [
-        "rank","organization","participants","target",
-        "participation_rate","participation_rate_score",
-        "avg_score_rate","cumulative_score","score_sum_rate",
-        "last_activity",
-    ]
-    if df.empty:
+    board = _org_scoreboard_state()
+    with board["lock"]:
+        targets, targets_sig = _org_targets_cached()
+        if board.get("frame") is None or board.get("frame_targets") != targets_sig:
+            board["frame"] = _org_scoreboard_frame(board["aggs"], targets)
+            board["frame_targets"] = targets_sig
+        return board["frame"].copy()
+
+
+def _org_scoreboard_frame(aggs: dict, targets: dict) -> pd.DataFrame:
+    cols = ORG_SCOREBOARD_COLUMNS
+    if not aggs:
         return pd.DataFrame(columns=cols)
 
-    df = df.copy()
-    df["organization"] = df["organization"].fillna("미분류").astype(str).str.strip()
-    df["employee_no"] = df["employee_no"].astype(str).str.strip()
-    df["score_rate"] = pd.to_numeric(df["score_rate"], errors="coerce").fillna(0.0)
-
-    g = df.groupby("organization", dropna=False).agg(
-        participants=("employee_no","nunique"),
-        avg_score_rate=("score_rate","mean"),
-        score_sum_rate=("score_rate","sum"),
-        last_activity=("ended_at","max"),
-    ).reset_index()
+    orgs = sorted(aggs)
+    g = pd.DataFrame({
+        "organization": orgs,
+        "participants": [aggs[o]["participants"] for o in orgs],
+        "avg_score_rate": [aggs[o]["score_sum_rate"] / aggs[o]["count"] for o in orgs],
+        "score_sum_rate": [aggs[o]["score_sum_rate"] for o in orgs],
+        "last_activity": [aggs[o]["last_activity"] for o in orgs],
+    })
 
     # 목표 인원(기관별) 매핑
-    targets = _load_org_targets()
     g["target"] = g["organization"].map(targets).fillna(0).astype(int)
 
     # 참여율 및 참여율점수
@@ -1341,46 +1378,178 @@ def _load_admin_session_registry() -> dict:
     except Exception:
         return {}
 
-def _save_admin_session_registry(data: dict) -> None:
-    ADMIN_SESSION_FILE.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding='utf-8')
+# ---------------------------------------------------------
+# 관리자 세션 토큰 (프로세스 공용 메모리 저장소 + 지연 저장)
+#   - 만료 시각 min-heap으로 만료 토큰 정리 (연장 시 새 항목만 push, 낡은 항목은 pop 때 무시)
+#   - 리런마다의 슬라이딩 만료 연장은 메모리에만 반영하고 ADMIN_SESSION_SAVE_INTERVAL_SEC마다 저장
+#   - 로그인/로그아웃은 즉시 저장: 잠금 파일(flock) 아래에서 디스크 내용과 합쳐 임시 파일+rename
+#   - 다른 인스턴스의 변경은 ADMIN_SESSION_SYNC_INTERVAL_SEC마다(또는 모르는 토큰일 때) 파일 서명으로 확인
+#   - 로그아웃한 토큰은 파일의 ADMIN_SESSION_REVOKED_KEY 아래 {token: 만료 시각}으로 남겨(tombstone)
+#     다른 인스턴스가 아직 저장하지 않은 연장분으로 되살리지 못하게 한다
+# ---------------------------------------------------------
+ADMIN_SESSION_LOCK_FILE = ADMIN_SESSION_FILE.with_name(ADMIN_SESSION_FILE.name + ".lock")
+ADMIN_SESSION_SAVE_INTERVAL_SEC = 30.0
+ADMIN_SESSION_SYNC_INTERVAL_SEC = 5.0
+ADMIN_SESSION_REVOKED_KEY = "__revoked__"
 
-def _purge_expired_admin_sessions() -> dict:
-    now_ts = time.time()
-    data = _load_admin_session_registry()
-    cleaned = {}
-    for token, meta in data.items():
+
+def _admin_session_ttl() -> float:
+    return float(max(300, int(ADMIN_SESSION_TTL_SECONDS or 0)))
+
+
+def _admin_session_entries(data: dict, now_ts: float) -> dict:
+    """파일 내용 → {token: {'created_at', 'expires_at'}} (만료/깨진 항목 제외)."""
+    out = {}
+    for token, meta in (data or {}).items():
+        if token == ADMIN_SESSION_REVOKED_KEY:
+            continue
         try:
             expires_at = float((meta or {}).get('expires_at', 0) or 0)
+            created_at = float((meta or {}).get('created_at', 0) or 0)
         except Exception:
-            expires_at = 0
+            continue
         if expires_at > now_ts:
-            cleaned[str(token)] = dict(meta or {})
-    if cleaned != data:
+            out[str(token)] = {'created_at': created_at, 'expires_at': expires_at}
+    return out
+
+
+def _admin_session_tombstones(data: dict, now_ts: float) -> dict:
+    """파일 내용 → 로그아웃한 토큰 {token: tombstone 만료 시각} (만료/깨진 항목 제외)."""
+    raw = (data or {}).get(ADMIN_SESSION_REVOKED_KEY)
+    out = {}
+    for token, expires_at in (raw if isinstance(raw, dict) else {}).items():
         try:
-            _save_admin_session_registry(cleaned)
+            expires_at = float(expires_at or 0)
         except Exception:
-            pass
-    return cleaned
+            continue
+        if expires_at > now_ts:
+            out[str(token)] = expires_at
+    return out
 
-def _create_admin_persisted_session() -> str:
+
+def _admin_sessions_reset_heap(store: dict) -> None:
+    heap = [(meta['expires_at'], token) for token, meta in store['tokens'].items()]
+    heapq.heapify(heap)
+    store['heap'] = heap
+
+
+def _admin_sessions_merge(store: dict, disk: dict, now_ts: float) -> tuple:
+    """디스크 내용 + 아직 저장하지 않은 로컬 생성/연장 − (디스크 + 로컬) 로그아웃. 만료 시각은 큰 쪽을 쓴다.
+
+    반환: (토큰 dict, tombstone dict). 디스크에 tombstone이 있는 토큰은 로컬 연장분이 있어도 버린다.
+    """
+    revoked = _admin_session_tombstones(disk, now_ts)
+    for token, expires_at in store['removed'].items():
+        if expires_at > now_ts:
+            revoked[token] = max(expires_at, revoked.get(token, 0.0))
+    merged = _admin_session_entries(disk, now_ts)
+    for token in revoked:
+        merged.pop(token, None)
+    for token in store['pending']:
+        meta = store['tokens'].get(token)
+        if token in revoked or meta is None or meta['expires_at'] <= now_ts:
+            continue
+        cur = merged.get(token)
+        if cur is None or cur['expires_at'] < meta['expires_at']:
+            merged[token] = dict(meta)
+    store['pending'].intersection_update(merged)
+    return merged, revoked
+
+
+def _admin_sessions_sync(store: dict, now_ts: float, *, force: bool = False) -> None:
+    """다른 인스턴스가 세션 파일을 바꿨으면 다시 읽어 합친다."""
+    if not force and now_ts - store['checked_at'] < ADMIN_SESSION_SYNC_INTERVAL_SEC:
+        return
+    store['checked_at'] = now_ts
+    sig = _file_signature(ADMIN_SESSION_FILE)
+    if sig == store['file_sig']:
+        return
+    store['tokens'], _revoked = _admin_sessions_merge(store, _load_admin_session_registry(), now_ts)
+    store['file_sig'] = sig
+    _admin_sessions_reset_heap(store)
+
+
+def _admin_sessions_flush(store: dict, now_ts: float, *, force: bool = False) -> None:
+    if not (store['pending'] or store['removed']):
+        return
+    if not force and now_ts - store['saved_at'] < ADMIN_SESSION_SAVE_INTERVAL_SEC:
+        return
+    store['saved_at'] = now_ts
+    try:
+        with open(ADMIN_SESSION_LOCK_FILE, "a+b") as lock_f, _file_lock(lock_f):
+            merged, revoked = _admin_sessions_merge(store, _load_admin_session_registry(), now_ts)
+            _write_json_atomic(ADMIN_SESSION_FILE, {**merged, ADMIN_SESSION_REVOKED_KEY: revoked})
+            store['file_sig'] = _file_signature(ADMIN_SESSION_FILE)
+    except Exception:
+        # 읽기 전용 파일시스템 등: 메모리에서는 계속 유효하고 다음 주기에 다시 저장을 시도한다.
+        return
+    store.update(tokens=merged, pending=set(), removed={}, checked_at=now_ts)
+    _admin_sessions_reset_heap(store)
+
+
+def _admin_sessions_locked(store: dict) -> float:
+    """store['lock']을 잡은 상태에서 호출. 첫 사용 시 적재, 변경 확인, 만료 정리 후 현재 시각 반환."""
     now_ts = time.time()
+    if store.get('tokens') is None:
+        store.update(tokens={}, heap=[], pending=set(), removed={}, file_sig=None, checked_at=0.0, saved_at=0.0)
+    _admin_sessions_sync(store, now_ts)
+    heap, tokens = store['heap'], store['tokens']
+    while heap and heap[0][0] <= now_ts:
+        _, token = heapq.heappop(heap)
+        meta = tokens.get(token)
+        if meta is not None and meta['expires_at'] <= now_ts:
+            tokens.pop(token, None)
+            store['pending'].discard(token)
+    if len(heap) > 2 * len(tokens) + 64:
+        _admin_sessions_reset_heap(store)
+    return now_ts
+
+
+def _create_admin_persisted_session() -> str:
     token = f"{uuid.uuid4().hex}{uuid.uuid4().hex}"
-    data = _purge_expired_admin_sessions()
-    data[token] = {
-        'created_at': now_ts,
-        'expires_at': now_ts + max(300, int(ADMIN_SESSION_TTL_SECONDS or 0)),
-    }
-    _save_admin_session_registry(data)
+    store = _process_store("admin_sessions")
+    with store["lock"]:
+        now_ts = _admin_sessions_locked(store)
+        meta = store['tokens'][token] = {'created_at': now_ts, 'expires_at': now_ts + _admin_session_ttl()}
+        heapq.heappush(store['heap'], (meta['expires_at'], token))
+        store['pending'].add(token)
+        _admin_sessions_flush(store, now_ts, force=True)
     return token
 
+
+def _touch_admin_session(token: str) -> bool:
+    """유효한 토큰이면 만료를 연장(메모리, 저장은 지연)하고 True. 모르는 토큰은 파일을 한 번 다시 확인한다."""
+    store = _process_store("admin_sessions")
+    with store["lock"]:
+        now_ts = _admin_sessions_locked(store)
+        if token not in store['tokens']:
+            _admin_sessions_sync(store, now_ts, force=True)
+        meta = store['tokens'].get(token)
+        if meta is None or meta['expires_at'] <= now_ts:
+            return False
+        meta['expires_at'] = now_ts + _admin_session_ttl()
+        heapq.heappush(store['heap'], (meta['expires_at'], token))
+        store['pending'].add(token)
+        _admin_sessions_flush(store, now_ts)
+        return True
+
+
+def _revoke_admin_session(token: str) -> None:
+    store = _process_store("admin_sessions")
+    with store["lock"]:
+        now_ts = _admin_sessions_locked(store)
+        if store['tokens'].pop(token, None) is None:
+            return
+        store['pending'].discard(token)
+        # 다른 인스턴스가 로그아웃 직전까지 연장했을 수 있으므로 tombstone은 지금부터 TTL 동안 유지
+        store['removed'][token] = now_ts + _admin_session_ttl()
+        _admin_sessions_flush(store, now_ts, force=True)
+
+
 def _persist_admin_auth(keep_admin_view: bool = True) -> None:
     try:
         token = _get_query_param('admin_session_token', '').strip()
-        data = _purge_expired_admin_sessions()
-        if token and token in data:
-            data[token]['expires_at'] = time.time() + max(300, int(ADMIN_SESSION_TTL_SECONDS or 0))
-            _save_admin_session_registry(data)
-        else:
+        if not (token and _touch_admin_session(token)):
             token = _create_admin_persisted_session()
         _set_query_param('admin_session_token', token)
         if keep_admin_view:
@@ -1394,10 +1563,7 @@ def _clear_persisted_admin_auth() -> None:
     token = _get_query_param('admin_session_token', '').strip()
     if token:
         try:
-            data = _purge_expired_admin_sessions()
-            if token in data:
-                data.pop(token, None)
-                _save_admin_session_registry(data)
+            _revoke_admin_session(token)
         except Exception:
             pass
     _delete_query_param('admin_session_token')
@@ -1409,24 +1575,14 @@ def _restore_admin_auth_from_persisted_session() -> None:
     token = _get_query_param('admin_session_token', '').strip()
     if not token:
         return
-    data = _purge_expired_admin_sessions()
-    meta = data.get(token)
-    if not isinstance(meta, dict):
-        _clear_persisted_admin_auth()
-        return
     try:
-        expires_at = float(meta.get('expires_at', 0) or 0)
+        valid = _touch_admin_session(token)
     except Exception:
-        expires_at = 0
-    if expires_at <= time.time():
+        valid = False
+    if not valid:
         _clear_persisted_admin_auth()
         return
     st.session_state.admin_authed = True
-    data[token]['expires_at'] = time.time() + max(300, int(ADMIN_SESSION_TTL_SECONDS or 0))
-    try:
-        _save_admin_session_registry(data)
-    except Exception:
-        pass
     admin_view = _get_query_param('admin_view', '').strip().lower()
     if admin_view in {'1', 'true', 'yes', 'admin'}:
         st.session_state.stage = 'admin'
@@ -1606,6 +1762,29 @@ for _m in SCENARIOS.values():
 THEME_TOTAL_SCORE = sum(q.get("score", 0) for q in SCENARIOS[SCENARIO_ORDER[0]]["quiz"]) if SCENARIO_ORDER else 0
 TOTAL_SCORE = sum(sum(q.get("score", 0) for q in SCENARIOS[m]["quiz"]) for m in SCENARIO_ORDER) + PARTICIPATION_SCORE
 
+
+def _quiz_content_versions() -> dict:
+    """question_code -> 문항 내용 버전 (질문/보기/정답이 바뀌면 달라짐). 로그의 content_version으로 기록."""
+    versions = {}
+    for m_key, mission in SCENARIOS.items():
+        for i, q in enumerate(mission.get("quiz", []) or []):
+            raw = json.dumps(
+                [q.get("type"), q.get("question"), q.get("options"), q.get("answer")],
+                ensure_ascii=False, sort_keys=True, default=str,
+            )
+            versions[f"{m_key}_Q{i+1}"] = hashlib.sha256(raw.encode("utf-8")).hexdigest()[:10]
+    return versions
+
+
+QUIZ_CONTENT_VERSIONS = _quiz_content_versions()
+# 객관식 보기 문구 -> 원래(섞기 전) 선택지 번호. 구버전 로그의 selected_option_index 역산용
+MCQ_OPTION_INDEX = {
+    f"{m_key}_Q{i+1}": {str(opt).strip(): j for j, opt in enumerate(q.get("options") or [])}
+    for m_key, mission in SCENARIOS.items()
+    for i, q in enumerate(mission.get("quiz", []) or [])
+    if q.get("type") == "mcq"
+}
+
 # =========================================================
 # 4) 상태 관리
 # =========================================================
@@ -1675,16 +1854,49 @@ def _normalize_for_similarity(text: str) -> str:
     return s
 
 
+NEAR_COPY_EXAMPLE_CACHE_MAX = 256
+
+
+def _near_copy_example_profile(example: str):
+    """예시 답안의 정규화 문자열/문자 빈도 (프로세스 공유 캐시). 비어 있으면 None."""
+    store = _process_store("near_copy_examples")
+    with store["lock"]:
+        cache = store.setdefault("cache", {})
+        key = str(example or "")
+        hit = cache.get(key)
+        if hit is None:
+            exn = _normalize_for_similarity(key)
+            hit = cache[key] = (exn, Counter(exn)) if exn else (None, None)
+            while len(cache) > NEAR_COPY_EXAMPLE_CACHE_MAX:
+                cache.pop(next(iter(cache)))
+    return hit if hit[0] else None
+
+
 def is_near_copy_answer(answer_text: str, *examples: str, threshold: float = 0.92) -> bool:
+    """예시/모범답안과 거의 같은 답안인지 (SequenceMatcher.ratio() >= threshold).
+
+    ratio의 상한인 길이 비율(real_quick_ratio)과 문자 빈도 교집합(quick_ratio)을 먼저 계산해
+    기준에 못 미치면 정밀 비교를 생략한다. 상한만으로 걸러내므로 판정 결과는 정밀 비교와 같다.
+    """
     user = _normalize_for_similarity(answer_text)
     if not user:
         return False
+    user_counts = None
     for ex in examples:
-        exn = _normalize_for_similarity(ex)
-        if not exn:
+        profile = _near_copy_example_profile(ex)
+        if profile is None:
             continue
+        exn, ex_counts = profile
         if user == exn:
             return True
+        total = len(user) + len(exn)
+        if 2.0 * min(len(user), len(exn)) / total < threshold:
+            continue
+        if user_counts is None:
+            user_counts = Counter(user)
+        common = sum(min(n, ex_counts.get(ch, 0)) for ch, n in user_counts.items())
+        if 2.0 * common / total < threshold:
+            continue
         ratio = difflib.SequenceMatcher(None, user, exn).ratio()
         if ratio >= threshold:
             return True
@@ -1754,13 +1966,294 @@ def get_ending_image():
     return None
 
 
+STATIC_DIR = BASE_DIR / "static"
+
+
+def _static_serving_enabled() -> bool:
+    try:
+        return bool(st.get_option("server.enableStaticServing"))
+    except Exception:
+        return False
+
+
+def _publish_static_asset(path: Path, data: bytes) -> str:
+    """static/ 아래에 내용 해시 파일명으로 복사하고 app/static URL을 반환. 이전 해시본은 정리."""
+    digest = hashlib.sha256(data).hexdigest()[:16]
+    suffix = path.suffix.lower()
+    target = STATIC_DIR / f"{path.stem}.{digest}{suffix}"
+    if not target.exists():
+        STATIC_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(f"{target.name}.{uuid.uuid4().hex[:8]}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, target)
+        for old in STATIC_DIR.glob(f"{path.stem}.*{suffix}"):
+            if old != target and re.fullmatch(rf"{re.escape(path.stem)}\.[0-9a-f]{{16}}{re.escape(suffix)}", old.name):
+                try:
+                    old.unlink()
+                except OSError:
+                    pass
+    return f"app/static/{target.name}"
+
+
+def _asset_url(path: Path, *, allow_data_uri: bool = True):
+    """이미지 파일의 브라우저용 URL.
+
+    - 정적 서빙이 켜져 있으면 내용 해시 파일명(app/static/...)이라 브라우저가 캐시할 수 있다.
+    - 아니면 base64 data URI (프로세스 내에서 파일 변경 시에만 다시 인코딩).
+      allow_data_uri=False면 이 경우 None을 반환한다(st.image 사용 등).
+    """
+    sig = _file_signature(path)
+    if sig is None:
+        return None
+    store = _process_store("asset_urls")
+    static = _static_serving_enabled()
+    key = (str(path), static)
+    with store["lock"]:
+        hit = store.get(key)
+        if hit is None or hit[0] != sig:
+            data = path.read_bytes()
+            url = None
+            if static:
+                try:
+                    url = _publish_static_asset(path, data)
+                except OSError:
+                    url = None
+            if url is None:
+                mime = mimetypes.guess_type(path.name)[0] or "image/png"
+                url = f"data:{mime};base64,{base64.b64encode(data).decode('utf-8')}"
+            hit = store[key] = (sig, url)
+        url = hit[1]
+    if not allow_data_uri and url.startswith("data:"):
+        return None
+    return url
+
+
+APP_STYLESHEET = BASE_DIR / "app.css"
+
+
+def _minify_css(css: str) -> str:
+    """주석/불필요한 공백 제거. 선택자 안의 공백(자손 결합자)은 의미가 있으므로 한 칸으로만 줄인다."""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,>])\s*", r"\1", css)
+    css = re.sub(r":\s+", ":", css)
+    return css.replace(";}", "}").strip()
+
+
+def _app_stylesheet():
+    """(link_url | None, 압축 CSS). 프로세스당 app.css 변경 시에만 다시 압축/게시한다.
+
+    정적 서빙이 켜져 있으면 static/app.<해시>.css 로 게시해 브라우저가 캐시하게 하고,
+    꺼져 있거나 게시에 실패하면 압축 CSS를 <style>로 직접 넣도록 url=None을 돌려준다.
+    """
+    sig = _file_signature(APP_STYLESHEET)
+    if sig is None:
+        return None, ""
+    store = _process_store("app_stylesheet")
+    static = _static_serving_enabled()
+    with store["lock"]:
+        if store.get("sig") != sig or store.get("static") != static:
+            css = _minify_css(APP_STYLESHEET.read_text(encoding="utf-8"))
+            url = None
+            if static:
+                try:
+                    url = _publish_static_asset(APP_STYLESHEET, css.encode("utf-8"))
+                except OSError:
+                    url = None
+            store.update(sig=sig, static=static, css=css, url=url)
+        return store["url"], store["css"]
+
+
+def inject_app_styles():
+    """공통 스타일 연결. 정적 서빙 시에는 해시 URL <link> 한 줄만 보낸다(브라우저 캐시).
+
+    Streamlit은 리런에서 다시 그리지 않은 요소를 지우므로 매 실행 참조는 보내되,
+    무거운 CSS 본문은 정적 서빙이 없는 환경에서만 인라인으로 보낸다.
+    """
+    try:
+        url, css = _app_stylesheet()
+    except Exception:
+        return
+    if url:
+        st.markdown(f'<link rel="stylesheet" href="{url}">', unsafe_allow_html=True)
+    elif css:
+        st.markdown(f"<style>{css}</style>", unsafe_allow_html=True)
+
+
+# ---------------------------------------------------------
+# 반응형 이미지 파생본 (WebP/AVIF, 여러 폭)
+#   - 원본 내용 해시별로 static/ 아래에 한 번만 만든다: {stem}.{hash}.w{폭}.{fmt}
+#   - 시작 시 백그라운드로 미리 만들고, 준비 전에는 원본을 그대로 쓴다.
+# ---------------------------------------------------------
+IMAGE_DERIVATIVE_WIDTHS = (480, 768, 1024)
+IMAGE_DERIVATIVE_SAVE_OPTIONS = {
+    "webp": {"quality": 80, "method": 4},
+    "avif": {"quality": 60, "speed": 8},
+}
+IMAGE_DERIVATIVE_FALLBACK_WIDTH = 768  # 정적 서빙이 꺼져 있을 때 data URI로 넣을 폭
+IMAGE_DERIVATIVE_TMP_STALE_SEC = 600  # 이보다 오래된 변환 임시 파일(*.tmp)은 중단된 것으로 보고 정리
+
+
+def _image_derivative_formats() -> list:
+    if Image is None or pil_features is None:
+        return []
+    fmts = []
+    for fmt in ("avif", "webp"):
+        try:
+            if pil_features.check(fmt):
+                fmts.append(fmt)
+        except Exception:
+            continue
+    return fmts
+
+
+def _build_image_derivatives(path: Path) -> dict:
+    """파생본을 만들고(이미 있으면 재사용) {"width", "variants": {fmt: [(폭, 파일경로)]}}를 반환."""
+    data = path.read_bytes()
+    digest = hashlib.sha256(data).hexdigest()[:16]
+    info = {"digest": digest, "width": 0, "variants": {}}
+    with Image.open(io.BytesIO(data)) as im:
+        im.load()
+        src_w, src_h = im.size
+        info["width"] = src_w
+        if im.mode not in ("RGB", "RGBA"):
+            im = im.convert("RGBA" if "A" in im.getbands() else "RGB")
+        widths = sorted({w for w in IMAGE_DERIVATIVE_WIDTHS if w < src_w} | {min(src_w, max(IMAGE_DERIVATIVE_WIDTHS))})
+        STATIC_DIR.mkdir(parents=True, exist_ok=True)
+        for fmt in _image_derivative_formats():
+            built = []
+            for w in widths:
+                target = STATIC_DIR / f"{path.stem}.{digest}.w{w}.{fmt}"
+                if not target.exists():
+                    h = max(1, round(src_h * w / src_w))
+                    resized = im if w == src_w else im.resize((w, h), Image.LANCZOS)
+                    tmp = target.with_name(f"{target.name}.{uuid.uuid4().hex[:8]}.tmp")
+                    try:
+                        resized.save(tmp, format=fmt.upper(), **IMAGE_DERIVATIVE_SAVE_OPTIONS.get(fmt, {}))
+                        os.replace(tmp, target)
+                    finally:
+                        if tmp.exists():
+                            try:
+                                tmp.unlink()
+                            except OSError:
+                                pass
+                built.append((w, target))
+            info["variants"][fmt] = built
+
+    # 원본이 바뀌어 쓰이지 않게 된 이전 해시의 파생본, 그리고 중단된 변환이 남긴 임시 파일 정리
+    # (임시 파일은 다른 프로세스가 쓰는 중일 수 있으므로 IMAGE_DERIVATIVE_TMP_STALE_SEC 지난 것만)
+    pattern = re.compile(rf"{re.escape(path.stem)}\.([0-9a-f]{{16}})\.w\d+\.(webp|avif)(\.[0-9a-f]{{8}}\.tmp)?")
+    now_ts = time.time()
+    for old in STATIC_DIR.glob(f"{path.stem}.*.w*.*"):
+        m = pattern.fullmatch(old.name)
+        if not m:
+            continue
+        try:
+            if m.group(3):
+                if now_ts - old.stat().st_mtime < IMAGE_DERIVATIVE_TMP_STALE_SEC:
+                    continue
+            elif m.group(1) == digest:
+                continue
+            old.unlink()
+        except OSError:
+            pass
+    return info
+
+
+def _image_derivatives(path: Path, *, wait: bool = False):
+    """준비된 파생본 정보. 아직 없으면 백그라운드 생성을 시작하고 None (wait=True면 직접 생성)."""
+    if Image is None or not _image_derivative_formats():
+        return None
+    sig = _file_signature(path)
+    if sig is None:
+        return None
+    store = _process_store("image_derivatives")
+    key = str(path)
+    with store["lock"]:
+        hit = store.get(key)
+        if hit is not None and hit[0] == sig:
+            return hit[1]
+        building = store.setdefault("_building", set())
+        if key in building and not wait:
+            return None
+        building.add(key)
+
+    def _build():
+        try:
+            info = _build_image_derivatives(path)
+        except Exception:
+            info = None  # 변환 실패 시 원본 사용
+        with store["lock"]:
+            store[key] = (sig, info)
+            store["_building"].discard(key)
+        return info
+
+    if wait:
+        return _build()
+    threading.Thread(target=_build, name=f"image-derivatives-{path.stem}", daemon=True).start()
+    return None
+
+
+def _warm_image_derivatives() -> None:
+    """서버 시작 후 첫 실행에서 알려진 이미지들의 파생본 생성을 백그라운드로 시작."""
+    paths = list(MAP_STAGE_IMAGES.values()) + [DEFAULT_MAP_IMAGE, MASTER_IMAGE]
+    paths += [ASSET_DIR / name for name in ENDING_IMAGE_CANDIDATE_NAMES]
+    for p in paths:
+        if p.exists():
+            _image_derivatives(p)
+
+
+def _responsive_image_html(path: Path, *, img_class: str = "", style: str = "", sizes: str = "100vw"):
+    """<picture>/<img srcset> HTML. 파생본이 없으면 원본 URL 하나만 쓴다. 쓸 수 있는 URL이 없으면 None."""
+    info = _image_derivatives(path)
+    attrs = (f" class='{img_class}'" if img_class else "") + (f" style='{style}'" if style else "")
+    variants = (info or {}).get("variants") or {}
+    if info and variants and _static_serving_enabled():
+        def _srcset(items):
+            # 파생본은 이미 static/ 아래 해시 파일명이므로 그대로 URL로 쓴다
+            return ", ".join(f"app/static/{p.name} {w}w" for w, p in items)
+        sources = "".join(
+            f"<source type='image/{fmt}' srcset='{html.escape(_srcset(variants[fmt]))}' sizes='{sizes}' />"
+            for fmt in ("avif",) if fmt in variants
+        )
+        base = variants.get("webp") or next(iter(variants.values()))
+        # 원본 게시에 실패했으면(OSError) 기본 srcset의 첫 파생본을 src로 쓴다
+        fallback = _asset_url(path, allow_data_uri=False) or f"app/static/{base[0][1].name}"
+        return (
+            f"<picture style='display:block;'>{sources}"
+            f"<img{attrs} src='{html.escape(fallback)}' srcset='{html.escape(_srcset(base))}' sizes='{sizes}' alt='' />"
+            f"</picture>"
+        )
+    if info and variants.get("webp"):
+        # 정적 서빙이 없으면 적당한 폭의 WebP 하나를 data URI로 (원본 PNG 대비 수십 배 작음)
+        items = variants["webp"]
+        w, p = min(items, key=lambda it: (it[0] < IMAGE_DERIVATIVE_FALLBACK_WIDTH, abs(it[0] - IMAGE_DERIVATIVE_FALLBACK_WIDTH)))
+        url = _asset_url(p)
+        if url:
+            return f"<img{attrs} src='{html.escape(url)}' alt='' />"
+    url = _asset_url(path, allow_data_uri=False)
+    if url:
+        return f"<img{attrs} src='{html.escape(url)}' alt='' />"
+    return None
+
+
+def render_asset_image(path: Path, sizes: str = "100vw"):
+    """반응형 이미지(가로 100%) 표시. 쓸 수 있는 URL이 없으면 st.image로 대체."""
+    markup = _responsive_image_html(path, style="width:100%;height:auto;display:block;", sizes=sizes)
+    if markup:
+        st.markdown(markup, unsafe_allow_html=True)
+    else:
+        st.image(str(path), use_container_width=True)
+
+
 def show_map_with_fade(map_path: Path, caption: str = None, celebrate: bool = False):
     if not map_path or not map_path.exists():
         st.warning("맵 이미지 파일을 찾을 수 없습니다.")
         return
     try:
-        img_bytes = map_path.read_bytes()
-        encoded = base64.b64encode(img_bytes).decode("utf-8")
+        img_html = _responsive_image_html(
+            map_path, img_class="map-fade-img", sizes="(max-width: 1060px) 100vw, 1060px"
+        ) or f"<img class='map-fade-img' src='{html.escape(_asset_url(map_path) or '')}' />"
         pollen_html = ""
         if celebrate:
             pollen_positions = [
@@ -1779,7 +2272,7 @@ def show_map_with_fade(map_path: Path, caption: str = None, celebrate: bool = Fa
         st.markdown(
             f"""
             <div class="map-fade-wrap{' celebrate' if celebrate else ''}">
-                <img class="map-fade-img" src="data:image/png;base64,{encoded}" />
+                {img_html}
                 {pollen_html}
             </div>
             """,
@@ -1857,13 +2350,20 @@ def _normalize_log_row(raw: dict) -> dict:
     # 문자열 컬럼 보정
     for col in [
         "timestamp", "training_attempt_id", "employee_no", "name", "organization", "department",
-        "mission_key", "mission_title", "question_code", "question_type", "question", "selected_or_text", "is_correct"
+        "mission_key", "mission_title", "question_code", "question_type", "question", "selected_or_text", "is_correct",
+        "content_version",
     ]:
         val = norm.get(col, "")
         if val is None:
             val = ""
         norm[col] = str(val)
 
+    # 선택지 번호 (구버전 로그는 보기 문구로 역산, 모르면 -1)
+    opt_idx = _parse_option_index(norm["selected_option_index"])
+    norm["selected_option_index"] = opt_idx if opt_idx is not None else _lookup_option_index(
+        norm["question_code"], norm["question_type"], norm["selected_or_text"]
+    )
+
     if not norm["organization"].strip():
         norm["organization"] = "미분류"
     if norm["attempt_round"] <= 0:
@@ -1871,59 +2371,65 @@ def _normalize_log_row(raw: dict) -> dict:
     return norm
 
 
-def _read_log_rows_tolerant():
-    """
-    로그 CSV를 최대한 관대하게 읽는다.
-    - UTF-8/CP949 인코딩 혼합 대응
-    - NUL 바이트 제거
-    - 헤더/행 컬럼 수 불일치 허용
-    """
-    if not LOG_FILE.exists():
-        return []
+def _parse_option_index(v):
+    """기록된 선택지 번호 → int. 비었거나 숫자가 아니면 None (보기 문구로 역산 대상)."""
+    text = str(v).strip() if v is not None else ""
+    if not text:
+        return None
+    try:
+        n = int(float(text))
+    except Exception:
+        return None
+    return n if -(2 ** 63) < n < 2 ** 63 else None
 
-    import io as _io
 
-    raw_bytes = LOG_FILE.read_bytes()
-    if not raw_bytes:
-        return []
+def _lookup_option_index(question_code, question_type, selected_text) -> int:
+    if str(question_type).strip().lower() != "mcq":
+        return -1
+    return MCQ_OPTION_INDEX.get(str(question_code), {}).get(str(selected_text).strip(), -1)
+
+
+LOG_ENCODING_CANDIDATES = ("utf-8-sig", "utf-8", "cp949", "euc-kr", "latin1")
+
+
+def _decode_log_bytes(raw_bytes: bytes, encoding: str | None = None):
+    """로그 바이트를 문자열로 변환한다. encoding이 없으면 후보 인코딩을 순서대로 시도.
 
+    반환: (decoded, encoding) — 지정 인코딩으로 실패하면 (None, encoding)
+    """
     # NUL 제거 (간헐적으로 깨진 CSV에 섞이는 경우 대응)
     raw_bytes = raw_bytes.replace(b"\x00", b"")
-
-    decoded = None
-    for enc in ("utf-8-sig", "utf-8", "cp949", "euc-kr", "latin1"):
+    if encoding:
         try:
-            decoded = raw_bytes.decode(enc)
-            break
+            decoded = raw_bytes.decode(encoding)
         except Exception:
-            continue
-
-    if decoded is None:
-        decoded = raw_bytes.decode("utf-8", errors="replace")
-
-    decoded = decoded.replace("\r\n", "\n").replace("\r", "\n")
-    if not decoded.strip():
-        return []
+            return None, encoding
+    else:
+        decoded = None
+        for enc in LOG_ENCODING_CANDIDATES:
+            try:
+                decoded = raw_bytes.decode(enc)
+                encoding = enc
+                break
+            except Exception:
+                continue
+        if decoded is None:
+            decoded = raw_bytes.decode("utf-8", errors="replace")
+            encoding = "utf-8"
+    return decoded.replace("\r\n", "\n").replace("\r", "\n"), encoding
 
-    rows = []
 
+def _split_csv_rows(decoded: str) -> list:
     try:
-        reader = csv.reader(_io.StringIO(decoded))
-        all_rows = list(reader)
+        return list(csv.reader(io.StringIO(decoded)))
     except Exception:
         lines = [ln for ln in decoded.split("\n") if ln.strip()]
-        all_rows = [ln.split(",") for ln in lines]
+        return [ln.split(",") for ln in lines]
 
-    if not all_rows:
-        return []
 
-    header = [str(x).strip() for x in (all_rows[0] or [])]
+def _fix_log_header(header: list) -> list:
     if not header or all(h == "" for h in header):
-        header = LOG_FIELDNAMES
-        data_rows = all_rows
-    else:
-        data_rows = all_rows[1:]
-
+        return list(LOG_FIELDNAMES)
     if len(header) < len(LOG_FIELDNAMES):
         header = header + [f"__extra_col_{i}" for i in range(len(LOG_FIELDNAMES) - len(header))]
 
@@ -1937,8 +2443,18 @@ def _read_log_rows_tolerant():
         else:
             seen[key] = 0
         fixed_header.append(key)
-    header = fixed_header
+    return fixed_header
+
+
+def _log_rows_to_dicts(data_rows: list, header: list) -> list:
+    """CSV 행 → 정규화된 dict 리스트. 행이 많으면 컬럼 단위(벡터) 정규화를 사용한다."""
+    if len(data_rows) >= LOG_VECTORIZE_MIN_ROWS:
+        return _normalize_log_frame(_raw_log_frame(data_rows, header), coerce=False).to_dict("records")
+    return _log_rows_to_dicts_rowwise(data_rows, header)
+
 
+def _log_rows_to_dicts_rowwise(data_rows: list, header: list) -> list:
+    rows = []
     for r in data_rows:
         if r is None:
             continue
@@ -1953,140 +2469,1085 @@ def _read_log_rows_tolerant():
             row_dict["__extra__"] = r[len(header):]
 
         rows.append(_normalize_log_row(row_dict))
-
     return rows
 
 
-def _ensure_log_schema_file():
-    """헤더가 구버전이거나 스키마가 섞인 경우 현재 스키마로 정규화."""
-    if not LOG_FILE.exists():
-        return
+# ---------------------------------------------------------
+# 로그 정규화 (컬럼 단위)
+#   - _normalize_log_row(행 단위) + _coerce_log_df와 같은 결과를 DataFrame 컬럼 연산으로 만든다
+#   - 구버전 컬럼(emp_no/사번/직원번호, session_id, attempt_round_total) 보정 포함
+#   - 숫자 변환이 애매한 값(1_000, 유니코드 숫자 등)만 행 단위 int(float())로 처리
+#   - 검증/벤치마크: python app.py bench-normalize --rows 1000000
+# ---------------------------------------------------------
+LOG_VECTORIZE_MIN_ROWS = 256   # 이보다 적으면 행 단위 정규화가 더 빠름
+_LOG_INT_COLUMNS = ["question_index", "awarded_score", "max_score", "attempt_no_for_mission", "attempt_round"]
 
-    need_rewrite = False
+
+def _raw_log_frame(data_rows: list, header: list) -> pd.DataFrame:
+    """CSV 행(list) → header 컬럼의 문자열 DataFrame (빈 행 제외, 짧은 행은 ""로 채움)."""
+    width = len(header)
+    cells = []
+    for r in data_rows:
+        if not r or not any(str(x).strip() for x in r):
+            continue
+        n = len(r)
+        if n == width:
+            cells.append(r)
+        elif n > width:
+            cells.append(r[:width])
+        else:
+            cells.append(list(r) + [""] * (width - n))
+    if not cells:
+        return pd.DataFrame(columns=header, dtype=object)
+    return pd.DataFrame(np.array(cells, dtype=object), columns=header)
+
+
+def _int_or_zero(v) -> int:
     try:
-        with open(LOG_FILE, "r", newline="", encoding="utf-8-sig") as f:
-            reader = csv.reader(f)
-            header = next(reader, [])
-        if [str(x).strip() for x in header] != LOG_FIELDNAMES:
-            need_rewrite = True
+        n = 0 if v == "" or v is None else int(float(v))
     except Exception:
-        need_rewrite = True
+        return 0
+    return n if -(2 ** 63) < n < 2 ** 63 else 0
 
-    if not need_rewrite:
-        return
 
-    rows = _read_log_rows_tolerant()
-    with open(LOG_FILE, "w", newline="", encoding="utf-8-sig") as f:
-        writer = csv.DictWriter(f, fieldnames=LOG_FIELDNAMES)
-        writer.writeheader()
-        for row in rows:
-            writer.writerow(_normalize_log_row(row))
+def _map_unique(s: pd.Series, func, dtype=object, *, factorized: dict | None = None) -> pd.Series:
+    """값 종류별로 한 번만 func를 적용한다 (로그 컬럼은 값 종류가 적어 행 단위보다 훨씬 빠름).
 
+    factorized(dict)를 넘기면 같은 Series의 factorize 결과를 재사용한다.
+    """
+    cached = factorized.get(id(s)) if factorized is not None else None
+    if cached is not None and cached[0] is s:
+        codes, uniques = cached[1], cached[2]
+    else:
+        codes, uniques = pd.factorize(s, use_na_sentinel=False)
+        if factorized is not None:
+            factorized[id(s)] = (s, codes, uniques)
+    mapped = np.fromiter((func(u) for u in uniques), dtype=dtype, count=len(uniques)) if dtype is not object \
+        else np.array([func(u) for u in uniques] + [None], dtype=object)[:-1]
+    return pd.Series(mapped[codes] if len(s) else mapped[:0], index=s.index)
 
-def _coerce_log_df(df: pd.DataFrame) -> pd.DataFrame:
-    """관리자 통계용 컬럼/타입 정규화."""
-    if df is None:
-        return pd.DataFrame()
 
-    df = df.copy()
-    # 중복 컬럼 제거 (구버전/깨진 CSV 방어)
-    if hasattr(df.columns, "duplicated") and df.columns.duplicated().any():
-        df = df.loc[:, ~df.columns.duplicated()].copy()
-    # 예상 컬럼 채우기
-    for col in LOG_FIELDNAMES:
-        if col not in df.columns:
-            df[col] = ""
+def _is_blank(v) -> bool:
+    return not str(v).strip()
 
-    # 문자열 컬럼 정리
-    for col in ["training_attempt_id", "employee_no", "name", "organization", "department", "mission_key", "mission_title", "question_code", "question_type", "question", "selected_or_text", "is_correct"]:
-        df[col] = df[col].fillna("").astype(str)
 
-    # 기관 보정
-    df["organization"] = df["organization"].replace("", pd.NA).fillna(df["department"]).fillna("미분류").astype(str)
+def _normalize_log_frame(raw: pd.DataFrame, *, coerce: bool = True) -> pd.DataFrame:
+    """로그 원본 DataFrame(문자열, 결측 없음)을 컬럼 단위로 정규화한다.
 
-    # question_index / question_code 복원
-    qidx_from_code = pd.to_numeric(df["question_code"].astype(str).str.extract(r"_Q(\d+)")[0], errors="coerce")
-    qidx_existing = pd.to_numeric(df["question_index"], errors="coerce")
-    df["question_index"] = qidx_existing.fillna(qidx_from_code).fillna(0).astype(int)
+    coerce=False: 행마다 _normalize_log_row를 적용한 것과 같은 DataFrame (LOG_FIELDNAMES, 정수/문자열)
+    coerce=True : 여기에 _coerce_log_df까지 적용한 것과 같은 관리자 통계용 DataFrame
+    """
+    raw = raw.reset_index(drop=True)
+    index = raw.index
+    clean = {}
+    for col in raw.columns:
+        key = str(col).strip()
+        if key:
+            clean[key] = raw[col]
 
-    mk_from_code = df["question_code"].astype(str).str.split("_Q").str[0]
-    df["mission_key"] = df["mission_key"].replace("", pd.NA).fillna(mk_from_code).fillna("").astype(str)
+    def col(name: str) -> pd.Series:
+        found = clean.get(name)
+        return found if found is not None else pd.Series("", index=index, dtype=object)
 
-    # mission_title 복원
-    if "mission_title" not in df.columns:
-        df["mission_title"] = ""
-    df["mission_title"] = df["mission_title"].replace("", pd.NA)
-    mapped_titles = df["mission_key"].map(lambda x: SCENARIOS.get(str(x), {}).get("title", str(x)))
-    df["mission_title"] = df["mission_title"].fillna(mapped_titles).fillna("미상 테마").astype(str)
+    factorized = {}
 
-    # 숫자 컬럼
-    for col in ["awarded_score", "max_score", "attempt_no_for_mission", "attempt_round"]:
-        df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0)
+    def mapu(s: pd.Series, func, dtype=object) -> pd.Series:
+        return _map_unique(s, func, dtype, factorized=factorized)
 
-    # 시간 컬럼
-    df["timestamp"] = pd.to_datetime(df["timestamp"], errors="coerce")
+    def blank(s: pd.Series) -> pd.Series:
+        return mapu(s, _is_blank, bool)
 
-    # 완전 빈 행 제거
-    if "question_code" in df.columns:
-        df = df[~((df["question_code"].str.strip() == "") & (df["question"].str.strip() == ""))].copy()
+    # 스키마 호환 보정 (구버전 로그 포함) — _normalize_log_row와 같은 순서
+    if "employee_no" not in clean:
+        emp = pd.Series("", index=index, dtype=object)
+        for alias in ("직원번호", "사번", "emp_no"):  # 앞쪽 별칭이 우선
+            if alias in clean:
+                emp = clean[alias].where(clean[alias].ne(""), emp)
+        clean["employee_no"] = emp
+    org = col("organization")
+    blank_org = blank(org)
+    if blank_org.any():
+        dept = col("department")
+        clean["organization"] = org.where(~blank_org, dept.where(dept.ne(""), "미분류"))
+    if "department" not in clean:
+        clean["department"] = clean["organization"]
+    if "mission_key" not in clean and "question_code" in clean:
+        clean["mission_key"] = _map_unique(clean["question_code"], lambda v: v.split("_Q")[0])
+
+    qc = col("question_code")
+    qi_raw = col("question_index")
+    qi_int = mapu(qi_raw, _int_or_zero, np.int64)
+    qi_text = mapu(qi_raw, str.strip)
+    qi_from_code = blank(qi_raw) if "question_index" in clean else pd.Series(True, index=index)
+    if qi_from_code.any():
+        def _qidx_from_code(v):
+            m = re.search(r"_Q(\d+)", v)
+            return int(m.group(1)) if m else 0
+        code_int = mapu(qc, _qidx_from_code, np.int64)
+        qi_int = qi_int.where(~qi_from_code, code_int)
+        qi_text = qi_text.where(~qi_from_code, _map_unique(code_int, str))
+
+    blank_code = blank(qc)
+    if blank_code.any():
+        mk = _map_unique(col("mission_key")[blank_code], str.strip)
+        qn = qi_text[blank_code]
+        filled = (mk + "_Q" + qn).where(mk.ne("") & qn.ne(""), "")
+        clean["question_code"] = qc.where(~blank_code, filled)
+
+    title = col("mission_title")
+    blank_title = blank(title)
+    if blank_title.any():
+        mk = _map_unique(col("mission_key")[blank_title], str.strip)
+        filled = _map_unique(mk, lambda m: SCENARIOS.get(m, {}).get("title", m))
+        title = title.copy()
+        title[blank_title] = filled
+        clean["mission_title"] = title
+
+    # 새 컬럼 호환 (구버전 로그에는 없음)
+    if "training_attempt_id" not in clean:
+        clean["training_attempt_id"] = col("session_id")
+    ar_raw = col("attempt_round")
+    ar_int = mapu(ar_raw, _int_or_zero, np.int64)
+    ar_fill = blank(ar_raw) if "attempt_round" in clean else pd.Series(True, index=index)
+    if ar_fill.any():
+        if "attempt_round_total" in clean:
+            fill_int = _map_unique(clean["attempt_round_total"], lambda v: _int_or_zero(v) if v != "" else 1, np.int64)
+        else:
+            fill_int = pd.Series(1, index=index, dtype="int64")
+        ar_int = ar_int.where(~ar_fill, fill_int)
+
+    # 선택지 번호: 기록된 값 우선, 비었으면 (문항, 유형, 보기 문구) 종류별로 한 번만 역산
+    opt_idx = mapu(col("selected_option_index"), _parse_option_index)
+    need = opt_idx.isna().to_numpy()
+    if need.any():
+        keys = pd.DataFrame({
+            "code": col("question_code")[need], "type": col("question_type")[need], "text": col("selected_or_text")[need],
+        })
+        group = keys.groupby(["code", "type", "text"], sort=False).ngroup().to_numpy()
+        found = np.array(
+            [_lookup_option_index(*k) for k in keys.drop_duplicates().itertuples(index=False)], dtype=object
+        )
+        opt_idx = opt_idx.copy()
+        opt_idx[need] = found[group]
+    opt_idx = opt_idx.astype(np.int64)
 
+    out = {}
+    for name in LOG_FIELDNAMES:
+        if name == "question_index":
+            out[name] = qi_int
+        elif name == "selected_option_index":
+            out[name] = opt_idx
+        elif name == "attempt_round":
+            out[name] = ar_int.where(ar_int > 0, 1)
+        elif name in _LOG_INT_COLUMNS:
+            out[name] = mapu(col(name), _int_or_zero, np.int64)
+        else:
+            out[name] = col(name)
+    df = pd.DataFrame(out, index=index)
+    org = df["organization"]
+    df["organization"] = org.where(~blank(org), "미분류")
+    if not coerce:
+        return df
+
+    # 관리자 통계용 보정 (_coerce_log_df 중 행 단위 정규화로 이미 처리되지 않은 부분)
+    empty_mk = df["mission_key"].eq("")
+    if empty_mk.any():
+        df.loc[empty_mk, "mission_key"] = _map_unique(df.loc[empty_mk, "question_code"], lambda v: v.split("_Q")[0])
+    empty_title = df["mission_title"].eq("")
+    if empty_title.any():
+        mk = df.loc[empty_title, "mission_key"]
+        df.loc[empty_title, "mission_title"] = _map_unique(mk, lambda m: SCENARIOS.get(str(m), {}).get("title", str(m)))
+    df["timestamp"] = pd.to_datetime(df["timestamp"], errors="coerce")
+    drop = blank(df["question_code"]).to_numpy()
+    if drop.any():
+        drop[drop] = blank(df.loc[drop, "question"]).to_numpy()
+        df = df[~drop].copy()
+    else:
+        df = df.copy()
     return df
 
 
-def _normalize_col_key(col_name: str) -> str:
-    return re.sub(r"[\s_\-\(\)\[\]/]+", "", str(col_name).strip().lower())
+def _complete_records_end(chunk: bytes) -> int:
+    """chunk(레코드 경계에서 시작)에서 마지막으로 완결된 CSV 레코드의 끝 위치.
 
+    따옴표 안의 개행(주관식 답안의 줄바꿈)은 레코드 경계로 보지 않는다.
+    """
+    nl = chunk.rfind(b"\n")
+    if nl < 0:
+        return 0
+    quotes = chunk.count(b'"', 0, nl)
+    while quotes % 2 == 1:
+        prev = chunk.rfind(b"\n", 0, nl)
+        if prev < 0:
+            return 0
+        quotes -= chunk.count(b'"', prev, nl)
+        nl = prev
+    return nl + 1
+
+
+def _read_active_log_delta(cursor: dict, *, to_eof: bool = False, max_bytes: int | None = None, as_frame: bool = False):
+    """현재(활성) 로그 CSV를 이어 읽기(tail) 한다.
+
+    cursor는 {offset, encoding, header_raw, header, inode}를 기억한다.
+    - 처음(offset=0)에는 전체를 읽어 인코딩/헤더를 판별
+    - 이후에는 offset 이후에 추가된 바이트만 파싱 (마지막 미완성 레코드는 다음 호출로 미룸)
+    - 파일이 교체(inode 변경)되었거나 줄었거나 헤더 바이트가 바뀌었으면 cursor를 비우고 처음부터 다시 읽음
+    - max_bytes를 주면 한 번에 그 크기 정도까지만 읽는다(대용량 일괄 처리용, 완결 레코드 단위).
+      처음 호출의 인코딩 판별도 그 첫 조각 기준이 된다.
+
+    - as_frame=True면 행 리스트 대신 관리자 통계용으로 정규화된 DataFrame(없으면 None)을 돌려준다.
+
+    반환: (정규화된 행 리스트, reset 여부) — reset=True면 이전에 받은 행은 버려야 한다.
+    """
+    reset = False
+    try:
+        st_log = LOG_FILE.stat()
+        size, inode = st_log.st_size, st_log.st_ino
+    except OSError:
+        size, inode = None, None
+    offset = int(cursor.get("offset", 0) or 0)
+    if offset and cursor.get("inode") not in (None, inode):
+        cursor.clear()
+        offset = 0
+        reset = True
+
+    if size is None or size == 0:
+        if offset:
+            reset = True
+        cursor.clear()
+        return (None if as_frame else []), reset
+
+    with open(LOG_FILE, "rb") as f:
+        header_raw = cursor.get("header_raw") or b""
+        if offset:
+            if size < offset or f.read(len(header_raw)) != header_raw:
+                cursor.clear()
+                offset = 0
+                reset = True
+        f.seek(offset)
+        want = size - offset
+        while True:
+            chunk = f.read(want if not max_bytes else min(want, max_bytes))
+            at_eof = offset + len(chunk) >= size
+            end = len(chunk) if (to_eof and at_eof) else _complete_records_end(chunk)
+            if end > 0 or at_eof or not max_bytes:
+                break
+            # 레코드 하나가 max_bytes보다 크면 조각을 늘려 다시 읽는다
+            max_bytes *= 2
+            f.seek(offset)
+
+    if end <= 0:
+        return (None if as_frame else []), reset
+    chunk = chunk[:end]
+
+    if offset == 0:
+        decoded, encoding = _decode_log_bytes(chunk)
+        all_rows = _split_csv_rows(decoded) if decoded.strip() else []
+        if not all_rows:
+            return (None if as_frame else []), reset
+        first = [str(x).strip() for x in (all_rows[0] or [])]
+        if not first or all(h == "" for h in first):
+            header_end = 0
+            data_rows = all_rows
+        else:
+            header_nl = chunk.find(b"\n")
+            header_end = header_nl + 1 if header_nl >= 0 else end
+            data_rows = all_rows[1:]
+        cursor.update({
+            "encoding": encoding,
+            "header_raw": chunk[:header_end],
+            "header": _fix_log_header(first),
+        })
+    else:
+        decoded, _ = _decode_log_bytes(chunk, cursor.get("encoding"))
+        if decoded is None:
+            # 추가분이 기존 인코딩과 다르면 전체 재판별
+            cursor.clear()
+            rows, _ = _read_active_log_delta(cursor, to_eof=to_eof, as_frame=as_frame)
+            return rows, True
+        data_rows = _split_csv_rows(decoded)
 
-def _find_first_matching_column(columns, aliases):
-    norm_map = {_normalize_col_key(c): c for c in columns}
-    alias_norms = [_normalize_col_key(a) for a in aliases]
-    for a in alias_norms:
-        if a in norm_map:
-            return norm_map[a]
-    # 부분 일치 fallback
-    for c in columns:
-        nc = _normalize_col_key(c)
-        if any(a in nc or nc in a for a in alias_norms if a):
-            return c
-    return None
+    cursor["offset"] = offset + end
+    cursor["inode"] = inode
+    if as_frame:
+        return _normalize_log_frame(_raw_log_frame(data_rows, cursor["header"])), reset
+    return _log_rows_to_dicts(data_rows, cursor["header"]), reset
 
 
 
+# ---------------------------------------------------------
+# 일자별 로그 세그먼트
+#   - LOG_FILE은 오늘(활성) 세그먼트만 담고, 지난 날짜 행은 LOG_SEGMENT_DIR의 gzip 세그먼트로 옮긴다
+#   - 세그먼트마다 집계 footer(JSON: 행 수, 문항/기관별 건수, 최소/최대 시각)를 함께 둔다
+#   - 읽기(_read_log_delta)는 세그먼트 → 활성 파일 순서로 이어 붙여 하나의 로그처럼 다룬다
+#   - 집계만 필요하면 log_aggregates()로 footer만 합산 (닫힌 세그먼트는 압축 해제하지 않음)
+# ---------------------------------------------------------
+LOG_SEGMENT_DIR = BASE_DIR / "log_segments"
+LOG_SEGMENT_GLOB = f"{LOG_FILE.stem}.????-??-??.csv.gz"
+_LOG_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}")
 
-def _read_excel_employee_file(xlsx_path: Path) -> pd.DataFrame:
-    """
-    직원명단 엑셀(.xlsx/.xls) 로더
-    - 1차: pandas.read_excel(engine=openpyxl)
-    - 2차: openpyxl 직접 파싱 (pandas optional dependency 오류 우회)
-    - 실패 시: CSV 저장 안내 메시지 포함 예외 발생
-    """
-    suffix = xlsx_path.suffix.lower()
 
-    # .xlsx 우선 처리
-    if suffix == ".xlsx":
-        # 1) pandas + openpyxl 엔진 시도
-        try:
-            return pd.read_excel(xlsx_path, engine="openpyxl")
-        except Exception as e1:
-            # 2) openpyxl 직접 파싱 시도 (pandas optional dependency 문제 우회)
-            try:
-                import openpyxl  # type: ignore
-            except Exception:
-                raise RuntimeError(
-                    "엑셀 파일 읽기 모듈(openpyxl)이 설치되어 있지 않습니다. "
-                    "requirements.txt에 openpyxl을 추가하거나, 직원명단을 CSV로 저장해 주세요."
-                ) from e1
+def _log_segment_path(day: str) -> Path:
+    return LOG_SEGMENT_DIR / f"{LOG_FILE.stem}.{day}.csv.gz"
 
-            try:
-                wb = openpyxl.load_workbook(xlsx_path, read_only=True, data_only=True)
-                ws = wb.active
 
-                # 첫 번째 유효 행을 헤더로 사용
-                header = None
-                data_rows = []
-                for row in ws.iter_rows(values_only=True):
-                    vals = ["" if v is None else str(v).strip() for v in row]
-                    if header is None:
+def _log_segment_footer_path(path: Path) -> Path:
+    return path.with_name(path.name[: -len(".csv.gz")] + ".footer.json")
+
+
+def _log_segment_paths() -> list:
+    if not LOG_SEGMENT_DIR.exists():
+        return []
+    return sorted(LOG_SEGMENT_DIR.glob(LOG_SEGMENT_GLOB))
+
+
+def _log_segments_signature() -> list:
+    """[[파일명, 크기, mtime_ns], ...] — 세그먼트 구성이 바뀌었는지 비교하는 용도."""
+    sig = []
+    for p in _log_segment_paths():
+        try:
+            st_seg = p.stat()
+        except OSError:
+            continue
+        sig.append([p.name, st_seg.st_size, st_seg.st_mtime_ns])
+    return sig
+
+
+def _read_log_segment_rows(path: Path, *, as_frame: bool = False):
+    """닫힌 세그먼트 1개를 읽어 정규화된 행 리스트로 반환 (헤더 기준이라 구버전 스키마도 허용).
+
+    as_frame=True면 관리자 통계용으로 정규화된 DataFrame을 반환한다.
+    """
+    try:
+        with gzip.open(path, "rb") as f:
+            raw = f.read()
+    except (OSError, EOFError):
+        return None if as_frame else []
+    decoded, _enc = _decode_log_bytes(raw)
+    all_rows = _split_csv_rows(decoded) if decoded.strip() else []
+    if not all_rows:
+        return None if as_frame else []
+    header = _fix_log_header([str(x).strip() for x in (all_rows[0] or [])])
+    if as_frame:
+        return _normalize_log_frame(_raw_log_frame(all_rows[1:], header))
+    return _log_rows_to_dicts(all_rows[1:], header)
+
+
+def _empty_log_aggregates() -> dict:
+    return {"rows": 0, "min_ts": "", "max_ts": "", "per_question": {}, "per_org": {}}
+
+
+def _fold_log_aggregates(agg: dict, row: dict) -> None:
+    agg["rows"] += 1
+    ts = str(row.get("timestamp", "") or "")
+    if ts:
+        if not agg["min_ts"] or ts < agg["min_ts"]:
+            agg["min_ts"] = ts
+        if ts > agg["max_ts"]:
+            agg["max_ts"] = ts
+    qcode = str(row.get("question_code", "") or "") or "Q?"
+    agg["per_question"][qcode] = agg["per_question"].get(qcode, 0) + 1
+    org = str(row.get("organization", "") or "").strip() or str(row.get("department", "") or "").strip() or "미분류"
+    agg["per_org"][org] = agg["per_org"].get(org, 0) + 1
+
+
+def _merge_log_aggregates(total: dict, part: dict) -> None:
+    total["rows"] += int(part.get("rows", 0) or 0)
+    for key, pick in (("min_ts", min), ("max_ts", max)):
+        val = str(part.get(key, "") or "")
+        if val:
+            total[key] = pick(total[key], val) if total[key] else val
+    for key in ("per_question", "per_org"):
+        for k, n in (part.get(key) or {}).items():
+            total[key][k] = total[key].get(k, 0) + int(n or 0)
+
+
+def _load_log_segment_footer(path: Path):
+    """세그먼트 footer. 없거나 세그먼트와 맞지 않으면(크기 불일치) 세그먼트를 읽어 다시 만든다."""
+    footer_path = _log_segment_footer_path(path)
+    try:
+        size = path.stat().st_size
+    except OSError:
+        return None
+    try:
+        footer = json.loads(footer_path.read_text(encoding="utf-8"))
+        if footer.get("segment_bytes") == size:
+            return footer
+    except Exception:
+        pass
+    agg = _empty_log_aggregates()
+    for row in _read_log_segment_rows(path):
+        _fold_log_aggregates(agg, row)
+    footer = {**agg, "schema_version": LOG_SCHEMA_VERSION, "segment_bytes": size}
+    try:
+        _write_json_atomic(footer_path, footer)
+    except Exception:
+        pass
+    return footer
+
+
+def _write_log_segment(day: str, rows_iter) -> dict:
+    """day 세그먼트를 (기존 세그먼트 행 + rows_iter)로 다시 써서 교체하고 footer를 기록한다."""
+    LOG_SEGMENT_DIR.mkdir(parents=True, exist_ok=True)
+    path = _log_segment_path(day)
+    tmp = path.with_name(f"{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+    agg = _empty_log_aggregates()
+    try:
+        with gzip.open(tmp, "wt", newline="", encoding="utf-8") as out:
+            writer = csv.DictWriter(out, fieldnames=LOG_FIELDNAMES, extrasaction="ignore")
+            writer.writeheader()
+            existing = _read_log_segment_rows(path) if path.exists() else []
+            for row in existing:
+                writer.writerow(row)
+                _fold_log_aggregates(agg, row)
+            for row in rows_iter:
+                writer.writerow(row)
+                _fold_log_aggregates(agg, row)
+        with open(tmp, "rb") as f:
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+    footer = {**agg, "schema_version": LOG_SCHEMA_VERSION, "segment_bytes": path.stat().st_size}
+    _write_json_atomic(_log_segment_footer_path(path), footer)
+    return footer
+
+
+def _log_rotation_journal_path() -> Path:
+    return LOG_SEGMENT_DIR / f".{LOG_FILE.stem}.rotation.json"
+
+
+def _log_segment_row_count(day: str) -> int:
+    path = _log_segment_path(day)
+    footer = _load_log_segment_footer(path) if path.exists() else None
+    return int((footer or {}).get("rows", 0) or 0)
+
+
+def _log_rotation_journal_bases() -> dict:
+    """중단된 직전 분리의 저널 {날짜: 분리 전 세그먼트 행 수}. 활성 파일이 이미 교체됐으면 빈 dict.
+
+    세그먼트를 쓰기 전에 활성 파일 inode와 함께 남기므로, 활성 파일이 그대로(inode 동일)라면
+    세그먼트 행 수 - 기준 행 수가 그 날짜에서 이미 세그먼트로 옮겨진(파일 앞부분의) 행 수다.
+    """
+    try:
+        journal = json.loads(_log_rotation_journal_path().read_text(encoding="utf-8"))
+        if journal.get("log_ino") != LOG_FILE.stat().st_ino:
+            return {}
+        return {str(day): int(base) for day, base in (journal.get("days") or {}).items()}
+    except (OSError, ValueError, TypeError, AttributeError):
+        return {}
+
+
+def _log_rotation_leftovers() -> list:
+    """중단된 분리가 남긴 임시 파일(활성 로그 .rotating, 세그먼트 .tmp)."""
+    found = list(LOG_FILE.parent.glob(f"{LOG_FILE.name}.*.rotating"))
+    if LOG_SEGMENT_DIR.exists():
+        found.extend(LOG_SEGMENT_DIR.glob(f"{LOG_SEGMENT_GLOB}.*.tmp"))
+    return found
+
+
+def _scan_log_for_rotation(today: str) -> tuple:
+    """잠금 없이 활성 로그를 훑어 today 이전 행이 있는지 본다. 반환: (분리할 행 있음, 오늘 행 수)"""
+    cursor = {}
+    kept = 0
+    while True:
+        rows, reset = _read_log_delta(cursor, to_eof=True, max_bytes=LOG_MIGRATE_READ_BYTES, segments=False)
+        if reset:
+            kept = 0
+        if not rows:
+            return False, kept
+        for row in rows:
+            ts = str(row.get("timestamp", "") or "")
+            if _LOG_DATE_RE.match(ts) and ts[:10] < today:
+                return True, kept
+            kept += 1
+
+
+def rotate_log_segments(today: str | None = None) -> dict:
+    """활성 로그에서 today 이전 날짜의 행을 일자별 gzip 세그먼트로 옮긴다.
+
+    세그먼트를 먼저 완성한 뒤 남은(오늘) 행으로 활성 파일을 새로 써서 교체한다.
+    교체 중에는 로그 파일 잠금을 잡아 기록기와 다른 프로세스를 잠시 막는다.
+    세그먼트 반영 전에 저널을 남겨, 활성 파일 교체 전에 중단돼도 다음 분리에서 행이 중복되지 않는다.
+    옮길 행이 없으면(잠금 없이 먼저 훑어 확인) 잠금도 잡지 않고 활성 파일도 다시 쓰지 않는다.
+    반환: {"rotated": 옮긴 행 수, "kept": 활성 파일에 남은 행 수, "segments": [날짜, ...]}
+    """
+    today = today or datetime.now().strftime("%Y-%m-%d")
+    _ensure_log_schema_file()
+    result = {"rotated": 0, "kept": 0, "segments": []}
+    if not LOG_FILE.exists():
+        return result
+    if not _log_rotation_leftovers() and not _log_rotation_journal_path().exists():
+        needed, kept = _scan_log_for_rotation(today)
+        if not needed:
+            return {**result, "kept": kept}
+    keep_tmp = LOG_FILE.with_name(f"{LOG_FILE.name}.{uuid.uuid4().hex[:8]}.rotating")
+    with open(LOG_FILE, "rb") as lock_f, _file_lock(lock_f):
+        # 잠금을 잡았으니 남아 있는 임시 파일은 모두 죽은 분리/변환의 잔재다
+        for stale in _log_rotation_leftovers():
+            try:
+                stale.unlink()
+            except OSError:
+                pass
+        bases = _log_rotation_journal_bases()
+        committed = {}
+        for day, base in bases.items():
+            done = _log_segment_row_count(day) - base
+            if done > 0:
+                committed[day] = done
+        skip = dict(committed)
+        by_day = {}
+        kept = 0
+        try:
+            with open(keep_tmp, "w", newline="", encoding="utf-8-sig") as out:
+                writer = csv.DictWriter(out, fieldnames=LOG_FIELDNAMES, extrasaction="ignore")
+                writer.writeheader()
+                cursor = {}
+                while True:
+                    rows, reset = _read_log_delta(cursor, to_eof=True, max_bytes=LOG_MIGRATE_READ_BYTES, segments=False)
+                    if reset:
+                        out.seek(0)
+                        out.truncate()
+                        writer.writeheader()
+                        by_day.clear()
+                        skip = dict(committed)
+                        kept = 0
+                    if not rows:
+                        break
+                    for row in rows:
+                        ts = str(row.get("timestamp", "") or "")
+                        day = ts[:10] if _LOG_DATE_RE.match(ts) else ""
+                        if day and day < today:
+                            if skip.get(day):
+                                # 중단된 직전 분리에서 이미 세그먼트에 들어간 행 (파일 앞부분 순서 그대로)
+                                skip[day] -= 1
+                                continue
+                            by_day.setdefault(day, []).append(row)
+                        else:
+                            writer.writerow(row)
+                            kept += 1
+                out.flush()
+                os.fsync(out.fileno())
+            journal_path = _log_rotation_journal_path()
+            if not by_day and not committed:
+                try:
+                    journal_path.unlink()
+                except OSError:
+                    pass
+                return {**result, "kept": kept}
+            if by_day:
+                LOG_SEGMENT_DIR.mkdir(parents=True, exist_ok=True)
+                _write_json_atomic(journal_path, {
+                    "log_ino": os.fstat(lock_f.fileno()).st_ino,
+                    "days": {**bases, **{day: _log_segment_row_count(day) for day in by_day if day not in bases}},
+                })
+            for day in sorted(by_day):
+                day_rows = by_day.pop(day)
+                _write_log_segment(day, day_rows)
+                result["segments"].append(day)
+                result["rotated"] += len(day_rows)
+            os.replace(keep_tmp, LOG_FILE)
+            try:
+                journal_path.unlink()
+            except OSError:
+                pass
+        finally:
+            if keep_tmp.exists():
+                try:
+                    keep_tmp.unlink()
+                except OSError:
+                    pass
+    _write_log_schema_sidecar()
+    result["kept"] = kept
+    return result
+
+
+def _log_segment_header(path: Path):
+    try:
+        with gzip.open(path, "rb") as f:
+            first = f.readline(64 * 1024)
+    except (OSError, EOFError):
+        return None
+    text, _enc = _decode_log_bytes(first)
+    try:
+        return [str(x).strip() for x in next(csv.reader([text.splitlines()[0]]))]
+    except (StopIteration, csv.Error, IndexError):
+        return []
+
+
+def migrate_log_segments() -> int:
+    """구버전 스키마로 기록된 닫힌 세그먼트를 현재 스키마로 다시 쓴다 (선택지 번호 역산 포함).
+
+    세그먼트 분리와 겹치지 않도록 로그 파일 잠금을 잡는다. 반환: 변환한 세그먼트 수
+    """
+    def _rewrite() -> int:
+        done = 0
+        for path in _log_segment_paths():
+            if _log_segment_header(path) in (None, LOG_FIELDNAMES):
+                continue
+            _write_log_segment(path.name[len(LOG_FILE.stem) + 1:][:10], [])
+            done += 1
+        return done
+
+    if not LOG_FILE.exists():
+        return _rewrite()
+    with open(LOG_FILE, "rb") as lock_f, _file_lock(lock_f):
+        return _rewrite()
+
+
+def _schedule_log_segment_migration() -> None:
+    """구버전 세그먼트 변환을 프로세스당 한 번 백그라운드로 (끝나면 컬럼형 스냅샷 갱신)."""
+    store = _process_store("log_segment_migration")
+    with store["lock"]:
+        if store.get("started"):
+            return
+        store["started"] = True
+
+    def _run():
+        try:
+            store["migrated"] = migrate_log_segments()
+            if store["migrated"]:
+                _schedule_log_snapshot_compaction()
+        except Exception as e:
+            store["error"] = str(e)
+
+    threading.Thread(target=_run, name="log-segment-migration", daemon=True).start()
+
+
+def _maybe_rotate_log_segments() -> None:
+    """프로세스당 하루 한 번, 날짜가 바뀐 뒤 첫 rerun에서 백그라운드로 세그먼트 분리."""
+    today = datetime.now().strftime("%Y-%m-%d")
+    store = _process_store("log_rotation")
+    with store["lock"]:
+        if store.get("day") == today:
+            return
+        store["day"] = today
+
+    def _run():
+        try:
+            store["last"] = rotate_log_segments(today)
+            _schedule_log_snapshot_compaction()
+        except Exception as e:
+            store["error"] = str(e)
+
+    threading.Thread(target=_run, name="log-segment-rotation", daemon=True).start()
+
+
+def log_aggregates() -> dict:
+    """전체 로그 집계(행 수, 문항/기관별 건수, 최소/최대 시각).
+
+    닫힌 세그먼트는 footer만 합산하고, 활성 파일만 이어 읽기로 반영한다.
+    """
+    total = _empty_log_aggregates()
+    segments = _log_segment_paths()
+    for path in segments:
+        footer = _load_log_segment_footer(path)
+        if footer:
+            _merge_log_aggregates(total, footer)
+    store = _process_store("log_active_aggregates")
+    with store["lock"]:
+        cursor = store.setdefault("cursor", {})
+        rows, reset = _read_log_delta(cursor, segments=False)
+        if reset or store.get("agg") is None:
+            store["agg"] = _empty_log_aggregates()
+        for row in rows:
+            _fold_log_aggregates(store["agg"], row)
+        _merge_log_aggregates(total, store["agg"])
+    total["segments"] = len(segments)
+    return total
+
+
+def _read_log_delta(cursor: dict, *, to_eof: bool = False, max_bytes: int | None = None, segments: bool = True):
+    """로그(닫힌 세그먼트 + 활성 파일)를 하나의 로그처럼 이어 읽기(tail) 한다.
+
+    cursor는 호출 측이 보관하는 dict로 {segments, pending_segments, active}를 기억한다.
+    - 세그먼트 구성이 바뀌면(분리/병합) cursor를 비우고 처음부터 다시 읽음
+    - 아직 읽지 않은 세그먼트를 먼저 돌려주고, 이후에는 활성 파일의 추가분만 읽는다
+    - max_bytes를 주면 호출당 세그먼트 1개 또는 활성 파일 조각 1개만 읽는다(대용량 일괄 처리용)
+    - segments=False면 활성 파일만 읽는다 (마이그레이션/세그먼트 분리 자체에서 사용)
+
+    반환: (정규화된 행 리스트, reset 여부) — reset=True면 이전에 받은 행은 버려야 한다.
+    """
+    reset = False
+    rows = []
+    if segments:
+        seg_sig = _log_segments_signature()
+        if cursor.get("segments") != seg_sig or "active" not in cursor:
+            reset = bool(cursor)
+            cursor.clear()
+            cursor.update({"segments": seg_sig, "pending_segments": [s[0] for s in seg_sig], "active": {}})
+        pending = cursor["pending_segments"]
+        if pending:
+            take = pending[:1] if max_bytes else list(pending)
+            for name in take:
+                rows.extend(_read_log_segment_rows(LOG_SEGMENT_DIR / name))
+            del pending[: len(take)]
+            if max_bytes:
+                return rows, reset
+    else:
+        cursor.setdefault("active", {})
+
+    active_rows, active_reset = _read_active_log_delta(cursor["active"], to_eof=to_eof, max_bytes=max_bytes)
+    if active_reset and segments:
+        # 활성 파일이 교체/절단된 경우: 세그먼트와 어긋나지 않도록 전체를 처음부터 다시 읽는다
+        cursor.clear()
+        rows, _ = _read_log_delta(cursor, to_eof=to_eof, max_bytes=max_bytes)
+        return rows, True
+    return rows + active_rows, reset or active_reset
+
+
+# ---------------------------------------------------------
+# 로그 스키마 버전 관리
+#   - 사이드카(LOG_SCHEMA_FILE)에 현재 로그 파일(inode)의 스키마 버전을 기록
+#   - 실행 중에는 프로세스당 한 번만 확인 (일반 rerun에서는 로그 파일을 열지 않음)
+#   - 구버전이면 스트리밍 방식으로 새 파일에 옮겨 쓴 뒤 교체: python app.py migrate-log
+# ---------------------------------------------------------
+LOG_SCHEMA_VERSION = 2  # v2: selected_option_index, content_version 추가
+LOG_SCHEMA_FILE = BASE_DIR / ".compliance_training_log.schema.json"
+LOG_MIGRATE_READ_BYTES = 8 * 1024 * 1024
+
+
+def _log_header_fields():
+    """로그 첫 줄(헤더) 컬럼 목록. 파일이 없거나 비어 있으면 None."""
+    try:
+        with open(LOG_FILE, "rb") as f:
+            first = f.readline(64 * 1024)
+    except OSError:
+        return None
+    if not first.strip():
+        return None
+    text, _enc = _decode_log_bytes(first)
+    try:
+        return [str(x).strip() for x in next(csv.reader([text.splitlines()[0]]))]
+    except (StopIteration, csv.Error, IndexError):
+        return []
+
+
+def _write_log_schema_sidecar() -> None:
+    try:
+        inode = LOG_FILE.stat().st_ino
+    except OSError:
+        return
+    _write_json_atomic(LOG_SCHEMA_FILE, {
+        "version": LOG_SCHEMA_VERSION,
+        "fields": LOG_FIELDNAMES,
+        "inode": inode,
+        "checked_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+    })
+
+
+def _log_schema_status() -> str:
+    """"ok" | "missing"(로그 없음) | "migrate"(구버전/혼합 스키마)"""
+    try:
+        st_log = LOG_FILE.stat()
+    except OSError:
+        return "missing"
+    if st_log.st_size == 0:
+        return "missing"
+    try:
+        meta = json.loads(LOG_SCHEMA_FILE.read_text(encoding="utf-8"))
+    except Exception:
+        meta = {}
+    if (
+        meta.get("version") == LOG_SCHEMA_VERSION
+        and meta.get("fields") == LOG_FIELDNAMES
+        and meta.get("inode") == st_log.st_ino
+    ):
+        return "ok"
+    if _log_header_fields() == LOG_FIELDNAMES:
+        _write_log_schema_sidecar()
+        return "ok"
+    return "migrate"
+
+
+def migrate_log_file() -> dict:
+    """구버전 로그를 현재 스키마로 옮겨 쓴다 (조각 단위 스트리밍 → 임시 파일 → 교체).
+
+    마이그레이션 동안 로그 파일 잠금을 잡아 다른 프로세스의 기록을 잠시 막는다.
+    반환: {"migrated": bool, "rows": 옮긴 행 수}
+    """
+    if _log_schema_status() != "migrate":
+        return {"migrated": False, "rows": 0}
+    tmp = LOG_FILE.with_name(f"{LOG_FILE.name}.{uuid.uuid4().hex[:8]}.migrating")
+    count = 0
+    with open(LOG_FILE, "rb") as lock_f, _file_lock(lock_f):
+        if _log_header_fields() == LOG_FIELDNAMES:  # 다른 프로세스가 먼저 처리
+            _write_log_schema_sidecar()
+            return {"migrated": False, "rows": 0}
+        try:
+            with open(tmp, "w", newline="", encoding="utf-8-sig") as out:
+                writer = csv.DictWriter(out, fieldnames=LOG_FIELDNAMES, extrasaction="ignore")
+                writer.writeheader()
+                cursor = {}
+                while True:
+                    rows, reset = _read_log_delta(cursor, to_eof=True, max_bytes=LOG_MIGRATE_READ_BYTES, segments=False)
+                    if reset:
+                        # 인코딩 재판별로 처음부터 다시 읽힌 경우: 결과 파일도 처음부터
+                        out.seek(0)
+                        out.truncate()
+                        writer.writeheader()
+                        count = 0
+                    if not rows:
+                        break
+                    for row in rows:
+                        writer.writerow(_normalize_log_row(row))
+                    count += len(rows)
+                out.flush()
+                os.fsync(out.fileno())
+            os.replace(tmp, LOG_FILE)
+        finally:
+            if tmp.exists():
+                try:
+                    tmp.unlink()
+                except OSError:
+                    pass
+    _write_log_schema_sidecar()
+    return {"migrated": True, "rows": count}
+
+
+def _ensure_log_schema_file(*, background: bool = False, recheck: bool = False) -> None:
+    """로그 스키마가 현재 버전인지 프로세스당 한 번 확인하고, 필요하면 마이그레이션.
+
+    background=True면 마이그레이션을 별도 스레드에서 진행하고 바로 돌아온다(화면 경로용).
+    recheck=True면 캐시를 무시하고 다시 확인한다(로그 파일이 새로 생기거나 교체된 경우).
+    """
+    store = _process_store("log_schema")
+    with store["lock"]:
+        if store.get("checked") and not recheck:
+            return
+        if store.get("migrating"):
+            thread = store.get("thread")
+        else:
+            thread = None
+            status = _log_schema_status()
+            if status != "migrate":
+                store["checked"] = True
+                return
+            store["migrating"] = True
+
+            def _run():
+                try:
+                    migrate_log_file()
+                    with store["lock"]:
+                        store["checked"] = True
+                except Exception as e:
+                    store["error"] = str(e)
+                finally:
+                    with store["lock"]:
+                        store["migrating"] = False
+
+            thread = store["thread"] = threading.Thread(target=_run, name="log-schema-migration", daemon=True)
+            thread.start()
+    if thread is not None and not background:
+        thread.join()
+
+
+def _coerce_log_df(df: pd.DataFrame) -> pd.DataFrame:
+    """관리자 통계용 컬럼/타입 정규화 (행 단위 정규화 결과용 기준 구현).
+
+    로그 읽기 경로는 _normalize_log_frame을 사용하고, 이 함수는 bench-normalize에서 결과 비교 기준으로 쓴다.
+    """
+    if df is None:
+        return pd.DataFrame()
+
+    df = df.copy()
+    # 중복 컬럼 제거 (구버전/깨진 CSV 방어)
+    if hasattr(df.columns, "duplicated") and df.columns.duplicated().any():
+        df = df.loc[:, ~df.columns.duplicated()].copy()
+    # 예상 컬럼 채우기
+    for col in LOG_FIELDNAMES:
+        if col not in df.columns:
+            df[col] = ""
+
+    # 문자열 컬럼 정리
+    for col in ["training_attempt_id", "employee_no", "name", "organization", "department", "mission_key", "mission_title", "question_code", "question_type", "question", "selected_or_text", "is_correct", "content_version"]:
+        df[col] = df[col].fillna("").astype(str)
+
+    # 기관 보정
+    df["organization"] = df["organization"].replace("", pd.NA).fillna(df["department"]).fillna("미분류").astype(str)
+
+    # question_index / question_code 복원
+    qidx_from_code = pd.to_numeric(df["question_code"].astype(str).str.extract(r"_Q(\d+)")[0], errors="coerce")
+    qidx_existing = pd.to_numeric(df["question_index"], errors="coerce")
+    df["question_index"] = qidx_existing.fillna(qidx_from_code).fillna(0).astype(int)
+
+    mk_from_code = df["question_code"].astype(str).str.split("_Q").str[0]
+    df["mission_key"] = df["mission_key"].replace("", pd.NA).fillna(mk_from_code).fillna("").astype(str)
+
+    # mission_title 복원
+    if "mission_title" not in df.columns:
+        df["mission_title"] = ""
+    df["mission_title"] = df["mission_title"].replace("", pd.NA)
+    mapped_titles = df["mission_key"].map(lambda x: SCENARIOS.get(str(x), {}).get("title", str(x)))
+    df["mission_title"] = df["mission_title"].fillna(mapped_titles).fillna("미상 테마").astype(str)
+
+    # 숫자 컬럼
+    for col in ["awarded_score", "max_score", "attempt_no_for_mission", "attempt_round"]:
+        df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0)
+
+    # 시간 컬럼
+    df["timestamp"] = pd.to_datetime(df["timestamp"], errors="coerce")
+
+    # 완전 빈 행 제거
+    if "question_code" in df.columns:
+        df = df[~((df["question_code"].str.strip() == "") & (df["question"].str.strip() == ""))].copy()
+
+    return df
+
+
+def _synthetic_log_rows(n: int, *, legacy: bool = False, seed: int = 7):
+    """bench-normalize용 합성 로그 (헤더, CSV 행 리스트). 빈 값/깨진 숫자/구버전 컬럼을 섞는다."""
+    rnd = random.Random(seed)
+    if legacy:
+        header = ["timestamp", "session_id", "emp_no", "name", "department", "question_code", "question_type",
+                  "question", "selected_or_text", "is_correct", "awarded_score", "max_score", "attempt_no_for_mission",
+                  "attempt_round_total"]
+    else:
+        header = list(LOG_FIELDNAMES)
+    missions = list(SCENARIO_ORDER) + ["", "legacy_theme"]
+    orgs = ["감사실", "경영총괄", "사업총괄", "", "  ", "연구소"]
+    numbers = ["10", "0", "5", "7.5", "", " 3 ", "x", "1_000", "-2", "inf", "nan", "1e1"]
+    option_texts = ["서면 계약 확인", "a,b\n줄바꿈", ""] + [
+        opt for opts in list(MCQ_OPTION_INDEX.values())[:2] for opt in list(opts)[:2]
+    ]
+    versions = ["", *list(QUIZ_CONTENT_VERSIONS.values())[:2]]
+    rows = []
+    for i in range(n):
+        mk = rnd.choice(missions)
+        qi = rnd.choice(["1", "2", "3", "", " ", "2.0"])
+        qcode = rnd.choice([f"{mk}_Q{qi.strip() or 1}", "", f"{mk}_Q{rnd.randint(1, 3)}"])
+        values = {
+            "timestamp": rnd.choice([f"2026-03-{10 + i % 9:02d} {i % 24:02d}:{i % 60:02d}:{(i * 7) % 60:02d}", "", "bad-ts"]),
+            "training_attempt_id": rnd.choice([f"run-{i // 9}", ""]),
+            "session_id": rnd.choice([f"s-{i // 9}", ""]),
+            "attempt_round": rnd.choice(["1", "2", "", "0", "-1"]),
+            "attempt_round_total": rnd.choice(["1", "3", "", "0"]),
+            "employee_no": rnd.choice([f"1000{i % 5000:04d}", ""]),
+            "emp_no": rnd.choice([f"1000{i % 5000:04d}", ""]),
+            "name": f"학습자{i % 700}",
+            "organization": rnd.choice(orgs),
+            "department": rnd.choice(orgs),
+            "mission_key": mk,
+            "mission_title": rnd.choice(["", SCENARIOS.get(mk, {}).get("title", ""), " "]),
+            "question_index": qi,
+            "question_code": qcode,
+            "question_type": rnd.choice(["mcq", "text"]),
+            "question": rnd.choice(["문항", "", " "]),
+            "selected_or_text": rnd.choice(option_texts),
+            "is_correct": rnd.choice(["Y", "N", "PARTIAL", ""]),
+            "awarded_score": rnd.choice(numbers),
+            "max_score": rnd.choice(numbers),
+            "attempt_no_for_mission": rnd.choice(numbers),
+            "selected_option_index": rnd.choice(["", "", "0", "2", " 1 ", "x", "-1", "1.0"]),
+            "content_version": rnd.choice(versions),
+        }
+        row = [values[h] for h in header]
+        cut = rnd.random()
+        if cut < 0.01:
+            row = row[: rnd.randint(1, len(row))]        # 짧은 행
+        elif cut < 0.02:
+            row = row + ["extra"]                          # 긴 행
+        elif cut < 0.025:
+            row = [""] * len(row)                          # 빈 행
+        rows.append(row)
+    return header, rows
+
+
+def run_normalize_benchmark(rows: int = 1_000_000, *, out=print) -> bool:
+    """행 단위(_normalize_log_row + _coerce_log_df) vs 컬럼 단위(_normalize_log_frame) 비교.
+
+    같은 입력에서 두 결과가 완전히 같은지 확인하고 소요 시간을 출력한다. 반환: 결과 일치 여부
+    """
+    identical = True
+    for legacy in (False, True):
+        header, data_rows = _synthetic_log_rows(rows, legacy=legacy)
+        header = _fix_log_header(header)
+        label = "구버전 스키마" if legacy else "현재 스키마"
+
+        t0 = time.perf_counter()
+        row_dicts = _log_rows_to_dicts_rowwise(data_rows, header)
+        t1 = time.perf_counter()
+        expected = _coerce_log_df(pd.DataFrame(row_dicts, columns=LOG_FIELDNAMES))
+        t2 = time.perf_counter()
+        actual = _normalize_log_frame(_raw_log_frame(data_rows, header))
+        t3 = time.perf_counter()
+
+        try:
+            pd.testing.assert_frame_equal(actual, expected)
+            pd.testing.assert_frame_equal(
+                _normalize_log_frame(_raw_log_frame(data_rows, header), coerce=False),
+                pd.DataFrame(row_dicts, columns=LOG_FIELDNAMES),
+            )
+            same = "일치"
+        except AssertionError as e:
+            identical = False
+            same = f"불일치: {str(e).splitlines()[0]}"
+        before, after = t2 - t0, t3 - t2
+        out(
+            f"[{label}] {rows:,}행 · 행 단위 {before:.2f}s (정규화 {t1 - t0:.2f}s + coerce {t2 - t1:.2f}s) "
+            f"→ 컬럼 단위 {after:.2f}s ({before / max(after, 1e-9):.1f}배) · 결과 {same}"
+        )
+    return identical
+
+
+def _normalize_col_key(col_name: str) -> str:
+    return re.sub(r"[\s_\-\(\)\[\]/]+", "", str(col_name).strip().lower())
+
+
+def _find_first_matching_column(columns, aliases):
+    norm_map = {_normalize_col_key(c): c for c in columns}
+    alias_norms = [_normalize_col_key(a) for a in aliases]
+    for a in alias_norms:
+        if a in norm_map:
+            return norm_map[a]
+    # 부분 일치 fallback
+    for c in columns:
+        nc = _normalize_col_key(c)
+        if any(a in nc or nc in a for a in alias_norms if a):
+            return c
+    return None
+
+
+
+
+def _read_excel_employee_file(xlsx_path: Path) -> pd.DataFrame:
+    """
+    직원명단 엑셀(.xlsx/.xls) 로더
+    - 1차: pandas.read_excel(engine=openpyxl)
+    - 2차: openpyxl 직접 파싱 (pandas optional dependency 오류 우회)
+    - 실패 시: CSV 저장 안내 메시지 포함 예외 발생
+    """
+    suffix = xlsx_path.suffix.lower()
+
+    # .xlsx 우선 처리
+    if suffix == ".xlsx":
+        # 1) pandas + openpyxl 엔진 시도
+        try:
+            return pd.read_excel(xlsx_path, engine="openpyxl")
+        except Exception as e1:
+            # 2) openpyxl 직접 파싱 시도 (pandas optional dependency 문제 우회)
+            try:
+                import openpyxl  # type: ignore
+            except Exception:
+                raise RuntimeError(
+                    "엑셀 파일 읽기 모듈(openpyxl)이 설치되어 있지 않습니다. "
+                    "requirements.txt에 openpyxl을 추가하거나, 직원명단을 CSV로 저장해 주세요."
+                ) from e1
+
+            try:
+                wb = openpyxl.load_workbook(xlsx_path, read_only=True, data_only=True)
+                ws = wb.active
+
+                # 첫 번째 유효 행을 헤더로 사용
+                header = None
+                data_rows = []
+                for row in ws.iter_rows(values_only=True):
+                    vals = ["" if v is None else str(v).strip() for v in row]
+                    if header is None:
                         # 완전 빈 행은 스킵
                         if all(v == "" for v in vals):
                             continue
@@ -2132,12 +3593,8 @@ def _read_excel_employee_file(xlsx_path: Path) -> pd.DataFrame:
         ) from e
 
 
-def load_employee_master_df():
-    """
-    app.py와 같은 폴더의 직원명단(csv/xlsx)을 자동 탐색해 표준 컬럼(employee_no/name/organization)으로 반환.
-    """
+def _discover_employee_master_files() -> list:
     candidate_paths = []
-    existing_names = {p.name.lower(): p for p in BASE_DIR.iterdir() if p.is_file()}
 
     # 1) 우선순위 파일명
     for nm in EMPLOYEE_MASTER_CANDIDATE_NAMES:
@@ -2154,7 +3611,10 @@ def load_employee_master_df():
             continue
         if p not in candidate_paths and any(k in lower for k in ["employee", "employees", "staff", "직원", "사번", "명단", "임직원"]):
             candidate_paths.append(p)
+    return candidate_paths
+
 
+def _build_employee_master_df(candidate_paths: list):
     if not candidate_paths:
         return None, "직원 명단 파일 미탐지 (예: employee_master.xlsx / 직원명단.xlsx)"
 
@@ -2220,6 +3680,213 @@ def load_employee_master_df():
     return None, f"직원 명단 파일을 읽지 못했습니다. ({last_err or '형식 확인 필요'})"
 
 
+def _employee_master_files_key(candidate_paths: list) -> tuple:
+    return tuple((str(p), tuple(_file_signature(p) or ())) for p in candidate_paths)
+
+
+EMPLOYEE_MASTER_RETRY_SEC = 30.0
+
+
+def _rebuild_employee_master_in_background(store: dict, candidate_paths: list, key: tuple) -> None:
+    """새 명단을 백그라운드로 읽어 교체. 읽기에 실패하면(복사 중인 xlsx 등) 이전 명단과 key를 그대로 두고
+    오류만 store["error"]에 남겨, 파일이 다시 바뀌거나 EMPLOYEE_MASTER_RETRY_SEC가 지나면 재시도한다."""
+    def _run():
+        try:
+            result = _build_employee_master_df(candidate_paths)
+        except Exception as e:
+            result = (None, f"직원 명단 파일을 읽지 못했습니다. ({e})")
+        with store["lock"]:
+            store["building_key"] = None
+            prev = store.get("result")
+            if result[0] is None and prev is not None and prev[0] is not None:
+                store["error"] = {"key": key, "at": time.time(), "message": result[1]}
+                return
+            store["result"] = result
+            store["key"] = key
+            store["version"] = int(store.get("version", 0)) + 1
+            store["error"] = None
+
+    store["building_key"] = key
+    threading.Thread(target=_run, name="employee-master-rebuild", daemon=True).start()
+
+
+def load_employee_master_df():
+    """
+    app.py와 같은 폴더의 직원명단(csv/xlsx)을 자동 탐색해 표준 컬럼(employee_no/name/organization)으로 반환.
+
+    - 정규화된 명단은 프로세스 전체(모든 세션)가 공유하며, 후보 파일의 경로/크기/수정시각이 같으면 재파싱하지 않음
+    - 파일이 바뀌면 이전 명단을 계속 제공하면서 백그라운드에서 새로 읽어 한 번에 교체 (읽기에 실패하면 이전 명단 유지)
+    - 반환된 DataFrame은 공유 객체이므로 수정하지 말 것
+    """
+    store = _process_store("employee_master")
+    with store["lock"]:
+        dir_sig = _file_signature(BASE_DIR)
+        if store.get("candidates") is None or store.get("dir_sig") != dir_sig:
+            store["candidates"] = _discover_employee_master_files()
+            store["dir_sig"] = dir_sig
+        candidate_paths = store["candidates"]
+        key = _employee_master_files_key(candidate_paths)
+
+        result = store.get("result")
+        if result is not None and store.get("key") == key:
+            return result
+        if result is None:
+            result = _build_employee_master_df(candidate_paths)
+            store["result"] = result
+            store["key"] = key
+            store["version"] = int(store.get("version", 0)) + 1
+            return result
+        failed = store.get("error") or {}
+        if failed.get("key") == key and time.time() - failed.get("at", 0.0) < EMPLOYEE_MASTER_RETRY_SEC:
+            return result
+        if store.get("building_key") != key:
+            _rebuild_employee_master_in_background(store, candidate_paths, key)
+        return result
+
+
+# ---------------------------------------------------------
+# 성명 조회 인덱스 (직원 명단 버전별 1회 생성)
+#   - 정확 일치 버킷 / 2-gram 부분 일치 / 초성 검색 / 자모 단위 오타 1개 허용
+# ---------------------------------------------------------
+_HANGUL_CHOSUNG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_HANGUL_JUNGSUNG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+_HANGUL_JONGSUNG = " ㄱㄲㄳㄴㄵㄶㄷㄹㄺㄻㄼㄽㄾㄿㅀㅁㅂㅄㅅㅆㅇㅈㅊㅋㅌㅍㅎ"
+_CHOSUNG_QUERY_RE = re.compile(r"^[ㄱ-ㅎ]+$")
+
+
+def _hangul_chosung(text: str) -> str:
+    out = []
+    for ch in str(text or ""):
+        code = ord(ch) - 0xAC00
+        out.append(_HANGUL_CHOSUNG[code // 588] if 0 <= code < 11172 else ch.lower())
+    return "".join(out)
+
+
+def _hangul_jamo(text: str) -> str:
+    out = []
+    for ch in str(text or ""):
+        code = ord(ch) - 0xAC00
+        if 0 <= code < 11172:
+            out.append(_HANGUL_CHOSUNG[code // 588])
+            out.append(_HANGUL_JUNGSUNG[(code % 588) // 28])
+            if code % 28:
+                out.append(_HANGUL_JONGSUNG[code % 28])
+        else:
+            out.append(ch.lower())
+    return "".join(out)
+
+
+def _ngram_postings(values: list, n: int = 2) -> dict:
+    postings = {}
+    for i, v in enumerate(values):
+        grams = {v[j:j + n] for j in range(len(v) - n + 1)} if len(v) >= n else {v}
+        for g in grams:
+            postings.setdefault(g, []).append(i)
+    return postings
+
+
+def _edit_distance_within(a: str, b: str, limit: int) -> bool:
+    if abs(len(a) - len(b)) > limit:
+        return False
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i] + [0] * len(b)
+        for j, cb in enumerate(b, 1):
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb))
+        if min(cur) > limit:
+            return False
+        prev = cur
+    return prev[-1] <= limit
+
+
+def _build_employee_search_index(emp_df: pd.DataFrame) -> dict:
+    names = emp_df["name"].astype(str).tolist()
+    lowered = [n.lower() for n in names]
+    chosung = [_hangul_chosung(n.strip()) for n in names]
+    exact = {}
+    for i, n in enumerate(names):
+        exact.setdefault(n.strip(), []).append(i)
+    return {
+        "size": len(names),
+        "lowered": lowered,
+        "exact": exact,
+        "chars": _ngram_postings(lowered, 1),
+        "bigrams": _ngram_postings(lowered, 2),
+        "chosung": chosung,
+        "chosung_bigrams": _ngram_postings(chosung, 2),
+        "typo": None,
+    }
+
+
+def _substring_search(values: list, postings: dict, q: str) -> list:
+    n = 1 if len(q) == 1 else 2
+    grams = {q[j:j + n] for j in range(len(q) - n + 1)}
+    lists = sorted((postings.get(g, []) for g in grams), key=len)
+    if not lists or not lists[0]:
+        return []
+    cand = set(lists[0])
+    for other in lists[1:]:
+        cand.intersection_update(other)
+        if not cand:
+            return []
+    return sorted(i for i in cand if q in values[i])
+
+
+def _typo_search(index: dict, q: str) -> list:
+    """자모 기준 편집거리 1 이내 이름 (삭제 이웃 방식, 최초 사용 시 생성)."""
+    typo = index.get("typo")
+    if typo is None:
+        unique = {}
+        for name, ids in index["exact"].items():
+            unique.setdefault(_hangul_jamo(name), []).extend(ids)
+        deletes = {}
+        for jamo in unique:
+            for variant in {jamo} | {jamo[:k] + jamo[k + 1:] for k in range(len(jamo))}:
+                deletes.setdefault(variant, []).append(jamo)
+        typo = index["typo"] = {"ids": unique, "deletes": deletes}
+
+    qj = _hangul_jamo(q)
+    found = set()
+    for variant in {qj} | {qj[:k] + qj[k + 1:] for k in range(len(qj))}:
+        for jamo in typo["deletes"].get(variant, []):
+            if jamo not in found and _edit_distance_within(qj, jamo, 1):
+                found.add(jamo)
+    return sorted(i for jamo in found for i in typo["ids"][jamo])
+
+
+def _search_employee_index(index: dict, query: str):
+    """성명 조회. 반환: (행 위치 리스트, 방식) — 방식은 exact/partial/chosung/typo/none."""
+    q = (query or "").strip()
+    if not q or not index or not index.get("size"):
+        return [], "none"
+    ids = index["exact"].get(q)
+    if ids:
+        return list(ids), "exact"
+    ids = _substring_search(index["lowered"], index["chars"] if len(q) == 1 else index["bigrams"], q.lower())
+    if ids:
+        return ids, "partial"
+    if _CHOSUNG_QUERY_RE.match(q):
+        if len(q) == 1:
+            return [], "none"
+        ids = _substring_search(index["chosung"], index["chosung_bigrams"], q)
+        return ids, ("chosung" if ids else "none")
+    if len(q) >= 2:
+        ids = _typo_search(index, q)
+        if ids:
+            return ids, "typo"
+    return [], "none"
+
+
+def _employee_search_index(emp_df: pd.DataFrame) -> dict:
+    """직원 명단(공유 DataFrame)별로 한 번만 인덱스를 만든다."""
+    store = _process_store("employee_search_index")
+    with store["lock"]:
+        if store.get("df") is not emp_df:
+            store["index"] = _build_employee_search_index(emp_df)
+            store["df"] = emp_df
+        return store["index"]
+
+
 def _employee_candidate_label(row: dict) -> str:
     emp_no = str(row.get("employee_no", "")).strip() or "사번없음"
     name = str(row.get("name", "")).strip() or "이름미상"
@@ -2396,18 +4063,17 @@ def append_attempt_log(mission_key: str, q_idx: int, q_type: str, payload: dict)
         "awarded_score": payload.get("awarded_score", 0),
         "max_score": question.get("score", 0),
         "attempt_no_for_mission": st.session_state.attempt_counts.get(mission_key, 0),
+        "selected_option_index": payload.get("selected_option_index", ""),
+        "content_version": QUIZ_CONTENT_VERSIONS.get(f"{mission_key}_Q{q_idx+1}", ""),
     })
 
     st.session_state.attempt_history.append(row)
 
     try:
-        _ensure_log_schema_file()
-        file_exists = LOG_FILE.exists()
-        with open(LOG_FILE, "a", newline="", encoding="utf-8-sig") as f:
-            writer = csv.DictWriter(f, fieldnames=LOG_FIELDNAMES)
-            if not file_exists:
-                writer.writeheader()
-            writer.writerow(row)
+        # 헤더/스키마 확인과 실제 기록은 기록기 스레드가 담당 (새 파일이면 헤더를 붙여 기록)
+        buf = io.StringIO()
+        csv.DictWriter(buf, fieldnames=LOG_FIELDNAMES).writerow(row)
+        _append_log_row_indexed(row, buf.getvalue().encode("utf-8"))
     except Exception as e:
         st.session_state.log_write_error = str(e)
 
@@ -2473,21 +4139,52 @@ def _expand_keyword_variants(keyword: str) -> list[str]:
         out.append(v2)
     return out
 
-def evaluate_text_answer(answer_text: str, rubric_keywords: dict, max_score: int):
-    """주관식 키워드 기반 평가 (가중치/최소일치수/유사표현 보정 지원)"""
-    text = (answer_text or "").strip()
-    if not text:
-        return {
-            "awarded_score": 0,
-            "found_groups": [],
-            "missing_groups": list(rubric_keywords.keys()),
-            "quality": "empty",
-            "score_breakdown": [],
-        }
-
-    lowered = text.lower()
-    compact = _normalize_korean_text_for_keyword_match(text)
+def _build_aho_corasick(patterns: list) -> dict:
+    """다중 패턴 문자열 검색용 Aho–Corasick 오토마톤. 패턴 번호는 리스트 순서."""
+    goto, fail, out = [{}], [0], [[]]
+    for pid, pat in enumerate(patterns):
+        node = 0
+        for ch in pat:
+            nxt = goto[node].get(ch)
+            if nxt is None:
+                nxt = len(goto)
+                goto[node][ch] = nxt
+                goto.append({})
+                fail.append(0)
+                out.append([])
+            node = nxt
+        out[node].append(pid)
+
+    queue = list(goto[0].values())
+    for node in queue:
+        for ch, nxt in goto[node].items():
+            queue.append(nxt)
+            f = fail[node]
+            while f and ch not in goto[f]:
+                f = fail[f]
+            fail[nxt] = goto[f].get(ch, 0) if node else 0
+            out[nxt] = out[nxt] + out[fail[nxt]]
+    return {"goto": goto, "fail": fail, "out": out}
+
+
+def _aho_corasick_hits(ac: dict, text: str) -> set:
+    """text 안에 (부분 문자열로) 나타나는 패턴 번호 집합."""
+    goto, fail, out = ac["goto"], ac["fail"], ac["out"]
+    hits = set()
+    node = 0
+    for ch in text:
+        while node and ch not in goto[node]:
+            node = fail[node]
+        node = goto[node].get(ch, 0)
+        if out[node]:
+            hits.update(out[node])
+    return hits
+
+
+def _compile_rubric(rubric_keywords: dict) -> dict:
+    """채점 기준을 그룹별 키워드(유사표현 확장/중복 제거)와 오토마톤 2개(압축/소문자 텍스트용)로 컴파일."""
     group_specs = []
+    norm_ids, low_ids = {}, {}
     for group_name, spec in (rubric_keywords or {}).items():
         if isinstance(spec, dict):
             keywords = [str(k).strip() for k in spec.get("keywords", []) if str(k).strip()]
@@ -2509,22 +4206,75 @@ def evaluate_text_answer(answer_text: str, rubric_keywords: dict, max_score: int
         if not expanded:
             expanded = keywords
 
-        dedup = []
+        patterns = []
         seen_kw = set()
         for kw in expanded:
             key = _normalize_korean_text_for_keyword_match(kw) or str(kw).lower()
             if key in seen_kw:
                 continue
             seen_kw.add(key)
-            dedup.append(kw)
+            kw_norm = _normalize_korean_text_for_keyword_match(kw)
+            kw_low = str(kw).lower().strip()
+            norm_id = norm_ids.setdefault(kw_norm, len(norm_ids)) if kw_norm else None
+            low_id = low_ids.setdefault(kw_low, len(low_ids)) if kw_low else None
+            patterns.append((kw, kw_norm, kw_low, norm_id, low_id))
 
         group_specs.append({
             "name": str(group_name),
-            "keywords": dedup,
+            "patterns": patterns,
             "weight": weight,
             "min_hits": min_hits,
         })
 
+    return {
+        "groups": group_specs,
+        "compact_ac": _build_aho_corasick(list(norm_ids)),
+        "lowered_ac": _build_aho_corasick(list(low_ids)),
+    }
+
+
+RUBRIC_CACHE_MAX = 512
+
+
+def _compiled_rubric(rubric_keywords: dict) -> dict:
+    """문항 채점 기준 + 유사표현 사전 버전별로 한 번만 컴파일 (프로세스 공유)."""
+    try:
+        key = json.dumps(
+            [rubric_keywords, _TEXT_KEYWORD_SYNONYM_MAP], ensure_ascii=False, sort_keys=True, default=str
+        )
+    except Exception:
+        return _compile_rubric(rubric_keywords)
+    store = _process_store("compiled_rubrics")
+    with store["lock"]:
+        cache = store.setdefault("cache", {})
+        hit = cache.get(key)
+        if hit is None:
+            hit = cache[key] = _compile_rubric(rubric_keywords)
+            while len(cache) > RUBRIC_CACHE_MAX:
+                cache.pop(next(iter(cache)))
+        return hit
+
+
+def evaluate_text_answer(answer_text: str, rubric_keywords: dict, max_score: int, *, compiled: dict | None = None):
+    """주관식 키워드 기반 평가 (가중치/최소일치수/유사표현 보정 지원)
+
+    compiled: _compile_rubric 결과를 직접 넘기면 캐시 조회를 건너뛴다(일괄 재채점용).
+    """
+    text = (answer_text or "").strip()
+    if not text:
+        return {
+            "awarded_score": 0,
+            "found_groups": [],
+            "missing_groups": list(rubric_keywords.keys()),
+            "quality": "empty",
+            "score_breakdown": [],
+        }
+
+    lowered = text.lower()
+    compact = _normalize_korean_text_for_keyword_match(text)
+    rubric = compiled if compiled is not None else _compiled_rubric(rubric_keywords)
+    group_specs = rubric["groups"]
+
     if not group_specs:
         return {
             "awarded_score": 0,
@@ -2534,6 +4284,10 @@ def evaluate_text_answer(answer_text: str, rubric_keywords: dict, max_score: int
             "score_breakdown": [],
         }
 
+    # 한 번의 스캔으로 전체 그룹의 키워드 적중을 구한다
+    compact_hits = _aho_corasick_hits(rubric["compact_ac"], compact)
+    lowered_hits = _aho_corasick_hits(rubric["lowered_ac"], lowered)
+
     found, missing = [], []
     raw_total = 0.0
     raw_earned = 0.0
@@ -2542,14 +4296,8 @@ def evaluate_text_answer(answer_text: str, rubric_keywords: dict, max_score: int
     for g in group_specs:
         matched = []
         seen = set()
-        for kw in g["keywords"]:
-            kw_norm = _normalize_korean_text_for_keyword_match(kw)
-            kw_low = str(kw).lower().strip()
-            hit_now = False
-            if kw_norm and kw_norm in compact:
-                hit_now = True
-            elif kw_low and kw_low in lowered:
-                hit_now = True
+        for kw, kw_norm, kw_low, norm_id, low_id in g["patterns"]:
+            hit_now = (norm_id is not None and norm_id in compact_hits) or (low_id is not None and low_id in lowered_hits)
             if hit_now:
                 dedup_key = kw_norm or kw_low
                 if dedup_key not in seen:
@@ -2612,6 +4360,278 @@ def get_grade(score: int, total: int):
 
 
 
+# ---------------------------------------------------------
+# 주관식 일괄 재채점 (python app.py regrade)
+#   - 로그를 조각 단위로 읽어 text 문항만 프로세스 풀에서 다시 채점
+#   - 결과는 REGRADE_DB_FILE에 버전별로 기록: text_regrades / regrade_attempt_totals / regrade_runs
+#   - --apply 시 시도별 총점 변화를 최종 결과(1인 1레코드)에 반영 (기준 점수를 regrade_applied에 남겨 멱등)
+# ---------------------------------------------------------
+REGRADE_DB_FILE = BASE_DIR / "compliance_regrade.sqlite3"
+REGRADE_READ_BYTES = 8 * 1024 * 1024
+REGRADE_BATCH_ROWS = 2000
+
+_REGRADE_WORKER_RUBRICS = {}
+
+
+class _LogChangedDuringRead(Exception):
+    pass
+
+
+def _text_question_specs() -> dict:
+    """question_code -> {"rubric": rubric_keywords, "max_score": 배점} (주관식 문항만)"""
+    specs = {}
+    for m_key, mission in SCENARIOS.items():
+        for i, q in enumerate(mission.get("quiz", []) or []):
+            if isinstance(q, dict) and q.get("rubric_keywords"):
+                specs[f"{m_key}_Q{i+1}"] = {"rubric": q["rubric_keywords"], "max_score": q.get("score", 0)}
+    return specs
+
+
+def _rubric_fingerprint(specs: dict) -> str:
+    raw = json.dumps([specs, _TEXT_KEYWORD_SYNONYM_MAP], ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:12]
+
+
+def _regrade_batch(batch: list) -> list:
+    """[(row_no, question_code, 답안)] -> [(row_no, 새 점수, is_correct)]. 풀 워커에서 실행된다."""
+    if not _REGRADE_WORKER_RUBRICS:
+        for qcode, spec in _text_question_specs().items():
+            _REGRADE_WORKER_RUBRICS[qcode] = (spec, _compile_rubric(spec["rubric"]))
+    out = []
+    for row_no, qcode, text in batch:
+        spec, compiled = _REGRADE_WORKER_RUBRICS[qcode]
+        res = evaluate_text_answer(text, spec["rubric"], spec["max_score"], compiled=compiled)
+        score = int(res["awarded_score"])
+        out.append((row_no, score, "PARTIAL" if score < spec["max_score"] else "Y"))
+    return out
+
+
+def _iter_log_chunks(max_bytes):
+    """로그를 조각 단위로 읽어 정규화된 행 리스트를 차례로 내보낸다."""
+    cursor = {}
+    while True:
+        rows, reset = _read_log_delta(cursor, to_eof=True, max_bytes=max_bytes)
+        if reset:
+            raise _LogChangedDuringRead()
+        if not rows:
+            if cursor.get("pending_segments"):
+                continue  # 빈 세그먼트
+            return
+        yield rows
+
+
+def _regrade_pool(workers: int):
+    if workers <= 1:
+        return None
+    try:
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("fork"))
+    except Exception:
+        return None  # fork 미지원 환경은 단일 프로세스로 처리
+
+
+def _score_value(value) -> float:
+    try:
+        return float(value or 0)
+    except Exception:
+        return 0.0
+
+
+def run_regrade(workers: int | None = None, apply: bool = False, *, read_bytes: int | None = REGRADE_READ_BYTES,
+                batch_rows: int = REGRADE_BATCH_ROWS, out=print) -> dict:
+    """로그의 주관식 답안을 현재 채점 기준으로 다시 채점해 버전별 테이블에 기록한다."""
+    from concurrent.futures import FIRST_COMPLETED, wait as wait_futures
+
+    specs = _text_question_specs()
+    fingerprint = _rubric_fingerprint(specs)
+    version = f"{datetime.now().strftime('%Y%m%d%H%M%S')}-{fingerprint}"
+    workers = max(1, int(workers or os.cpu_count() or 1))
+
+    meta = {}        # row_no -> (attempt_uid, employee_no, question_code, timestamp, old_score, max_score)
+    latest = {}      # attempt_uid -> {question_code: (timestamp, row_no, score)}
+    emp_of = {}      # attempt_uid -> employee_no
+    new_scores = {}  # row_no -> (new_score, is_correct)
+    row_no = 0
+    started = time.time()
+
+    pool = _regrade_pool(workers)
+    pending = set()
+
+    def _collect(results):
+        for rn, score, ok in results:
+            new_scores[rn] = (score, ok)
+
+    def _submit(batch):
+        nonlocal pending
+        if pool is None:
+            _collect(_regrade_batch(batch))
+            return
+        pending.add(pool.submit(_regrade_batch, batch))
+        if len(pending) >= workers * 2:
+            done, pending = wait_futures(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                _collect(fut.result())
+
+    try:
+        batch = []
+        try:
+            for rows in _iter_log_chunks(read_bytes):
+                for row in rows:
+                    row_no += 1
+                    qcode = str(row.get("question_code", "") or "").strip()
+                    emp = str(row.get("employee_no", "") or "").strip()
+                    name = str(row.get("name", "") or "").strip()
+                    org = str(row.get("organization", "") or "").strip() or "미분류"
+                    attempt_uid = str(row.get("training_attempt_id", "") or "").strip() or f"legacy|{emp or f'{org}|{name}'}"
+                    ts = str(row.get("timestamp", "") or "")
+                    old = _score_value(row.get("awarded_score"))
+                    emp_of.setdefault(attempt_uid, emp)
+                    prev = latest.setdefault(attempt_uid, {}).get(qcode)
+                    if prev is None or ts >= prev[0]:
+                        latest[attempt_uid][qcode] = (ts, row_no, old)
+
+                    if str(row.get("question_type", "")).strip() != "text" or qcode not in specs:
+                        continue
+                    meta[row_no] = (attempt_uid, emp, qcode, ts, old, specs[qcode]["max_score"])
+                    batch.append((row_no, qcode, str(row.get("selected_or_text", "") or "")))
+                    if len(batch) >= batch_rows:
+                        _submit(batch)
+                        batch = []
+        except _LogChangedDuringRead:
+            if read_bytes is None:
+                raise
+            # 인코딩이 섞인 로그 등: 조각 읽기를 포기하고 전체를 한 번에 다시 읽는다
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+            return run_regrade(workers, apply, read_bytes=None, batch_rows=batch_rows, out=out)
+
+        if batch:
+            _submit(batch)
+        for fut in pending:
+            _collect(fut.result())
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    # 시도별 총점(문항별 최신 제출 기준) 재계산
+    totals = []
+    for attempt_uid, qmap in latest.items():
+        old_total = sum(v[2] for v in qmap.values())
+        new_total = sum(new_scores[v[1]][0] if v[1] in new_scores else v[2] for v in qmap.values())
+        totals.append((version, attempt_uid, emp_of.get(attempt_uid, ""), old_total, new_total))
+
+    # 문항별 변화 리포트
+    per_q = {}
+    changed_rows = 0
+    for rn, (attempt_uid, emp, qcode, ts, old, max_score) in meta.items():
+        new = new_scores[rn][0]
+        d = per_q.setdefault(qcode, {"rows": 0, "changed": 0, "old_sum": 0.0, "new_sum": 0.0, "max_score": max_score})
+        d["rows"] += 1
+        d["old_sum"] += old
+        d["new_sum"] += new
+        if new != old:
+            d["changed"] += 1
+            changed_rows += 1
+
+    with closing(sqlite3.connect(str(REGRADE_DB_FILE), timeout=30.0)) as conn:
+        conn.execute("PRAGMA journal_mode=WAL")
+        with conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS regrade_runs (version TEXT PRIMARY KEY, created_at TEXT, "
+                "fingerprint TEXT, text_rows INTEGER, changed_rows INTEGER, applied INTEGER DEFAULT 0)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS text_regrades (version TEXT, row_no INTEGER, training_attempt_id TEXT, "
+                "employee_no TEXT, question_code TEXT, timestamp TEXT, old_score REAL, new_score REAL, "
+                "max_score REAL, is_correct TEXT, PRIMARY KEY (version, row_no))"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS regrade_attempt_totals (version TEXT, attempt_uid TEXT, employee_no TEXT, "
+                "old_total REAL, new_total REAL, PRIMARY KEY (version, attempt_uid))"
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO text_regrades VALUES (?,?,?,?,?,?,?,?,?,?)",
+                (
+                    (version, rn, m[0], m[1], m[2], m[3], m[4], new_scores[rn][0], m[5], new_scores[rn][1])
+                    for rn, m in meta.items()
+                ),
+            )
+            conn.executemany("INSERT OR REPLACE INTO regrade_attempt_totals VALUES (?,?,?,?,?)", totals)
+            conn.execute(
+                "INSERT OR REPLACE INTO regrade_runs VALUES (?,?,?,?,?,?)",
+                (version, datetime.now().strftime("%Y-%m-%d %H:%M:%S"), fingerprint, len(meta), changed_rows, 0),
+            )
+
+    applied = _apply_regrade_totals(version, totals) if apply else 0
+    if apply:
+        with closing(sqlite3.connect(str(REGRADE_DB_FILE), timeout=30.0)) as conn:
+            with conn:
+                conn.execute("UPDATE regrade_runs SET applied=? WHERE version=?", (applied, version))
+
+    elapsed = time.time() - started
+    out(f"재채점 버전: {version}  (로그 {row_no:,}행 / 주관식 {len(meta):,}건 / 변경 {changed_rows:,}건, {elapsed:.1f}초, 워커 {workers})")
+    out(f"{'문항':<24}{'건수':>8}{'변경':>8}{'기존평균':>10}{'재채점평균':>12}{'평균변화':>10}")
+    for qcode in sorted(per_q):
+        d = per_q[qcode]
+        old_avg = d["old_sum"] / d["rows"]
+        new_avg = d["new_sum"] / d["rows"]
+        out(f"{qcode:<24}{d['rows']:>8,}{d['changed']:>8,}{old_avg:>10.2f}{new_avg:>12.2f}{new_avg - old_avg:>+10.2f}")
+    if apply:
+        out(f"최종 결과 반영: {applied:,}명")
+    return {"version": version, "text_rows": len(meta), "changed_rows": changed_rows, "per_question": per_q, "applied": applied}
+
+
+def _apply_regrade_totals(version: str, totals: list) -> int:
+    """시도별 재채점 총점을 해당 시도의 최종 결과에 반영한다 (여러 번 실행해도 결과가 같다).
+
+    최종 점수 = 기준 점수 + (재채점 총점 - 로그 기록 총점). 기준 점수는 처음 반영할 때의 최종 점수로,
+    regrade_applied 테이블에 반영 점수와 함께 남겨 다음 실행에서 다시 쓴다. 반영 뒤 최종 결과가
+    바뀌었으면(같은 시도로 다시 제출 등) 그 점수를 새 기준으로 본다.
+    반환: 최종 점수가 바뀐 인원 수
+    """
+    by_uid = {uid: (old, new) for _v, uid, _emp, old, new in totals}
+    with closing(sqlite3.connect(str(REGRADE_DB_FILE), timeout=30.0)) as conn:
+        with conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS regrade_applied (attempt_uid TEXT PRIMARY KEY, version TEXT, "
+                "base_score REAL, applied_score REAL, applied_at TEXT)"
+            )
+        prior = {
+            uid: (base, applied_score)
+            for uid, base, applied_score in conn.execute("SELECT attempt_uid, base_score, applied_score FROM regrade_applied")
+        }
+
+    updates = []
+    records = []
+    now_text = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    for row in _load_results_df().to_dict("records"):
+        uid = str(row.get("training_attempt_id", "") or "").strip()
+        if uid not in by_uid:
+            continue
+        old, new = by_uid[uid]
+        if new == old and uid not in prior:
+            continue
+        current = _score_value(row.get("final_score"))
+        base = prior[uid][0] if uid in prior and current == prior[uid][1] else current
+        score = int(round(min(max(base + new - old, 0), TOTAL_SCORE)))
+        records.append((uid, version, base, score, now_text))
+        if score != current:
+            row["final_score"] = score
+            row["score_rate"] = round((score / float(TOTAL_SCORE)) * 100.0, 1) if TOTAL_SCORE else 0.0
+            row["grade"] = get_grade(score, TOTAL_SCORE)
+            updates.append(row)
+
+    # 기준 점수를 먼저 남긴다: 반영 도중 중단돼도 다음 실행이 같은 기준으로 다시 계산한다
+    if records:
+        with closing(sqlite3.connect(str(REGRADE_DB_FILE), timeout=30.0)) as conn:
+            with conn:
+                conn.executemany("INSERT OR REPLACE INTO regrade_applied VALUES (?,?,?,?,?)", records)
+    for row in updates:
+        _upsert_final_result(row)
+    return len(updates)
+
+
 def reset_game():
     st.session_state.clear()
     st.rerun()
@@ -2634,73 +4654,335 @@ def reset_participant_to_intro():
     st.rerun()
 
 
-def _derive_attempt_uid_series(df: pd.DataFrame) -> pd.Series:
-    if df is None or df.empty:
-        return pd.Series(dtype=str)
-    tmp = df.copy()
-    if "training_attempt_id" not in tmp.columns:
-        tmp["training_attempt_id"] = ""
-    base_id = tmp["training_attempt_id"].fillna("").astype(str).str.strip()
-    if "learner_id" not in tmp.columns:
-        if "employee_no" not in tmp.columns:
-            tmp["employee_no"] = ""
-        if "organization" not in tmp.columns:
-            tmp["organization"] = "미분류"
-        if "name" not in tmp.columns:
-            tmp["name"] = "이름미상"
-        tmp["learner_id"] = tmp["employee_no"].astype(str).where(
-            tmp["employee_no"].astype(str).str.strip() != "",
-            tmp["organization"].astype(str) + "|" + tmp["name"].astype(str)
-        )
-    legacy_id = "legacy|" + tmp["learner_id"].astype(str)
-    return base_id.where(base_id != "", legacy_id)
+# ---------------------------------------------------------
+# 학습자별 시도 인덱스 (모험 시작 시 재참여/3회 제한 판단용)
+#   learner -> attempt_uid -> {question_code: [timestamp, awarded_score]}
+#   - 사번 기준(by_emp)과 소속|이름 기준(by_name) 두 가지 키로 보관
+#   - append_attempt_log 기록 시 즉시 갱신, 다른 프로세스가 추가한 행은 이어 읽기로 반영
+# ---------------------------------------------------------
+ATTEMPT_INDEX_VERSION = 3
+ATTEMPT_INDEX_SAVE_INTERVAL_SEC = 30.0
 
-def _summarize_user_attempts(employee_no: str, name: str, organization: str):
-    total_questions = sum(len(SCENARIOS[k]["quiz"]) for k in SCENARIO_ORDER)
-    df, err = _load_log_df()
-    if err or df is None or df.empty:
-        return {"attempts_started": 0, "completed_attempts": 0, "best_score": 0, "last_score": 0, "attempts_df": pd.DataFrame()}
 
-    df = _coerce_log_df(df)
-    if df.empty:
-        return {"attempts_started": 0, "completed_attempts": 0, "best_score": 0, "last_score": 0, "attempts_df": pd.DataFrame()}
+def _empty_attempt_index() -> dict:
+    return {"version": ATTEMPT_INDEX_VERSION, "cursor": {}, "by_emp": {}, "by_name": {}}
+
+
+def _fold_attempt_row(index: dict, row: dict) -> None:
+    """정규화된 로그 1행을 인덱스에 반영한다. 같은 행을 다시 반영해도 결과가 같다."""
+    qcode = str(row.get("question_code", "") or "").strip()
+    if qcode == "" and str(row.get("question", "") or "").strip() == "":
+        return
+    emp = str(row.get("employee_no", "") or "").strip()
+    name = str(row.get("name", "") or "").strip()
+    org = str(row.get("organization", "") or "").strip() or "미분류"
+    learner_id = emp if emp else f"{org}|{name}"
+    attempt_uid = str(row.get("training_attempt_id", "") or "").strip() or f"legacy|{learner_id}"
+    ts = str(row.get("timestamp", "") or "")
+    try:
+        score = float(row.get("awarded_score", 0) or 0)
+    except Exception:
+        score = 0.0
+    try:
+        attempt_round = int(float(row.get("attempt_round", 1) or 1))
+    except Exception:
+        attempt_round = 1
+
+    targets = [index["by_name"].setdefault(f"{org}|{name}", {})]
+    if emp:
+        targets.append(index["by_emp"].setdefault(emp, {}))
+    for attempts in targets:
+        att = attempts.setdefault(attempt_uid, {"q": {}, "last": "", "round": 0})
+        prev = att["q"].get(qcode)
+        # 같은 문항은 가장 늦은 제출(동시각이면 나중 행)이 유효
+        if prev is None or ts >= prev[0]:
+            att["q"][qcode] = [ts, score]
+        if ts > att["last"]:
+            att["last"] = ts
+        if attempt_round > att["round"]:
+            att["round"] = attempt_round
+
+
+def _load_attempt_index_file():
+    if not ATTEMPT_INDEX_FILE.exists():
+        return None
+    try:
+        data = json.loads(ATTEMPT_INDEX_FILE.read_text(encoding="utf-8"))
+    except Exception:
+        return None
+    if not isinstance(data, dict) or data.get("version") != ATTEMPT_INDEX_VERSION:
+        return None
+    cursor = data.get("cursor") or {}
+    active = cursor.get("active") or {}
+    if active.get("header_raw") is not None:
+        active["header_raw"] = bytes.fromhex(active["header_raw"])
+    data["cursor"] = cursor
+    return data
+
+
+def _save_attempt_index(store: dict) -> None:
+    data = dict(store["data"])
+    cursor = dict(data.get("cursor") or {})
+    if cursor.get("active") is not None:
+        active = cursor["active"] = dict(cursor["active"])
+        if active.get("header_raw") is not None:
+            active["header_raw"] = active["header_raw"].hex()
+    data["cursor"] = cursor
+    try:
+        _write_json_atomic(ATTEMPT_INDEX_FILE, data)
+    except Exception:
+        pass
+    store["saved_at"] = time.time()
+    store["dirty"] = False
 
+
+def _attempt_index() -> dict:
+    """로그 끝까지 따라잡은 시도 인덱스를 반환한다. (호출 측은 읽기 전용으로 사용)
+
+    인덱스는 자신의 로그 읽기 위치(cursor)를 함께 보관하므로, 재시작/다른 프로세스 기록 후에도
+    새로 추가된 행만 읽어 반영한다.
+    """
+    store = _process_store("attempt_index")
+    with store["lock"]:
+        if store.get("data") is None:
+            store["data"] = _load_attempt_index_file() or _empty_attempt_index()
+        data = store["data"]
+        rows, reset = _read_log_delta(data["cursor"])
+        if reset:
+            cursor = data["cursor"]
+            data = store["data"] = _empty_attempt_index()
+            data["cursor"] = cursor
+        for row in rows:
+            _fold_attempt_row(data, row)
+        if rows or reset:
+            store["dirty"] = True
+        if store.get("dirty") and (reset or time.time() - float(store.get("saved_at", 0) or 0) >= ATTEMPT_INDEX_SAVE_INTERVAL_SEC):
+            _save_attempt_index(store)
+        return data
+
+
+# ---------------------------------------------------------
+# 응시 로그 기록기 (백그라운드 그룹 커밋)
+#   - 제출 경로에서는 큐에 넣기만 하고, 전용 스레드가 몇 ms 단위로 모아 한 번에 기록
+#   - append 핸들 1개 유지, 배치마다 advisory 파일 잠금(fcntl) + fsync
+#   - 디스크 오류 시 메모리에 보관(상한 있음)했다가 재시도, 상한 초과 시에만 제출 측에 오류 반환
+# ---------------------------------------------------------
+LOG_WRITER_FLUSH_INTERVAL_SEC = 0.005
+LOG_WRITER_RETRY_SEC = 1.0
+LOG_WRITER_SPILL_MAX_BYTES = 16 * 1024 * 1024
+LOG_WRITER_DRAIN_TIMEOUT_SEC = 5.0
+
+
+@contextmanager
+def _file_lock(f, exclusive: bool = True):
+    """열린 파일에 advisory 잠금 (fcntl 미지원 환경은 no-op)."""
+    if fcntl is None:
+        yield
+        return
+    fcntl.flock(f.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+    try:
+        yield
+    finally:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def _log_header_bytes() -> bytes:
+    buf = io.StringIO()
+    csv.DictWriter(buf, fieldnames=LOG_FIELDNAMES).writeheader()
+    return "\ufeff".encode("utf-8") + buf.getvalue().encode("utf-8")
+
+
+class _LogWriter:
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._cond = threading.Condition()
+        self._queue = deque()
+        self._queued_bytes = 0
+        self._handle = None
+        self._closed = False
+        self.last_error = ""
+        self.last_error_at = 0.0
+        self.written_rows = 0
+        self._thread = threading.Thread(target=self._run, name="attempt-log-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, payload: bytes) -> bool:
+        """기록 요청. 보관 한도를 넘으면 False (호출 측이 오류로 표시)."""
+        with self._cond:
+            if self._closed or self._queued_bytes + len(payload) > LOG_WRITER_SPILL_MAX_BYTES:
+                return False
+            self._queue.append(payload)
+            self._queued_bytes += len(payload)
+            self._cond.notify()
+        return True
+
+    def status(self) -> dict:
+        with self._cond:
+            return {
+                "pending_rows": len(self._queue),
+                "pending_bytes": self._queued_bytes,
+                "written_rows": self.written_rows,
+                "last_error": self.last_error,
+                "last_error_at": self.last_error_at,
+            }
+
+    def flush(self, timeout: float = LOG_WRITER_DRAIN_TIMEOUT_SEC) -> bool:
+        """대기 중인 행이 모두 기록될 때까지 기다린다."""
+        deadline = time.time() + timeout
+        with self._cond:
+            while self._queue and time.time() < deadline:
+                self._cond.wait(0.05)
+            return not self._queue
+
+    def close(self) -> None:
+        self.flush()
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def _open(self):
+        try:
+            current = os.stat(self.path).st_ino
+        except OSError:
+            current = None
+        replaced = False
+        if self._handle is not None:
+            try:
+                if os.fstat(self._handle.fileno()).st_ino == current:
+                    return self._handle
+            except OSError:
+                pass
+            try:
+                self._handle.close()
+            except OSError:
+                pass
+            self._handle = None
+            replaced = True
+        # 처음 열 때(프로세스당 1회 캐시)와 파일이 교체된 경우에만 스키마 확인 (제출 경로 밖)
+        _ensure_log_schema_file(recheck=replaced)
+        self._handle = open(self.path, "ab")
+        return self._handle
+
+    def _is_current(self, f) -> bool:
+        try:
+            return os.fstat(f.fileno()).st_ino == os.stat(self.path).st_ino
+        except OSError:
+            return False
+
+    def _write_batch(self, batch: list) -> None:
+        data = b"".join(batch)
+        for _ in range(3):
+            f = self._open()
+            with _file_lock(f):
+                # 잠금을 기다리는 동안 마이그레이션 등으로 파일이 교체됐으면 새 파일로 다시
+                if not self._is_current(f):
+                    continue
+                created = os.fstat(f.fileno()).st_size == 0
+                f.write(_log_header_bytes() + data if created else data)
+                f.flush()
+                os.fsync(f.fileno())
+            if created:
+                _write_log_schema_sidecar()
+            return
+        raise OSError("응시 로그 파일이 계속 교체되어 기록하지 못했습니다.")
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+                if not self._queue and self._closed:
+                    break
+            time.sleep(LOG_WRITER_FLUSH_INTERVAL_SEC)  # 짧게 모아서 한 번에 기록
+            with self._cond:
+                batch = list(self._queue)
+            try:
+                self._write_batch(batch)
+            except Exception as e:
+                with self._cond:
+                    self.last_error = str(e)
+                    self.last_error_at = time.time()
+                if self._handle is not None:
+                    try:
+                        self._handle.close()
+                    except Exception:
+                        pass
+                    self._handle = None
+                time.sleep(LOG_WRITER_RETRY_SEC)
+                continue
+            with self._cond:
+                for _ in batch:
+                    self._queued_bytes -= len(self._queue.popleft())
+                self.written_rows += len(batch)
+                self.last_error = ""
+                self._cond.notify_all()
+        if self._handle is not None:
+            try:
+                self._handle.close()
+            except Exception:
+                pass
+
+
+def _log_writer() -> _LogWriter:
+    store = _process_store("log_writer")
+    with store["lock"]:
+        w = store.get("writer")
+        if w is None or w.path != Path(LOG_FILE) or not w._thread.is_alive():
+            w = store["writer"] = _LogWriter(LOG_FILE)
+            atexit.register(w.close)
+        return w
+
+
+def _append_log_row_indexed(row: dict, payload: bytes) -> None:
+    """로그 행을 기록기에 넘기고 시도 인덱스에는 즉시 반영한다.
+
+    파일에 쓴 행은 다음 이어 읽기 때 한 번 더 반영되지만, 반영이 멱등이라 결과는 같다.
+    """
+    store = _process_store("attempt_index")
+    with store["lock"]:
+        data = store.get("data")
+        if data is not None:
+            _fold_attempt_row(data, row)
+    if not _log_writer().submit(payload):
+        raise OSError("응시 로그 기록이 지연되고 있습니다. (보관 한도 초과)")
+
+
+def _learner_attempts(employee_no: str, name: str, organization: str) -> dict:
+    store = _process_store("attempt_index")
+    with store["lock"]:
+        index = _attempt_index()
+        if employee_no:
+            attempts = index["by_emp"].get(employee_no, {})
+        else:
+            attempts = index["by_name"].get(f"{organization}|{name}", {})
+        return {uid: {"q": dict(att["q"]), "last": att["last"], "round": att["round"]} for uid, att in attempts.items()}
+
+
+def _summarize_user_attempts(employee_no: str, name: str, organization: str):
+    total_questions = sum(len(SCENARIOS[k]["quiz"]) for k in SCENARIO_ORDER)
     employee_no = str(employee_no or "").strip()
     name = str(name or "").strip()
     organization = str(organization or "").strip() or "미분류"
 
-    if employee_no:
-        u = df[df["employee_no"].astype(str).str.strip() == employee_no].copy()
-    else:
-        u = df[
-            (df["name"].astype(str).str.strip() == name) &
-            (df["organization"].astype(str).str.strip().replace("", "미분류") == organization)
-        ].copy()
-
-    if u.empty:
+    attempts = _learner_attempts(employee_no, name, organization)
+    if not attempts:
         return {"attempts_started": 0, "completed_attempts": 0, "best_score": 0, "last_score": 0, "attempts_df": pd.DataFrame()}
 
-    u["organization"] = u["organization"].fillna("").astype(str).str.strip().replace("", "미분류")
-    u["employee_no"] = u["employee_no"].fillna("").astype(str).str.strip()
-    u["name"] = u["name"].fillna("").astype(str).str.strip()
-    u["learner_id"] = u["employee_no"].where(u["employee_no"] != "", u["organization"] + "|" + u["name"])
-    u["attempt_uid"] = _derive_attempt_uid_series(u)
-    u = u.sort_values(["timestamp"], ascending=True)
-
-    latest_per_q_attempt = u.drop_duplicates(subset=["attempt_uid", "question_code"], keep="last")
-    per_attempt = (
-        latest_per_q_attempt.groupby(["attempt_uid"], as_index=False)
-        .agg(
-            answered_questions=("question_code", "nunique"),
-            score_sum=("awarded_score", "sum"),
-            last_activity=("timestamp", "max"),
-            attempt_round_logged=("attempt_round", "max"),
-        )
-    )
-    per_attempt["total_score"] = pd.to_numeric(per_attempt["score_sum"], errors="coerce").fillna(0.0)
-    per_attempt.loc[per_attempt["answered_questions"] > 0, "total_score"] += PARTICIPATION_SCORE
-    per_attempt["total_score"] = per_attempt["total_score"].round(0).astype(int)
-    per_attempt["is_completed"] = per_attempt["answered_questions"] >= total_questions
+    records = []
+    for attempt_uid, att in attempts.items():
+        answered = len(att["q"])
+        score_sum = float(sum(v[1] for v in att["q"].values()))
+        total_score = score_sum + (PARTICIPATION_SCORE if answered > 0 else 0)
+        records.append({
+            "attempt_uid": attempt_uid,
+            "answered_questions": answered,
+            "score_sum": score_sum,
+            "last_activity": pd.to_datetime(att["last"], errors="coerce"),
+            "attempt_round_logged": int(att["round"]),
+            "total_score": int(round(total_score)),
+            "is_completed": answered >= total_questions,
+        })
+    per_attempt = pd.DataFrame(records)
     per_attempt = per_attempt.sort_values(["last_activity", "total_score"], ascending=[True, True]).reset_index(drop=True)
 
     return {
@@ -2813,171 +5095,440 @@ def render_retry_offer_box(context: str):
             _clear_retry_offer()
             st.rerun()
 
-def _load_log_df():
-    """
-    관리자 탭용 로그 로더 (절대 크래시 방지)
-    """
-    if not LOG_FILE.exists():
-        return None, "아직 누적 로그 파일이 없습니다."
+# ---------------------------------------------------------
+# 컬럼형 스냅샷 (Parquet)
+#   - 닫힌 로그 세그먼트마다 타입이 지정된 .parquet 스냅샷을 백그라운드로 만들어 둔다
+#     (기관/테마/문항 코드 등은 category, timestamp는 datetime64, 점수류는 int64)
+#   - 관리자 통계는 필요한 컬럼만 스냅샷에서 읽고, 활성 로그만 CSV 이어 읽기로 덧붙인다
+#   - 최종 결과도 원천 서명이 같으면 스냅샷을 그대로 사용
+#   - pyarrow가 없거나 스냅샷이 낡았으면 CSV에서 바로 읽는다 (결과는 같음)
+# ---------------------------------------------------------
+LOG_SNAPSHOT_VERSION = 1
+LOG_SNAPSHOT_CATEGORY_COLUMNS = [
+    "organization", "department", "mission_key", "mission_title", "question_code", "question_type", "is_correct",
+    "content_version",
+]
+LOG_SNAPSHOT_INT_COLUMNS = [
+    "question_index", "awarded_score", "max_score", "attempt_no_for_mission", "attempt_round", "selected_option_index",
+]
+RESULTS_SNAPSHOT_FILE = BASE_DIR / ".compliance_results.parquet"
+RESULTS_SNAPSHOT_CATEGORY_COLUMNS = ["organization", "grade"]
+
+
+def _typed_log_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """_coerce_log_df 결과를 스냅샷 타입으로 변환 (제자리 변경)."""
+    for col in LOG_SNAPSHOT_CATEGORY_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+    for col in LOG_SNAPSHOT_INT_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0).round().astype("int64")
+    return df
+
+
+def _concat_typed_frames(frames: list):
+    """category 컬럼의 범주를 합쳐 가며 이어 붙인다 (그냥 concat하면 object로 풀림)."""
+    frames = [f for f in frames if f is not None and not f.empty]
+    if not frames:
+        return None
+    if len(frames) == 1:
+        return frames[0]
+    cat_cols = [c for c in frames[0].columns if isinstance(frames[0][c].dtype, pd.CategoricalDtype)]
+    for col in cat_cols:
+        cats = frames[0][col].cat.categories
+        for f in frames[1:]:
+            if col in f.columns and isinstance(f[col].dtype, pd.CategoricalDtype):
+                cats = cats.union(f[col].cat.categories)
+        frames = [
+            f.assign(**{col: f[col].cat.set_categories(cats)})
+            if col in f.columns and isinstance(f[col].dtype, pd.CategoricalDtype) else f
+            for f in frames
+        ]
+    return pd.concat(frames, ignore_index=True)
+
+
+def _write_parquet_snapshot(path: Path, df: pd.DataFrame, meta: dict) -> bool:
+    if pq is None:
+        return False
+    tmp = path.with_name(f"{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        table = table.replace_schema_metadata({
+            **(table.schema.metadata or {}),
+            b"compliance_snapshot": json.dumps(meta, ensure_ascii=False, default=str).encode("utf-8"),
+        })
+        pq.write_table(table, tmp, compression="zstd")
+        os.replace(tmp, path)
+        return True
+    except Exception:
+        return False
+    finally:
+        if tmp.exists():
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+
 
+def _read_parquet_snapshot(path: Path, meta: dict, columns=None):
+    """스냅샷 메타가 meta와 같을 때만 읽는다. 없거나 낡았으면 None."""
+    if pq is None or not path.exists():
+        return None
     try:
-        rows = _read_log_rows_tolerant()
-        if rows:
-            df = pd.DataFrame(rows)
-            df = _coerce_log_df(df)
-            if not df.empty:
-                return df, None
-        first_err = "rows empty"
-    except Exception as e1:
-        first_err = str(e1)
+        raw = (pq.read_schema(path).metadata or {}).get(b"compliance_snapshot")
+        if raw is None or json.loads(raw) != json.loads(json.dumps(meta, default=str)):
+            return None
+        return pq.read_table(path, columns=list(columns) if columns else None).to_pandas()
+    except Exception:
+        return None
 
-    try:
-        df = pd.read_csv(LOG_FILE, encoding="utf-8-sig", engine="python", on_bad_lines="skip")
-        df = _coerce_log_df(df)
-        if not df.empty:
-            return df, None
-        second_err = "pandas empty"
-    except Exception as e2:
-        second_err = str(e2)
 
-    return None, f"로그 파일을 읽지 못했습니다. (1차: {first_err}) (2차: {second_err})"
+def _log_segment_snapshot_path(path: Path) -> Path:
+    return path.with_name(path.name[: -len(".csv.gz")] + ".parquet")
 
 
-def _build_participant_snapshot(df: pd.DataFrame):
-    df = df.copy()
+def _log_segment_snapshot_meta(path: Path) -> dict:
+    return {
+        "version": LOG_SNAPSHOT_VERSION,
+        "schema_version": LOG_SCHEMA_VERSION,
+        "segment": path.name,
+        "source": _file_signature(path),
+    }
 
-    for c, default in [("organization", "미분류"), ("employee_no", ""), ("name", "이름미상"), ("department", "")]:
-        if c not in df.columns:
-            df[c] = default
-    df["organization"] = df["organization"].fillna("").astype(str).str.strip().replace("", "미분류")
-    df["employee_no"] = df["employee_no"].fillna("").astype(str).str.strip()
-    df["name"] = df["name"].fillna("").astype(str).str.strip().replace("", "이름미상")
-    df["department"] = df["department"].fillna("").astype(str)
 
-    for col in ["awarded_score", "max_score", "question_index", "attempt_round"]:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0)
-        else:
-            df[col] = 0
+def _build_log_segment_frame(path: Path) -> pd.DataFrame:
+    frame = _read_log_segment_rows(path, as_frame=True)
+    if frame is None:
+        frame = _normalize_log_frame(pd.DataFrame(columns=LOG_FIELDNAMES))
+    return _typed_log_frame(frame)
 
-    if "timestamp" in df.columns:
-        df["timestamp"] = pd.to_datetime(df["timestamp"], errors="coerce")
-    else:
-        df["timestamp"] = pd.NaT
 
-    if "question_code" not in df.columns:
-        if "mission_key" in df.columns:
-            df["question_code"] = df["mission_key"].astype(str) + "_Q" + df["question_index"].astype(int).astype(str)
-        else:
-            df["question_code"] = "Q?"
-    if "mission_key" not in df.columns:
-        df["mission_key"] = df["question_code"].astype(str).str.split("_Q").str[0]
+def compact_log_snapshots() -> int:
+    """스냅샷이 없거나 낡은 닫힌 세그먼트의 .parquet 스냅샷을 만든다. 반환: 새로 만든 개수."""
+    if pq is None:
+        return 0
+    built = 0
+    for path in _log_segment_paths():
+        meta = _log_segment_snapshot_meta(path)
+        snap_path = _log_segment_snapshot_path(path)
+        if _read_parquet_snapshot(snap_path, meta, columns=["timestamp"]) is not None:
+            continue
+        if _write_parquet_snapshot(snap_path, _build_log_segment_frame(path), meta):
+            built += 1
+    return built
+
+
+def _schedule_log_snapshot_compaction() -> None:
+    """백그라운드 스냅샷 압축기 (프로세스당 동시에 1개)."""
+    if pq is None:
+        return
+    store = _process_store("log_snapshot_compactor")
+    with store["lock"]:
+        if store.get("running"):
+            store["again"] = True
+            return
+        store["running"] = True
+
+    def _run():
+        try:
+            while True:
+                store["built"] = int(store.get("built", 0)) + compact_log_snapshots()
+                with store["lock"]:
+                    if not store.get("again"):
+                        store["running"] = False
+                        return
+                    store["again"] = False
+        except Exception as e:
+            store["error"] = str(e)
+            with store["lock"]:
+                store["running"] = False
+
+    threading.Thread(target=_run, name="log-snapshot-compactor", daemon=True).start()
+
+
+def _segment_log_frame(columns=None):
+    """닫힌 세그먼트 전체의 타입 지정 DataFrame (필요 컬럼만). 세그먼트 구성이 같으면 캐시 재사용."""
+    seg_sig = _log_segments_signature()
+    if not seg_sig:
+        return None
+    key = tuple(columns) if columns else None
+    stale = False
+    store = _process_store("log_segment_frames")
+    with store["lock"]:
+        if store.get("sig") != seg_sig:
+            store["sig"] = seg_sig
+            store["frames"] = {}
+        if key in store["frames"]:
+            return store["frames"][key]
+        parts = []
+        for name, _size, _mtime in seg_sig:
+            path = LOG_SEGMENT_DIR / name
+            part = _read_parquet_snapshot(_log_segment_snapshot_path(path), _log_segment_snapshot_meta(path), columns)
+            if part is None:
+                stale = True
+                part = _build_log_segment_frame(path)
+                if columns:
+                    part = part[list(columns)]
+            parts.append(part)
+        frame = store["frames"][key] = _concat_typed_frames(parts)
+    if stale:
+        _schedule_log_snapshot_compaction()
+    return frame
+
+
+def _results_snapshot_frame() -> pd.DataFrame:
+    """관리자용 병합 최종 결과의 타입 지정 스냅샷.
+
+    표시/내보내기용 문자열 컬럼(RESULT_FIELDNAMES)은 그대로 두고, 집계용 타입 컬럼
+    (_participated_ts, _ended_ts, _duration_sec, _final_score, _score_rate)을 함께 둔다.
+    반환된 DataFrame은 캐시와 공유되므로 수정하지 말고 복사해 사용한다.
+    """
+    sig = _results_sources_signature()
+    meta = {"version": LOG_SNAPSHOT_VERSION, "sources": sig}
+    store = _process_store("results_snapshot")
+    with store["lock"]:
+        if store.get("sig") == sig and store.get("frame") is not None:
+            return store["frame"]
+        frame = _read_parquet_snapshot(RESULTS_SNAPSHOT_FILE, meta)
+        if frame is None:
+            frame = _merge_results_frame().reset_index(drop=True)
+            frame["_participated_ts"] = pd.to_datetime(frame["participated_at"], errors="coerce")
+            frame["_ended_ts"] = pd.to_datetime(frame["ended_at"], errors="coerce")
+            for col, src in (("_duration_sec", "duration_sec"), ("_final_score", "final_score")):
+                frame[col] = pd.to_numeric(frame[src], errors="coerce").fillna(0).round().astype("int64")
+            frame["_score_rate"] = pd.to_numeric(frame["score_rate"], errors="coerce").astype("float64")
+            for col in RESULTS_SNAPSHOT_CATEGORY_COLUMNS:
+                frame[col] = frame[col].astype("category")
+            _write_parquet_snapshot(RESULTS_SNAPSHOT_FILE, frame, meta)
+        store["sig"] = sig
+        store["frame"] = frame
+        return frame
+
+
+# ---------------------------------------------------------
+# 참가자/시도 현황 (증분 유지 뷰)
+#   - 응시 로그를 이어 읽으며 (learner_id, attempt_uid, question_code) 칸마다 최신 행만 보관
+#   - 새 행이 들어오면 바뀐 시도 → 그 학습자 → 관련 기관 순서로 해당 행만 다시 계산
+#   - 관리자 탭은 전체 로그를 다시 집계하지 않고 이 뷰를 표로 만든다 (뷰가 바뀐 경우에만)
+#   - 같은 문항의 최신 행은 timestamp 기준, 시각이 같으면 나중에 기록된 행 (해석 불가 시각은 가장 나중으로 취급)
+# ---------------------------------------------------------
+PARTICIPANT_ATTEMPT_COLUMNS = [
+    "learner_id", "attempt_uid", "employee_no", "organization", "name", "raw_score", "answered_questions",
+    "last_activity", "latest_attempt_round", "completed_themes", "total_score", "completion_rate_q",
+    "score_rate", "is_completed",
+]
+PARTICIPANT_META_COLUMNS = ["attempts_started", "completed_attempts", "last_activity_all", "best_score_any", "total_attempts"]
+PARTICIPANT_ORG_COLUMNS = [
+    "organization", "participants", "completed", "cumulative_score", "avg_score", "avg_score_rate",
+    "avg_completion_rate", "latest_activity", "total_attempts", "completion_rate",
+]
+
+
+def _participant_ts(value):
+    """로그 timestamp → datetime (해석 불가면 None). ISO 형식은 빠른 경로."""
+    text = str(value or "").strip()
+    if not text:
+        return None
+    try:
+        dt = datetime.fromisoformat(text)
+        return dt.replace(tzinfo=None) if dt.tzinfo is not None else dt
+    except ValueError:
+        pass
+    ts = pd.to_datetime(text, errors="coerce")
+    if pd.isna(ts):
+        return None
+    return (ts.tz_localize(None) if ts.tzinfo is not None else ts).to_pydatetime()
 
-    if "training_attempt_id" not in df.columns:
-        df["training_attempt_id"] = ""
-    df["training_attempt_id"] = df["training_attempt_id"].fillna("").astype(str).str.strip()
 
-    df["learner_id"] = df["employee_no"].where(df["employee_no"].str.strip() != "", df["organization"] + "|" + df["name"])
-    df["attempt_uid"] = _derive_attempt_uid_series(df)
+def _empty_participant_view() -> dict:
+    return {
+        "cursor": {},
+        "seq": 0,
+        "version": 0,
+        "cells": {},            # (learner, attempt_uid) -> {question_code: 최신 행 요약}
+        "groups": {},           # (learner, attempt_uid, 사번, 기관, 이름) -> 시도별 집계 행
+        "attempt_groups": {},   # (learner, attempt_uid) -> {group key}
+        "learner_groups": {},   # learner -> {group key}
+        "submissions": Counter(),  # learner -> 전체 제출 수
+        "learners": {},         # learner -> 최고점 시도 기준 참가자 행
+        "org_learners": {},     # 기관 -> {learner} (참가자 행의 기관)
+        "org_groups": {},       # 기관 -> {group key} (시도 행의 기관)
+        "orgs": {},             # 기관 -> 기관 요약 행
+        "frames": None,
+    }
+
+
+def _fold_participant_row(view: dict, row: dict, dirty_attempts: set) -> None:
+    emp = str(row.get("employee_no", "") or "").strip()
+    org = str(row.get("organization", "") or "").strip() or "미분류"
+    name = str(row.get("name", "") or "").strip() or "이름미상"
+    learner = emp if emp else f"{org}|{name}"
+    attempt_uid = str(row.get("training_attempt_id", "") or "").strip() or f"legacy|{learner}"
+    qcode = str(row.get("question_code", "") or "")
+    ts = _participant_ts(row.get("timestamp"))
+    view["seq"] += 1
+    key = (1, datetime.min, view["seq"]) if ts is None else (0, ts, view["seq"])
+
+    view["submissions"][learner] += 1
+    akey = (learner, attempt_uid)
+    cells = view["cells"].setdefault(akey, {})
+    cur = cells.get(qcode)
+    if cur is None or key > cur["key"]:
+        cells[qcode] = {
+            "key": key,
+            "ts": ts,
+            "score": int(row.get("awarded_score", 0) or 0),
+            "round": int(row.get("attempt_round", 0) or 0),
+            "group": (learner, attempt_uid, emp, org, name),
+            "mission_key": str(row.get("mission_key", "") or ""),
+        }
+    dirty_attempts.add(akey)
 
-    df_sorted = df.sort_values(["timestamp"], ascending=True)
-    latest_per_q_attempt = df_sorted.drop_duplicates(subset=["learner_id", "attempt_uid", "question_code"], keep="last")
 
+def _participant_attempt_rows(cells: dict) -> dict:
+    """한 시도의 최신 칸들 → {group key: 시도별 집계 행}."""
     total_questions = sum(len(SCENARIOS[k]["quiz"]) for k in SCENARIO_ORDER)
-    theme_question_counts = {k: len(SCENARIOS[k]["quiz"]) for k in SCENARIO_ORDER}
+    theme_totals = {k: len(SCENARIOS[k]["quiz"]) for k in SCENARIO_ORDER}
+    per_theme = Counter(c["mission_key"] for c in cells.values())
+    completed_themes = sum(1 for mk, n in per_theme.items() if n >= theme_totals.get(mk, 999))
 
-    theme_counts = (
-        latest_per_q_attempt.groupby(["learner_id", "attempt_uid", "mission_key"], as_index=False)
-        .agg(answered_in_theme=("question_code", "nunique"))
-    )
-    theme_counts["theme_total_questions"] = theme_counts["mission_key"].map(theme_question_counts).fillna(999)
-    theme_counts["theme_completed"] = theme_counts["answered_in_theme"] >= theme_counts["theme_total_questions"]
+    buckets = {}
+    for c in cells.values():
+        buckets.setdefault(c["group"], []).append(c)
+    out = {}
+    for gkey, items in buckets.items():
+        learner, attempt_uid, emp, org, name = gkey
+        answered = len(items)
+        raw_score = sum(c["score"] for c in items)
+        stamps = [c["ts"] for c in items if c["ts"] is not None]
+        total_score = int(np.round(raw_score + (PARTICIPATION_SCORE if answered > 0 else 0)))
+        out[gkey] = {
+            "learner_id": learner,
+            "attempt_uid": attempt_uid,
+            "employee_no": emp,
+            "organization": org,
+            "name": name,
+            "raw_score": raw_score,
+            "answered_questions": answered,
+            "last_activity": max(stamps) if stamps else None,
+            "latest_attempt_round": max(c["round"] for c in items),
+            "completed_themes": completed_themes,
+            "total_score": total_score,
+            "completion_rate_q": float(np.round(answered / max(total_questions, 1) * 100, 1)),
+            "score_rate": float(np.round(total_score / max(TOTAL_SCORE, 1) * 100, 1)),
+            "is_completed": answered >= total_questions,
+        }
+    return out
 
-    completed_theme_cnt = (
-        theme_counts.groupby(["learner_id", "attempt_uid"], as_index=False)
-        .agg(completed_themes=("theme_completed", "sum"))
-    )
 
-    per_attempt = (
-        latest_per_q_attempt.groupby(["learner_id", "attempt_uid", "employee_no", "organization", "name"], as_index=False)
-        .agg(
-            raw_score=("awarded_score", "sum"),
-            answered_questions=("question_code", "nunique"),
-            last_activity=("timestamp", "max"),
-            latest_attempt_round=("attempt_round", "max"),
-        )
-    )
-    per_attempt = per_attempt.merge(completed_theme_cnt, on=["learner_id", "attempt_uid"], how="left")
-    per_attempt["completed_themes"] = per_attempt["completed_themes"].fillna(0).astype(int)
-    per_attempt["raw_score"] = pd.to_numeric(per_attempt["raw_score"], errors="coerce").fillna(0)
-    per_attempt["answered_questions"] = pd.to_numeric(per_attempt["answered_questions"], errors="coerce").fillna(0).astype(int)
-    per_attempt["total_score"] = per_attempt["raw_score"]
-    per_attempt.loc[per_attempt["answered_questions"] > 0, "total_score"] += PARTICIPATION_SCORE
-    per_attempt["total_score"] = per_attempt["total_score"].round(0).astype(int)
-    per_attempt["completion_rate_q"] = ((per_attempt["answered_questions"] / max(total_questions, 1)) * 100).round(1)
-    per_attempt["score_rate"] = ((per_attempt["total_score"] / max(TOTAL_SCORE, 1)) * 100).round(1)
-    per_attempt["is_completed"] = per_attempt["answered_questions"] >= total_questions
-
-    attempt_meta = (
-        per_attempt.groupby(["learner_id"], as_index=False)
-        .agg(
-            attempts_started=("attempt_uid", "nunique"),
-            completed_attempts=("is_completed", "sum"),
-            last_activity_all=("last_activity", "max"),
-            best_score_any=("total_score", "max"),
-        )
-    )
-    submission_meta = (
-        df_sorted.groupby(["learner_id"], as_index=False)
-        .agg(total_attempts=("question_code", "count"))
+def _participant_best_sort_key(gkey, rec):
+    last = rec["last_activity"]
+    return (
+        -rec["total_score"],
+        not rec["is_completed"],
+        -rec["answered_questions"],
+        last is None,
+        -(last - datetime.min).total_seconds() if last is not None else 0,
+        gkey,
     )
-    attempt_meta = attempt_meta.merge(submission_meta, on="learner_id", how="left")
-
-    best_attempt = per_attempt.sort_values(
-        ["learner_id", "total_score", "is_completed", "answered_questions", "last_activity"],
-        ascending=[True, False, False, False, False]
-    ).drop_duplicates(subset=["learner_id"], keep="first")
-
-    participants = best_attempt.merge(attempt_meta, on="learner_id", how="left")
-    participants["completed_attempts"] = participants["completed_attempts"].fillna(0).astype(int)
-    participants["attempts_started"] = participants["attempts_started"].fillna(0).astype(int)
-    participants["is_completed"] = participants["is_completed"].fillna(False).astype(bool)
-    participants["status"] = participants["is_completed"].map({True: "수료(최고점 반영)", False: "진행중(최고점 기준)"})
-
-    org_summary = (
-        participants.groupby("organization", as_index=False)
-        .agg(
-            participants=("learner_id", "nunique"),
-            completed=("is_completed", "sum"),
-            cumulative_score=("total_score", "sum"),
-            avg_score=("total_score", "mean"),
-            avg_score_rate=("score_rate", "mean"),
-            avg_completion_rate=("completion_rate_q", "mean"),
-            latest_activity=("last_activity_all", "max"),
-        )
+
+
+def _refresh_participant_view(view: dict, dirty_attempts: set) -> None:
+    """바뀐 시도 → 학습자 → 기관 순서로 영향받은 행만 다시 계산한다."""
+    dirty_learners = set()
+    dirty_orgs = set()
+
+    for akey in dirty_attempts:
+        new_rows = _participant_attempt_rows(view["cells"].get(akey, {}))
+        old_keys = view["attempt_groups"].get(akey, set())
+        for gkey in old_keys - set(new_rows):
+            view["groups"].pop(gkey, None)
+            view["learner_groups"].get(gkey[0], set()).discard(gkey)
+            view["org_groups"].get(gkey[3], set()).discard(gkey)
+            dirty_orgs.add(gkey[3])
+        for gkey, rec in new_rows.items():
+            view["groups"][gkey] = rec
+            view["learner_groups"].setdefault(gkey[0], set()).add(gkey)
+            view["org_groups"].setdefault(gkey[3], set()).add(gkey)
+            dirty_orgs.add(gkey[3])
+        view["attempt_groups"][akey] = set(new_rows)
+        dirty_learners.add(akey[0])
+
+    for learner in dirty_learners:
+        prev = view["learners"].get(learner)
+        if prev is not None:
+            dirty_orgs.add(prev["organization"])
+            view["org_learners"].get(prev["organization"], set()).discard(learner)
+        gkeys = view["learner_groups"].get(learner) or set()
+        if not gkeys:
+            view["learners"].pop(learner, None)
+            continue
+        recs = [(g, view["groups"][g]) for g in gkeys]
+        best_key, best = min(recs, key=lambda gr: _participant_best_sort_key(*gr))
+        stamps = [r["last_activity"] for _, r in recs if r["last_activity"] is not None]
+        participant = dict(best)
+        participant.update({
+            "attempts_started": len({g[1] for g, _ in recs}),
+            "completed_attempts": sum(1 for _, r in recs if r["is_completed"]),
+            "last_activity_all": max(stamps) if stamps else None,
+            "best_score_any": max(r["total_score"] for _, r in recs),
+            "total_attempts": int(view["submissions"].get(learner, 0)),
+        })
+        participant["status"] = "수료(최고점 반영)" if participant["is_completed"] else "진행중(최고점 기준)"
+        view["learners"][learner] = participant
+        view["org_learners"].setdefault(participant["organization"], set()).add(learner)
+        dirty_orgs.add(participant["organization"])
+
+    for org in dirty_orgs:
+        members = [view["learners"][l] for l in view["org_learners"].get(org, ()) if l in view["learners"]]
+        if not members:
+            view["orgs"].pop(org, None)
+            continue
+        totals = np.array([m["total_score"] for m in members], dtype=float)
+        stamps = [m["last_activity_all"] for m in members if m["last_activity_all"] is not None]
+        completed = sum(1 for m in members if m["is_completed"])
+        view["orgs"][org] = {
+            "organization": org,
+            "participants": len(members),
+            "completed": completed,
+            "cumulative_score": int(np.round(totals.sum())),
+            "avg_score": float(np.round(totals.mean(), 1)),
+            "avg_score_rate": float(np.round(np.mean([m["score_rate"] for m in members]), 1)),
+            "avg_completion_rate": float(np.round(np.mean([m["completion_rate_q"] for m in members]), 1)),
+            "latest_activity": max(stamps) if stamps else None,
+            "total_attempts": len({g[1] for g in view["org_groups"].get(org, ())}),
+            "completion_rate": float(np.round(completed / max(len(members), 1) * 100, 1)),
+        }
+
+
+def _participant_view_frames(view: dict) -> dict:
+    total_questions = sum(len(SCENARIOS[k]["quiz"]) for k in SCENARIO_ORDER)
+    groups = view["groups"]
+    per_attempt = pd.DataFrame([groups[k] for k in sorted(groups)], columns=PARTICIPANT_ATTEMPT_COLUMNS)
+    per_attempt["last_activity"] = pd.to_datetime(per_attempt["last_activity"])
+
+    learners = view["learners"]
+    participants = pd.DataFrame(
+        [learners[k] for k in sorted(learners)],
+        columns=PARTICIPANT_ATTEMPT_COLUMNS + PARTICIPANT_META_COLUMNS + ["status"],
     )
-    org_attempts = per_attempt.groupby("organization", as_index=False).agg(total_attempts=("attempt_uid", "nunique"))
-    org_summary = org_summary.merge(org_attempts, on="organization", how="left")
-    for col in ["cumulative_score", "avg_score", "avg_score_rate", "avg_completion_rate", "total_attempts"]:
-        org_summary[col] = pd.to_numeric(org_summary[col], errors="coerce").fillna(0)
-    org_summary["cumulative_score"] = org_summary["cumulative_score"].round(0).astype(int)
-    org_summary["avg_score"] = org_summary["avg_score"].round(1)
-    org_summary["avg_score_rate"] = org_summary["avg_score_rate"].round(1)
-    org_summary["avg_completion_rate"] = org_summary["avg_completion_rate"].round(1)
-    org_summary["completion_rate"] = ((org_summary["completed"] / org_summary["participants"].replace(0, 1)) * 100).round(1)
+    for col in ("last_activity", "last_activity_all"):
+        participants[col] = pd.to_datetime(participants[col])
+
+    org_summary = pd.DataFrame(list(view["orgs"].values()), columns=PARTICIPANT_ORG_COLUMNS)
+    org_summary["latest_activity"] = pd.to_datetime(org_summary["latest_activity"])
     org_summary = org_summary.sort_values(
         ["cumulative_score", "avg_score", "participants", "organization"],
         ascending=[False, False, False, True]
     ).reset_index(drop=True)
 
     participants_view = participants.copy()
-    participants_view["last_activity"] = pd.to_datetime(participants_view["last_activity"], errors="coerce").dt.strftime("%Y-%m-%d %H:%M").fillna("-")
-    participants_view["last_activity_all"] = pd.to_datetime(participants_view["last_activity_all"], errors="coerce").dt.strftime("%Y-%m-%d %H:%M").fillna("-")
+    participants_view["last_activity"] = participants_view["last_activity"].dt.strftime("%Y-%m-%d %H:%M").fillna("-")
+    participants_view["last_activity_all"] = participants_view["last_activity_all"].dt.strftime("%Y-%m-%d %H:%M").fillna("-")
     participants_view = participants_view.sort_values(["total_score", "last_activity"], ascending=[False, False])
 
     return {
-        "raw": df,
-        "latest_per_q": latest_per_q_attempt,
+        "version": view["version"],
         "per_attempt": per_attempt,
         "participants": participants,
         "participants_view": participants_view,
@@ -2986,6 +5537,34 @@ def _build_participant_snapshot(df: pd.DataFrame):
     }
 
 
+def participant_snapshot() -> dict:
+    """참가자/시도 현황 뷰 (프로세스 공유, 로그 이어 읽기로 증분 갱신).
+
+    반환: {per_attempt, participants, participants_view, org_summary, total_questions}
+    DataFrame들은 캐시와 공유되므로 수정하지 말고 복사해 사용한다.
+    """
+    store = _process_store("participant_view")
+    with store["lock"]:
+        view = store.get("view")
+        if view is None:
+            view = store["view"] = _empty_participant_view()
+        rows, reset = _read_log_delta(view["cursor"])
+        if reset:
+            cursor = view["cursor"]
+            view = store["view"] = _empty_participant_view()
+            view["cursor"] = cursor
+        if rows or reset:
+            dirty = set()
+            for row in rows:
+                _fold_participant_row(view, row, dirty)
+            _refresh_participant_view(view, dirty)
+            view["version"] += 1
+        frames = view.get("frames")
+        if frames is None or frames["version"] != view["version"]:
+            frames = view["frames"] = _participant_view_frames(view)
+        return frames
+
+
 def render_admin_password_gate():
     st.markdown(
         """
@@ -3053,7 +5632,9 @@ def render_admin_page():
 
     st.caption("※ 현재 브라우저에서 관리자 인증이 일정 시간 유지됩니다. 새로고침 시 최신 데이터를 다시 읽어옵니다.")
 
-    tab_org, tab_log = st.tabs(["🏢 기관 전광판", "📄 최종 결과 로그"])
+    tab_org, tab_people, tab_questions, tab_items, tab_log, tab_similar = st.tabs(
+        ["🏢 기관 전광판", "👥 참가자·시도 현황", "📊 문항 통계", "🔬 문항 분석", "📄 최종 결과 로그", "🧬 유사 답안"]
+    )
 
     with tab_org:
         sb = compute_org_scoreboard()
@@ -3147,160 +5728,758 @@ def render_admin_page():
                     existing_backup_df = existing_backup_df.copy()
                     existing_backup_df.columns = [str(c).strip() for c in existing_backup_df.columns]
 
-                existing_backup_df = _dedupe_final_result_backup_rows(existing_backup_df)
-                uploaded_df = _dedupe_final_result_backup_rows(uploaded_df)
+                existing_backup_df = _dedupe_final_result_backup_rows(existing_backup_df)
+                uploaded_df = _dedupe_final_result_backup_rows(uploaded_df)
+
+                before_rows = len(existing_backup_df)
+                preview_combined = _dedupe_final_result_backup_rows(
+                    pd.concat([existing_backup_df, uploaded_df], ignore_index=True)
+                )
+                after_rows = len(preview_combined)
+                added_rows = max(after_rows - before_rows, 0)
+
+                col_a, col_b, col_c = st.columns(3)
+                col_a.metric("기존 업로드 백업", f"{before_rows:,}건")
+                col_b.metric("업로드 파일", f"{len(uploaded_df):,}건")
+                col_c.metric("병합 후 예상 증가", f"{added_rows:,}건")
+
+                with st.form("admin_backup_merge_form", clear_on_submit=False):
+                    st.markdown("병합 버튼을 누르면 관리자 업로드 전용 백업 파일에 **신규 완료자 1인 1건 기준(최신 종료시각 우선)** 으로 저장되고, 최종 결과 로그/기관 전광판에 즉시 반영됩니다.")
+                    merge_clicked = st.form_submit_button("서버 데이터와 병합", use_container_width=True, type="primary")
+
+                if merge_clicked:
+                    try:
+                        existing_backup_df = _dedupe_final_result_backup_rows(existing_backup_df.copy())
+                        uploaded_df = _dedupe_final_result_backup_rows(uploaded_df.copy())
+
+                        if existing_backup_df.empty:
+                            combined = uploaded_df
+                        else:
+                            combined = pd.concat([existing_backup_df, uploaded_df], ignore_index=True)
+
+                        combined.columns = [str(c).strip() for c in combined.columns]
+                        combined = _dedupe_final_result_backup_rows(combined)
+                        prev_sig = _results_sources_signature()
+                        combined.to_csv(ADMIN_BACKUP_RESULTS_FILE, index=False, encoding="utf-8-sig")
+                        _note_final_results(_backup_raw_to_results_df(combined), "backup", prev_sig=prev_sig)
+
+                        st.session_state["admin_backup_merge_result"] = {
+                            "saved_file": ADMIN_BACKUP_RESULTS_FILE.name,
+                            "before_rows": int(before_rows),
+                            "uploaded_rows": int(len(uploaded_df)),
+                            "after_rows": int(len(combined)),
+                            "added_rows": int(max(len(combined) - before_rows, 0)),
+                        }
+                        st.success("데이터 병합이 완료되었습니다. 아래 로그 표를 다시 확인해 주세요.")
+                        st.rerun()
+                    except Exception as e:
+                        st.error(f"파일 처리 중 오류가 발생했습니다: {e}")
+
+        merge_result = st.session_state.get("admin_backup_merge_result")
+        if merge_result:
+            st.info(
+                f"최근 병합 결과 · 저장파일: {merge_result['saved_file']} / 기존 {merge_result['before_rows']:,}건 + 업로드 {merge_result['uploaded_rows']:,}건 → 저장 {merge_result['after_rows']:,}건 (실제 증가 {merge_result['added_rows']:,}건)"
+            )
+
+        df = _merge_results_for_admin()
+        if df.empty:
+            st.info("최종 결과 로그에 표시할 데이터가 없습니다. 같은 폴더의 training_results.csv 또는 compliance_training_log.csv를 확인해 주세요.")
+        else:
+            st.subheader("참가자 최종 결과 (1인 1레코드)")
+            show = df.rename(columns={
+                "employee_no":"사번","name":"이름","organization":"소속기관",
+                "participated_at":"참여시각","ended_at":"종료시각","duration_sec":"참여시간(초)",
+                "final_score":"최종점수","score_rate":"득점률(%)","grade":"등급",
+                "training_attempt_id":"시도ID","attempt_round":"회차"
+            })
+            st.dataframe(show, use_container_width=True, hide_index=True)
+            st.download_button(
+                "📥 최종 결과 로그 다운로드 (CSV)",
+                data=show.to_csv(index=False).encode("utf-8-sig"),
+                file_name=f"training_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                mime="text/csv",
+                use_container_width=True,
+            )
+            if _results_store().name == "sqlite":
+                if st.button(f"💾 결과 저장소 → {RESULTS_FILE.name} 내보내기", use_container_width=True):
+                    try:
+                        exported = _results_store().export_csv(RESULTS_FILE)
+                        st.success(f"{RESULTS_FILE.name}에 {exported:,}건을 저장했습니다.")
+                    except Exception as e:
+                        st.error(f"내보내기 중 오류가 발생했습니다: {e}")
+                st.caption(f"※ 최종 결과는 {RESULTS_DB_FILE.name}(SQLite)에 저장됩니다. 외부 도구용 CSV가 필요하면 내보내기를 사용하세요.")
+
+        writer_store = _process_store("log_writer")
+        if writer_store.get("writer") is not None:
+            ws = writer_store["writer"].status()
+            if ws["last_error"]:
+                st.warning(
+                    f"응시 로그 기록 지연: 미기록 {ws['pending_rows']:,}행 (메모리 보관 중, 자동 재시도) — {ws['last_error']}"
+                )
+
+        try:
+            agg = log_aggregates()
+            if agg["rows"]:
+                st.caption(
+                    f"응시 로그 누적 {agg['rows']:,}행 · 문항 {len(agg['per_question'])}개 · 기관 {len(agg['per_org'])}곳 "
+                    f"· {agg['min_ts'][:10]} ~ {agg['max_ts'][:10]} (일자별 세그먼트 {agg['segments']}개 + 활성 로그)"
+                )
+        except Exception:
+            pass
+
+    with tab_people:
+        render_admin_participants()
+
+    with tab_questions:
+        render_admin_question_stats()
+
+    with tab_items:
+        render_admin_item_analysis()
+
+    with tab_similar:
+        render_admin_answer_similarity()
+
+
+
+# ---------------------------------------------------------
+# 주관식 유사 답안 탐지 (MinHash + LSH, 로그 증분 반영)
+#   - 답안을 정규화해 문자 3-gram 집합 → MinHash 서명(64개)
+#   - 8밴드 × 8행 LSH 버킷(문항별)에서 후보를 찾고, 서명 일치율로 확인 후 union-find로 묶음
+#   - 같은 사람이 다시 낸 답안끼리는 군집으로 보지 않음 (서로 다른 학습자 2명 이상)
+# ---------------------------------------------------------
+ANSWER_MINHASH_PERM = 64
+ANSWER_LSH_BANDS = 8
+ANSWER_SIMILARITY_THRESHOLD = 0.8   # 서명 일치율(≈ 3-gram 자카드 유사도) 기준
+ANSWER_MIN_CHARS = 15               # 너무 짧은 답안은 우연히 같아지므로 제외
+ANSWER_BUCKET_SCAN_MAX = 64         # 버킷당 비교 상한 (같은 군집은 건너뜀)
+_MINHASH_PRIME = (1 << 31) - 1
+_MINHASH_RNG = np.random.RandomState(20260311)
+_MINHASH_A = _MINHASH_RNG.randint(1, _MINHASH_PRIME, size=ANSWER_MINHASH_PERM).astype(np.uint64)
+_MINHASH_B = _MINHASH_RNG.randint(0, _MINHASH_PRIME, size=ANSWER_MINHASH_PERM).astype(np.uint64)
+
+
+def _answer_minhash(text: str):
+    """정규화된 답안의 MinHash 서명(uint32 배열). 너무 짧으면 None."""
+    norm = _normalize_for_similarity(text)
+    if len(norm) < ANSWER_MIN_CHARS:
+        return None
+    shingles = {norm[i:i + 3] for i in range(len(norm) - 2)}
+    x = np.fromiter((zlib.crc32(sh.encode("utf-8")) for sh in shingles), dtype=np.uint64, count=len(shingles))
+    x %= np.uint64(_MINHASH_PRIME)
+    hashed = (np.outer(x, _MINHASH_A) + _MINHASH_B) % np.uint64(_MINHASH_PRIME)
+    return hashed.min(axis=0).astype(np.uint32)
+
+
+def _empty_answer_similarity() -> dict:
+    return {"cursor": {}, "rows": [], "sigs": [], "parent": [], "buckets": {}}
+
+
+def _similarity_find(parent: list, i: int) -> int:
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def _fold_answer_similarity_row(data: dict, row: dict) -> None:
+    if str(row.get("question_type", "")).strip() != "text":
+        return
+    text = str(row.get("selected_or_text", "") or "")
+    sig = _answer_minhash(text)
+    if sig is None:
+        return
+    qcode = str(row.get("question_code", "") or "").strip()
+    emp = str(row.get("employee_no", "") or "").strip()
+    name = str(row.get("name", "") or "").strip()
+    org = str(row.get("organization", "") or "").strip() or "미분류"
+    idx = len(data["rows"])
+    data["rows"].append({
+        "question_code": qcode,
+        "learner": emp if emp else f"{org}|{name}",
+        "employee_no": emp,
+        "name": name,
+        "organization": org,
+        "timestamp": str(row.get("timestamp", "") or ""),
+        "text": text.strip()[:200],
+    })
+    data["sigs"].append(sig)
+    parent = data["parent"]
+    parent.append(idx)
+
+    rows_per_band = ANSWER_MINHASH_PERM // ANSWER_LSH_BANDS
+    for band in range(ANSWER_LSH_BANDS):
+        key = (qcode, band, sig[band * rows_per_band:(band + 1) * rows_per_band].tobytes())
+        bucket = data["buckets"].setdefault(key, [])
+        for other in bucket[-ANSWER_BUCKET_SCAN_MAX:]:
+            ra, rb = _similarity_find(parent, idx), _similarity_find(parent, other)
+            if ra == rb:
+                continue
+            if float(np.mean(data["sigs"][other] == sig)) >= ANSWER_SIMILARITY_THRESHOLD:
+                parent[max(ra, rb)] = min(ra, rb)
+        bucket.append(idx)
+
+
+ANSWER_SIMILARITY_FOLD_CHUNK = 500       # 잠금을 잡고 한 번에 접는 행 수 (조회가 오래 막히지 않게)
+ANSWER_SIMILARITY_WAIT_SEC = 0.5         # 준비된 뒤에는 렌더링에서 이 시간만큼만 따라잡기를 기다린다
+
+
+def _answer_similarity_catch_up() -> None:
+    """새 로그 행을 유사 답안 인덱스에 반영한다 (백그라운드 스레드 전용, 한 번에 하나만 실행).
+
+    로그 읽기는 잠금 밖에서 하고, 접기는 ANSWER_SIMILARITY_FOLD_CHUNK 행마다 잠금을 놓는다.
+    처음부터 다시 읽어야 하면(reset) 새 인덱스를 잠금 없이 만든 뒤 통째로 바꾼다.
+    """
+    store = _process_store("answer_similarity")
+    with store["lock"]:
+        data = store.get("data")
+        if data is None:
+            data = store["data"] = _empty_answer_similarity()
+    cursor = data["cursor"]  # cursor는 따라잡기 스레드만 건드린다
+    rows, reset = _read_log_delta(cursor)
+    if reset:
+        fresh = _empty_answer_similarity()
+        fresh["cursor"] = cursor
+        for row in rows:
+            _fold_answer_similarity_row(fresh, row)
+        with store["lock"]:
+            store["data"] = fresh
+        return
+    for start in range(0, len(rows), ANSWER_SIMILARITY_FOLD_CHUNK):
+        with store["lock"]:
+            for row in rows[start:start + ANSWER_SIMILARITY_FOLD_CHUNK]:
+                _fold_answer_similarity_row(data, row)
+
+
+def _schedule_answer_similarity_catch_up():
+    """백그라운드 따라잡기를 (이미 돌고 있지 않으면) 시작한다. 반환: 실행 중인 스레드 또는 None"""
+    flags = _process_store("answer_similarity_build")
+    with flags["lock"]:
+        thread = flags.get("thread")
+        if thread is not None and thread.is_alive():
+            return thread
+
+        def _run():
+            try:
+                _answer_similarity_catch_up()
+                error = ""
+            except Exception as e:
+                error = str(e)
+            with flags["lock"]:
+                flags["error"] = error
+                if not error:
+                    flags["ready"] = True
+
+        thread = flags["thread"] = threading.Thread(target=_run, name="answer-similarity-index", daemon=True)
+        thread.start()
+        return thread
+
+
+def _answer_similarity_status() -> dict:
+    """{"ready": 첫 구축 완료 여부, "building": 따라잡기 중, "error": 마지막 오류}. 필요하면 따라잡기를 시작한다."""
+    thread = _schedule_answer_similarity_catch_up()
+    flags = _process_store("answer_similarity_build")
+    if flags.get("ready") and thread is not None:
+        thread.join(timeout=ANSWER_SIMILARITY_WAIT_SEC)
+    with flags["lock"]:
+        return {
+            "ready": bool(flags.get("ready")),
+            "building": bool(thread is not None and thread.is_alive()),
+            "error": str(flags.get("error") or ""),
+        }
+
+
+def find_similar_answer_clusters(question_code: str = "", organization: str = "") -> pd.DataFrame:
+    """서로 다른 학습자 2명 이상이 낸 유사 답안 군집 목록 (군집당 1행).
+
+    인덱스는 백그라운드에서 따라잡으므로(_answer_similarity_status) 지금까지 반영된 답안 기준이다.
+    """
+    cols = ["question_code", "cluster", "learners", "answers", "organizations", "first_at", "last_at", "sample"]
+    store = _process_store("answer_similarity")
+    with store["lock"]:
+        data = store.get("data") or _empty_answer_similarity()
+        groups = {}
+        for i in range(len(data["rows"])):
+            groups.setdefault(_similarity_find(data["parent"], i), []).append(i)
+        members = [[data["rows"][i] for i in idxs] for idxs in groups.values() if len(idxs) > 1]
+
+    out = []
+    for recs in members:
+        learners = {r["learner"] for r in recs}
+        if len(learners) < 2:
+            continue
+        qcode = recs[0]["question_code"]
+        orgs = sorted({r["organization"] for r in recs})
+        if question_code and qcode != question_code:
+            continue
+        if organization and organization not in orgs:
+            continue
+        stamps = sorted(r["timestamp"] for r in recs)
+        out.append({
+            "question_code": qcode,
+            "learners": len(learners),
+            "answers": len(recs),
+            "organizations": ", ".join(orgs),
+            "first_at": stamps[0],
+            "last_at": stamps[-1],
+            "sample": recs[0]["text"],
+            "_members": recs,
+        })
+    if not out:
+        return pd.DataFrame(columns=cols + ["_members"])
+    df = pd.DataFrame(out).sort_values(["question_code", "learners", "last_at"], ascending=[True, False, False])
+    df.insert(1, "cluster", np.arange(1, len(df) + 1))
+    return df.reset_index(drop=True)
+
+
+def render_admin_participants():
+    st.subheader("👥 참가자·시도 현황 (응시 로그 기준)")
+    st.caption("응시 로그에서 학습자별 최고점 시도를 기준으로 집계합니다. 새로 기록된 행만 반영되어 바로 갱신됩니다.")
+    try:
+        snap = participant_snapshot()
+    except Exception as e:
+        st.error(f"참가자 현황 집계 중 오류가 발생했습니다: {e}")
+        return
+    participants = snap["participants_view"]
+    if participants.empty:
+        st.info("아직 응시 로그가 없습니다.")
+        return
+
+    m1, m2, m3, m4 = st.columns(4)
+    m1.metric("참가자", f"{len(participants):,}명")
+    m2.metric("수료(최고점 시도 기준)", f"{int(participants['is_completed'].sum()):,}명")
+    m3.metric("시도", f"{snap['per_attempt']['attempt_uid'].nunique():,}회")
+    m4.metric("문항 제출", f"{int(participants['total_attempts'].sum()):,}건")
+
+    st.markdown("#### 🏢 기관별 요약")
+    safe_dataframe(
+        snap["org_summary"].assign(
+            latest_activity=snap["org_summary"]["latest_activity"].dt.strftime("%Y-%m-%d %H:%M").fillna("-")
+        ).rename(columns={
+            "organization": "기관", "participants": "참가자(명)", "completed": "수료(명)",
+            "cumulative_score": "누적점수", "avg_score": "평균점수", "avg_score_rate": "평균 득점률(%)",
+            "avg_completion_rate": "평균 진행률(%)", "latest_activity": "최근 활동", "total_attempts": "시도 수",
+            "completion_rate": "수료율(%)",
+        }),
+        use_container_width=True,
+        hide_index=True,
+    )
+
+    st.markdown("#### 🙋 참가자")
+    f1, f2 = st.columns(2)
+    with f1:
+        org_options = ["전체"] + sorted(participants["organization"].unique().tolist())
+        org_sel = st.selectbox("기관", org_options, key="admin_participants_org")
+    with f2:
+        query = st.text_input("이름/사번 검색", key="admin_participants_query").strip()
+    view = participants
+    if org_sel != "전체":
+        view = view[view["organization"] == org_sel]
+    if query:
+        view = view[
+            view["name"].str.contains(query, regex=False)
+            | view["employee_no"].str.contains(query, regex=False)
+        ]
+    safe_dataframe(
+        view[[
+            "organization", "employee_no", "name", "total_score", "score_rate", "answered_questions",
+            "completion_rate_q", "completed_themes", "status", "attempts_started", "completed_attempts",
+            "best_score_any", "total_attempts", "last_activity_all",
+        ]].rename(columns={
+            "organization": "기관", "employee_no": "사번", "name": "이름", "total_score": "최고 시도 점수",
+            "score_rate": "득점률(%)", "answered_questions": "응답 문항", "completion_rate_q": "진행률(%)",
+            "completed_themes": "완료 테마", "status": "상태", "attempts_started": "시도 수",
+            "completed_attempts": "수료 시도", "best_score_any": "최고점", "total_attempts": "문항 제출",
+            "last_activity_all": "최근 활동",
+        }),
+        use_container_width=True,
+        hide_index=True,
+    )
+
+    if view.empty:
+        return
+    labels = {
+        lid: f"{row['name']} ({row['employee_no'] or '사번 없음'}) · {row['organization']}"
+        for lid, row in view.set_index("learner_id").head(500).iterrows()
+    }
+    pick = st.selectbox("시도 상세", list(labels), format_func=lambda lid: labels[lid], key="admin_participants_pick")
+    attempts = snap["per_attempt"][snap["per_attempt"]["learner_id"] == pick]
+    safe_dataframe(
+        attempts.sort_values("last_activity", ascending=False)
+        .assign(last_activity=lambda d: d["last_activity"].dt.strftime("%Y-%m-%d %H:%M").fillna("-"))[[
+            "attempt_uid", "latest_attempt_round", "total_score", "score_rate", "answered_questions",
+            "completed_themes", "is_completed", "last_activity",
+        ]].rename(columns={
+            "attempt_uid": "시도ID", "latest_attempt_round": "회차", "total_score": "점수", "score_rate": "득점률(%)",
+            "answered_questions": "응답 문항", "completed_themes": "완료 테마", "is_completed": "수료",
+            "last_activity": "최근 활동",
+        }),
+        use_container_width=True,
+        hide_index=True,
+    )
+
+
+def render_admin_answer_similarity():
+    st.subheader("🧬 유사 답안 군집 (주관식)")
+    st.caption(
+        f"서로 다른 학습자의 주관식 답안 중 거의 같은 답안(3-gram 유사도 약 {int(ANSWER_SIMILARITY_THRESHOLD*100)}% 이상)을 묶어 보여줍니다. "
+        f"정규화 후 {ANSWER_MIN_CHARS}자 미만 답안은 제외됩니다."
+    )
+    status = _answer_similarity_status()
+    if status["error"]:
+        st.error(f"유사 답안 분석 중 오류가 발생했습니다: {status['error']}")
+    if not status["ready"]:
+        if status["building"]:
+            st.info("유사 답안 인덱스를 만드는 중입니다. 답안이 많으면 수십 초 걸릴 수 있으니 잠시 후 다시 확인해주세요.")
+            st.button("🔄 다시 확인", key="admin_similarity_recheck")
+        return
+    if status["building"]:
+        st.caption("최근 답안을 반영하는 중입니다. 일부 최신 답안은 다음 새로고침 때 표시됩니다.")
+    try:
+        clusters = find_similar_answer_clusters()
+    except Exception as e:
+        st.error(f"유사 답안 분석 중 오류가 발생했습니다: {e}")
+        return
+    if clusters.empty:
+        st.info("유사 답안 군집이 없습니다.")
+        return
+
+    f1, f2 = st.columns(2)
+    with f1:
+        q_options = ["전체"] + sorted(clusters["question_code"].unique().tolist())
+        q_sel = st.selectbox("문항", q_options, key="admin_similarity_question")
+    with f2:
+        org_options = ["전체"] + sorted({o for v in clusters["organizations"] for o in str(v).split(", ") if o})
+        org_sel = st.selectbox("기관", org_options, key="admin_similarity_org")
+
+    view = clusters
+    if q_sel != "전체":
+        view = view[view["question_code"] == q_sel]
+    if org_sel != "전체":
+        view = view[view["_members"].apply(lambda recs: any(r["organization"] == org_sel for r in recs))]
+    if view.empty:
+        st.info("선택한 조건의 유사 답안 군집이 없습니다.")
+        return
+
+    c1, c2 = st.columns(2)
+    c1.metric("군집 수", f"{len(view):,}")
+    c2.metric("관련 학습자(연인원)", f"{int(view['learners'].sum()):,}")
+    safe_dataframe(
+        view.drop(columns=["_members"]).rename(columns={
+            "question_code": "문항", "cluster": "군집", "learners": "학습자 수", "answers": "답안 수",
+            "organizations": "기관", "first_at": "최초 제출", "last_at": "최근 제출", "sample": "대표 답안",
+        }),
+        use_container_width=True,
+        hide_index=True,
+    )
+
+    pick = st.selectbox("군집 상세", view["cluster"].tolist(), key="admin_similarity_cluster")
+    recs = view[view["cluster"] == pick].iloc[0]["_members"]
+    safe_dataframe(
+        pd.DataFrame(recs)[["timestamp", "organization", "employee_no", "name", "text"]].rename(columns={
+            "timestamp": "제출 시각", "organization": "기관", "employee_no": "사번", "name": "이름", "text": "답안",
+        }).sort_values("제출 시각"),
+        use_container_width=True,
+        hide_index=True,
+    )
+
+
+QUESTION_STATS_LOG_COLUMNS = [
+    "timestamp", "employee_no", "name", "organization", "mission_key", "mission_title",
+    "question_index", "question_code", "question_type", "is_correct", "awarded_score", "max_score",
+]
+
+
+# ---------------------------------------------------------
+# 문항별 정답률 통계 (증분 집계)
+#   - 정답 여부/학습자 키/문항 코드는 DataFrame 단위 벡터 연산으로 계산 (행별 apply 없음)
+#   - (문항 코드, 문항 라벨)별 누적 카운터와 (학습자, 문항 코드)별 첫 시도만 보관
+#   - 닫힌 세그먼트는 컬럼형 스냅샷에서 한 번 접고, 활성 로그는 새로 추가된 행만 접는다
+# ---------------------------------------------------------
+def _question_stats_keys(df: pd.DataFrame) -> pd.DataFrame:
+    """정규화 로그 → [timestamp, learner_key, question_code, question_label, correct, awarded, max]."""
+    n = len(df)
+
+    def _col(name, default=""):
+        if name not in df.columns:
+            return pd.Series([default] * n, index=df.index)
+        src = df[name]
+        if isinstance(src, pd.DataFrame):
+            src = src.iloc[:, 0]
+        return src
+
+    def _num(name):
+        return pd.to_numeric(_col(name, 0), errors="coerce").fillna(0).to_numpy(dtype=float)
+
+    awarded = _num("awarded_score")
+    max_score = _num("max_score")
+    ratio = np.divide(awarded, max_score, out=np.zeros(n), where=max_score > 0)
+    # 문자열 판정은 값 종류별로 한 번만 (로그 컬럼은 값 종류가 적다)
+    is_mcq = _map_unique(_col("question_type"), lambda v: str(v).lower() == "mcq", bool).to_numpy()
+    is_y = _map_unique(_col("is_correct"), lambda v: str(v).upper() == "Y", bool).to_numpy()
+    correct = np.where(is_mcq, is_y, ratio >= TEXT_CORRECT_THRESHOLD)
+
+    emp = _col("employee_no").astype(str)
+    learner = emp.copy()
+    blank = _map_unique(emp, _is_blank, bool).to_numpy()
+    if blank.any():
+        learner[blank] = _col("name").astype(str)[blank] + "|" + _col("organization").astype(str)[blank]
+
+    qidx = pd.to_numeric(_col("question_index", 0), errors="coerce").fillna(0).astype(int).astype(str)
+    label = _col("mission_title", "미상 테마").astype(str) + " · Q" + qidx
+    qcode = _col("question_code").astype(str)
+    blank = _map_unique(qcode, _is_blank, bool).to_numpy()
+    if blank.any():
+        qcode[blank] = _col("mission_key").astype(str)[blank] + "_Q" + qidx[blank]
+
+    keys = pd.DataFrame({
+        "timestamp": _col("timestamp").astype(str).to_numpy(),
+        "learner_key": learner.to_numpy(),
+        "question_code": qcode.to_numpy(),
+        "question_label": label.to_numpy(),
+        "correct": correct.astype(bool),
+        "awarded": awarded,
+        "max": max_score,
+    })
+    return keys[~_map_unique(keys["question_code"], _is_blank, bool).to_numpy()]
+
+
+def _sync_log_fold(store: dict, columns: list, new_state, fold) -> dict:
+    """닫힌 세그먼트(컬럼형 스냅샷) + 활성 로그 추가분을 프로세스 공유 state에 접는다.
+
+    세그먼트 구성이 바뀌었거나 활성 로그가 교체되면 new_state()로 새로 만들어 처음부터 접는다.
+    store["lock"]을 잡은 상태에서 호출한다. state["version"]은 내용이 바뀔 때마다 증가한다.
+    """
+    seg_sig = _log_segments_signature()
+    state = store.get("state")
+    if state is not None and state["segments"] != seg_sig:
+        state = None
+    cursor = state["cursor"] if state is not None else {}
+    try:
+        delta, reset = _read_active_log_delta(cursor, as_frame=True)
+        if state is None or reset:
+            state = store["state"] = new_state()
+            state.update({"segments": seg_sig, "cursor": cursor, "version": 0})
+            fold(state, _segment_log_frame(columns))
+            state["version"] += 1
+        if delta is not None and not delta.empty:
+            fold(state, delta)
+            state["version"] += 1
+    except Exception:
+        store.pop("state", None)
+        raise
+    return state
+
+
+def _empty_question_stats() -> dict:
+    return {
+        "seq": 0,
+        "questions": {},            # (question_code, 문항 라벨) -> [제출 수, 정답 수, 점수 합, 최대 배점]
+        "firsts": {},               # (learner_key, question_code) -> (timestamp, seq, 정답 여부)
+        "first_attempts": Counter(),  # question_code -> 첫 시도 수
+        "first_corrects": Counter(),  # question_code -> 첫 시도 정답 수
+        "frame": None,
+    }
+
+
+def _fold_question_stats(state: dict, frame) -> None:
+    """로그 행 묶음을 문항별 카운터에 더한다 (뒤에 온 행일수록 seq가 크다)."""
+    if frame is None or frame.empty:
+        return
+    keys = _question_stats_keys(frame)
+    if keys.empty:
+        return
+    keys["seq"] = np.arange(state["seq"], state["seq"] + len(keys))
+    state["seq"] += len(keys)
+
+    grouped = keys.groupby(["question_code", "question_label"], sort=False).agg(
+        attempts=("correct", "size"),
+        corrects=("correct", "sum"),
+        score_sum=("awarded", "sum"),
+        max_score=("max", "max"),
+    )
+    questions = state["questions"]
+    for qkey, attempts, corrects, score_sum, max_score in zip(
+        grouped.index, grouped["attempts"], grouped["corrects"], grouped["score_sum"], grouped["max_score"]
+    ):
+        cur = questions.get(qkey)
+        if cur is None:
+            questions[qkey] = [int(attempts), int(corrects), float(score_sum), float(max_score)]
+        else:
+            cur[0] += int(attempts)
+            cur[1] += int(corrects)
+            cur[2] += float(score_sum)
+            cur[3] = max(cur[3], float(max_score))
+
+    first = keys.sort_values(["timestamp", "seq"], kind="mergesort").drop_duplicates(
+        ["learner_key", "question_code"], keep="first"
+    )
+    firsts = state["firsts"]
+    if not firsts:
+        # 처음 접을 때는 한 번에 채운다
+        firsts.update(zip(
+            zip(first["learner_key"], first["question_code"]),
+            zip(first["timestamp"], first["seq"], first["correct"]),
+        ))
+        per_q = first.groupby("question_code", sort=False)["correct"].agg(["size", "sum"])
+        for qcode, n, c in zip(per_q.index, per_q["size"], per_q["sum"]):
+            state["first_attempts"][qcode] += int(n)
+            state["first_corrects"][qcode] += int(c)
+        return
+    for learner, qcode, ts, seq, ok in zip(
+        first["learner_key"], first["question_code"], first["timestamp"], first["seq"], first["correct"]
+    ):
+        cur = firsts.get((learner, qcode))
+        if cur is not None:
+            if (cur[0], cur[1]) <= (ts, seq):
+                continue
+            # 시각이 더 이른 행이 늦게 기록된 경우: 첫 시도를 교체
+            state["first_attempts"][qcode] -= 1
+            state["first_corrects"][qcode] -= int(cur[2])
+        firsts[(learner, qcode)] = (ts, seq, bool(ok))
+        state["first_attempts"][qcode] += 1
+        state["first_corrects"][qcode] += int(ok)
+
+
+def _question_stats_frame(state: dict) -> pd.DataFrame:
+    rows = [
+        {
+            "question_code": qcode,
+            "question_label": label,
+            "attempts": attempts,
+            "corrects": corrects,
+            "avg_score": score_sum / attempts if attempts else np.nan,
+            "max_score": max_score,
+            "first_attempts": state["first_attempts"].get(qcode, 0),
+            "first_corrects": state["first_corrects"].get(qcode, 0),
+        }
+        for (qcode, label), (attempts, corrects, score_sum, max_score) in state["questions"].items()
+    ]
+    stats = pd.DataFrame(rows, columns=[
+        "question_code", "question_label", "attempts", "corrects", "avg_score", "max_score",
+        "first_attempts", "first_corrects",
+    ])
+    stats["attempt_correct_rate"] = (stats["corrects"] / stats["attempts"].replace(0, 1) * 100).round(1)
+    stats["first_correct_rate"] = (stats["first_corrects"] / stats["first_attempts"].replace(0, 1) * 100).round(1)
+    stats["avg_score_rate"] = ((stats["avg_score"] / stats["max_score"].replace(0, 1)) * 100).round(1)
+    return stats.sort_values(["question_code", "question_label"]).reset_index(drop=True)
+
+
+def question_stats():
+    """문항별 정답률 통계 (프로세스 공유, 새로 추가된 로그 행만 반영). 로그가 없으면 None.
 
-                before_rows = len(existing_backup_df)
-                preview_combined = _dedupe_final_result_backup_rows(
-                    pd.concat([existing_backup_df, uploaded_df], ignore_index=True)
-                )
-                after_rows = len(preview_combined)
-                added_rows = max(after_rows - before_rows, 0)
+    반환된 DataFrame은 캐시와 공유되므로 수정하지 말고 복사해 사용한다.
+    """
+    if not LOG_FILE.exists() and not _log_segment_paths():
+        return None
+    store = _process_store("question_stats")
+    with store["lock"]:
+        state = _sync_log_fold(store, QUESTION_STATS_LOG_COLUMNS, _empty_question_stats, _fold_question_stats)
+        if state["frame"] is None or state["frame"][0] != state["version"]:
+            state["frame"] = (state["version"], _question_stats_frame(state))
+        return state["frame"][1]
 
-                col_a, col_b, col_c = st.columns(3)
-                col_a.metric("기존 업로드 백업", f"{before_rows:,}건")
-                col_b.metric("업로드 파일", f"{len(uploaded_df):,}건")
-                col_c.metric("병합 후 예상 증가", f"{added_rows:,}건")
 
-                with st.form("admin_backup_merge_form", clear_on_submit=False):
-                    st.markdown("병합 버튼을 누르면 관리자 업로드 전용 백업 파일에 **신규 완료자 1인 1건 기준(최신 종료시각 우선)** 으로 저장되고, 최종 결과 로그/기관 전광판에 즉시 반영됩니다.")
-                    merge_clicked = st.form_submit_button("서버 데이터와 병합", use_container_width=True, type="primary")
+# ---------------------------------------------------------
+# 객관식 선택지별 응답 수 (증분 집계)
+#   - (문항 코드, 문항 내용 버전)별 선택지 번호 카운터만 보관
+#   - 버전 미기록 행(구버전 로그)은 보기 문구로 역산한 번호이므로 현재 버전으로 센다
+# ---------------------------------------------------------
+OPTION_STATS_LOG_COLUMNS = ["question_code", "question_type", "selected_option_index", "content_version"]
 
-                if merge_clicked:
-                    try:
-                        existing_backup_df = _dedupe_final_result_backup_rows(existing_backup_df.copy())
-                        uploaded_df = _dedupe_final_result_backup_rows(uploaded_df.copy())
 
-                        if existing_backup_df.empty:
-                            combined = uploaded_df
-                        else:
-                            combined = pd.concat([existing_backup_df, uploaded_df], ignore_index=True)
+def _empty_option_stats() -> dict:
+    return {
+        "counts": {},             # (question_code, content_version) -> Counter(선택지 번호 -> 응답 수)
+        "unresolved": Counter(),  # question_code -> 선택지를 알 수 없는 객관식 응답 수
+        "frame": None,
+    }
 
-                        combined.columns = [str(c).strip() for c in combined.columns]
-                        combined = _dedupe_final_result_backup_rows(combined)
-                        combined.to_csv(ADMIN_BACKUP_RESULTS_FILE, index=False, encoding="utf-8-sig")
 
-                        st.session_state["admin_backup_merge_result"] = {
-                            "saved_file": ADMIN_BACKUP_RESULTS_FILE.name,
-                            "before_rows": int(before_rows),
-                            "uploaded_rows": int(len(uploaded_df)),
-                            "after_rows": int(len(combined)),
-                            "added_rows": int(max(len(combined) - before_rows, 0)),
-                        }
-                        st.success("데이터 병합이 완료되었습니다. 아래 로그 표를 다시 확인해 주세요.")
-                        st.rerun()
-                    except Exception as e:
-                        st.error(f"파일 처리 중 오류가 발생했습니다: {e}")
+def _fold_option_stats(state: dict, frame) -> None:
+    if frame is None or frame.empty:
+        return
+    mcq = _map_unique(frame["question_type"], lambda v: str(v).strip().lower() == "mcq", bool).to_numpy()
+    if not mcq.any():
+        return
+    sub = pd.DataFrame({
+        "code": frame["question_code"].astype(str).to_numpy()[mcq],
+        "version": frame["content_version"].astype(str).to_numpy()[mcq],
+        "option": frame["selected_option_index"].to_numpy(dtype=np.int64)[mcq],
+    })
+    for (qcode, version, option), n in sub.groupby(["code", "version", "option"], sort=False).size().items():
+        if option < 0:
+            state["unresolved"][qcode] += int(n)
+            continue
+        key = (qcode, version or QUIZ_CONTENT_VERSIONS.get(qcode, ""))
+        state["counts"].setdefault(key, Counter())[int(option)] += int(n)
 
-        merge_result = st.session_state.get("admin_backup_merge_result")
-        if merge_result:
-            st.info(
-                f"최근 병합 결과 · 저장파일: {merge_result['saved_file']} / 기존 {merge_result['before_rows']:,}건 + 업로드 {merge_result['uploaded_rows']:,}건 → 저장 {merge_result['after_rows']:,}건 (실제 증가 {merge_result['added_rows']:,}건)"
-            )
 
-        df = _merge_results_for_admin()
-        if df.empty:
-            st.info("최종 결과 로그에 표시할 데이터가 없습니다. 같은 폴더의 training_results.csv 또는 compliance_training_log.csv를 확인해 주세요.")
-        else:
-            st.subheader("참가자 최종 결과 (1인 1레코드)")
-            show = df.rename(columns={
-                "employee_no":"사번","name":"이름","organization":"소속기관",
-                "participated_at":"참여시각","ended_at":"종료시각","duration_sec":"참여시간(초)",
-                "final_score":"최종점수","score_rate":"득점률(%)","grade":"등급",
-                "training_attempt_id":"시도ID","attempt_round":"회차"
-            })
-            st.dataframe(show, use_container_width=True, hide_index=True)
-            st.download_button(
-                "📥 최종 결과 로그 다운로드 (CSV)",
-                data=show.to_csv(index=False).encode("utf-8-sig"),
-                file_name=f"training_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                mime="text/csv",
-                use_container_width=True,
+def _option_stats_frame(state: dict) -> pd.DataFrame:
+    records = []
+    for m_key in SCENARIO_ORDER:
+        for i, q in enumerate(SCENARIOS[m_key]["quiz"]):
+            if q.get("type") != "mcq":
+                continue
+            qcode = f"{m_key}_Q{i+1}"
+            counts = state["counts"].get((qcode, QUIZ_CONTENT_VERSIONS.get(qcode, "")), Counter())
+            total = sum(counts.get(j, 0) for j in range(len(q["options"])))
+            wrong = total - counts.get(q["answer"], 0)
+            for j, text in enumerate(q["options"]):
+                n = counts.get(j, 0)
+                is_answer = j == q["answer"]
+                records.append({
+                    "question_code": qcode,
+                    "question_label": f"{SCENARIOS[m_key]['title']} · Q{i+1}",
+                    "option_index": j,
+                    "option_text": text,
+                    "is_answer": is_answer,
+                    "count": n,
+                    "share": round(n / max(total, 1) * 100, 1),
+                    "wrong_share": np.nan if is_answer else round(n / max(wrong, 1) * 100, 1),
+                })
+    return pd.DataFrame(records, columns=[
+        "question_code", "question_label", "option_index", "option_text", "is_answer", "count", "share", "wrong_share",
+    ])
+
+
+def option_stats():
+    """객관식 선택지별 응답 분포 (현재 문항 내용 기준, 새로 추가된 로그 행만 반영). 로그가 없으면 None.
+
+    반환: {"table": DataFrame, "unresolved": 선택지 미확인 응답 수, "other_versions": 이전 내용 버전 응답 수}
+    """
+    if not LOG_FILE.exists() and not _log_segment_paths():
+        return None
+    store = _process_store("option_stats")
+    with store["lock"]:
+        state = _sync_log_fold(store, OPTION_STATS_LOG_COLUMNS, _empty_option_stats, _fold_option_stats)
+        if state["frame"] is None or state["frame"][0] != state["version"]:
+            other = sum(
+                sum(c.values()) for (qcode, version), c in state["counts"].items()
+                if version != QUIZ_CONTENT_VERSIONS.get(qcode, "")
             )
-
+            state["frame"] = (state["version"], {
+                "table": _option_stats_frame(state),
+                "unresolved": int(sum(state["unresolved"].values())),
+                "other_versions": int(other),
+            })
+        return state["frame"][1]
 
 
 def render_admin_question_stats():
     st.markdown("### 🛠 관리자용 문항별 정답률 통계")
 
-    df, err = _load_log_df()
-    if err:
-        st.info(err)
+    try:
+        stats = question_stats()
+    except Exception as e:
+        st.error(f"문항 통계 집계 중 오류가 발생했습니다: {e}")
         return
-
-    df = _coerce_log_df(df)
-    if df.empty:
-        st.info("로그 데이터가 비어 있습니다.")
+    if stats is None:
+        st.info("아직 누적 로그 파일이 없습니다.")
         return
-
-    def _is_correct_norm(row):
-        qtype = str(row.get("question_type", "")).lower()
-        is_correct = str(row.get("is_correct", "")).upper()
-        if qtype == "mcq":
-            return is_correct == "Y"
-        max_score = float(row.get("max_score", 0) or 0)
-        awarded = float(row.get("awarded_score", 0) or 0)
-        ratio = (awarded / max_score) if max_score > 0 else 0
-        return ratio >= TEXT_CORRECT_THRESHOLD
-
-    df["is_correct_norm"] = df.apply(_is_correct_norm, axis=1)
-
-    emp_series = df["employee_no"].astype(str).fillna("") if "employee_no" in df.columns else pd.Series([""] * len(df))
-    name_series = df["name"].astype(str) if "name" in df.columns else pd.Series([""] * len(df))
-    org_series = df["organization"].astype(str) if "organization" in df.columns else pd.Series([""] * len(df))
-    df["learner_key"] = emp_series.where(emp_series.str.strip() != "", name_series + "|" + org_series)
-
-    qidx_src = df["question_index"] if "question_index" in df.columns else pd.Series([0]*len(df))
-    if isinstance(qidx_src, pd.DataFrame):
-        qidx_src = qidx_src.iloc[:, 0]
-    qidx = pd.to_numeric(qidx_src, errors="coerce").fillna(0).astype(int)
-    mtitle_src = df["mission_title"] if "mission_title" in df.columns else pd.Series(["미상 테마"] * len(df))
-    if isinstance(mtitle_src, pd.DataFrame):
-        mtitle_src = mtitle_src.iloc[:, 0]
-    mtitle = mtitle_src.astype(str)
-    df["question_label"] = mtitle + " · Q" + qidx.astype(str)
-
-    blank_qc = df["question_code"].astype(str).str.strip() == ""
-    df.loc[blank_qc, "question_code"] = (
-        df.loc[blank_qc, "mission_key"].astype(str) + "_Q" + qidx.loc[blank_qc].astype(str)
-    )
-
-    stat_df = df[df["question_code"].astype(str).str.strip() != ""].copy()
-    if stat_df.empty:
+    if stats.empty:
         st.info("문항 통계를 만들 수 있는 로그가 없습니다.")
         return
 
-    attempt_stats = (
-        stat_df.groupby(["question_code", "question_label"], as_index=False)
-        .agg(
-            attempts=("is_correct_norm", "count"),
-            corrects=("is_correct_norm", "sum"),
-            avg_score=("awarded_score", "mean"),
-            max_score=("max_score", "max"),
-        )
-    )
-    attempt_stats["attempt_correct_rate"] = (
-        attempt_stats["corrects"] / attempt_stats["attempts"].replace(0, 1) * 100
-    ).round(1)
-
-    df_sorted = stat_df.sort_values("timestamp", ascending=True)
-    first_attempt_df = df_sorted.drop_duplicates(subset=["learner_key", "question_code"], keep="first")
-
-    first_stats = (
-        first_attempt_df.groupby(["question_code"], as_index=False)
-        .agg(
-            first_attempts=("is_correct_norm", "count"),
-            first_corrects=("is_correct_norm", "sum"),
-        )
-    )
-    first_stats["first_correct_rate"] = (
-        first_stats["first_corrects"] / first_stats["first_attempts"].replace(0, 1) * 100
-    ).round(1)
-
-    stats = attempt_stats.merge(first_stats, on="question_code", how="left")
-    stats["avg_score_rate"] = ((stats["avg_score"] / stats["max_score"].replace(0, 1)) * 100).round(1)
-    stats = stats.sort_values(["question_code"]).reset_index(drop=True)
-
     view_cols = [
         "question_label",
         "attempts",
@@ -3329,6 +6508,387 @@ def render_admin_question_stats():
         "임계값은 TEXT_CORRECT_THRESHOLD로 조정할 수 있습니다."
     )
 
+    st.markdown("#### 🎯 선택지별 응답 분포 (객관식 · 전체 제출)")
+    try:
+        options = option_stats()
+    except Exception as e:
+        st.error(f"선택지 집계 중 오류가 발생했습니다: {e}")
+        return
+    if options is None or options["table"].empty:
+        return
+    table = options["table"]
+    labels = dict(zip(table["question_code"], table["question_label"]))
+    pick = st.selectbox("문항 선택", list(labels), format_func=lambda c: labels[c], key="admin_option_stats_pick")
+    safe_dataframe(
+        table[table["question_code"] == pick][[
+            "option_index", "option_text", "is_answer", "count", "share", "wrong_share",
+        ]].assign(option_index=lambda d: d["option_index"] + 1).rename(columns={
+            "option_index": "보기", "option_text": "내용", "is_answer": "정답", "count": "선택 수",
+            "share": "선택률(%)", "wrong_share": "오답 중 비율(%)",
+        }),
+        use_container_width=True,
+        hide_index=True,
+    )
+    notes = []
+    if options["other_versions"]:
+        notes.append(f"문항 내용이 바뀌기 전 응답 {options['other_versions']:,}건 제외")
+    if options["unresolved"]:
+        notes.append(f"선택지를 확인할 수 없는 응답 {options['unresolved']:,}건 제외")
+    if notes:
+        st.caption("※ " + " · ".join(notes))
+
+
+# ---------------------------------------------------------
+# 문항 분석 (학습자 × 문항 응답 행렬)
+#   - (학습자, 문항)별 최고점 시도/첫 시도의 점수율(0~1)과 선택지를 NumPy 행렬로 증분 유지
+#   - 난이도, 상·하위 27% 변별도, 문항-나머지 총점 상관(점이연), 선택지 분포, 테마별 Cronbach α를
+#     행렬 연산으로 계산하고 로그 버전마다 한 번만 다시 계산
+# ---------------------------------------------------------
+ITEM_ANALYSIS_LOG_COLUMNS = QUESTION_STATS_LOG_COLUMNS + ["selected_option_index", "content_version"]
+ITEM_ANALYSIS_BASES = {"best": "최고점 시도", "first": "첫 시도"}
+ITEM_GROUP_RATIO = 0.27
+
+
+def _item_catalog() -> list:
+    items = []
+    for m_key in SCENARIO_ORDER:
+        for i, q in enumerate(SCENARIOS[m_key]["quiz"]):
+            items.append({
+                "question_code": f"{m_key}_Q{i+1}",
+                "question_label": f"{SCENARIOS[m_key]['title']} · Q{i+1}",
+                "mission_key": m_key,
+                "question_type": q.get("type", ""),
+                "options": list(q.get("options") or []),
+                "answer": q.get("answer"),
+                "content_version": QUIZ_CONTENT_VERSIONS.get(f"{m_key}_Q{i+1}", ""),
+            })
+    return items
+
+
+def _empty_item_responses() -> dict:
+    catalog = _item_catalog()
+    return {
+        "catalog": catalog,
+        "item_index": {it["question_code"]: i for i, it in enumerate(catalog)},
+        "is_mcq": np.array([it["question_type"] == "mcq" for it in catalog], dtype=bool),
+        "n_options": np.array([len(it["options"]) for it in catalog], dtype=np.int64),
+        "content_version": np.array([it["content_version"] for it in catalog], dtype=object),
+        "learners": {},   # learner_key -> 행 번호
+        "seq": 0,
+        "n": 0,
+        "best": np.full((0, len(catalog)), np.nan, dtype=np.float32),
+        "best_opt": np.full((0, len(catalog)), -1, dtype=np.int16),
+        "first": np.full((0, len(catalog)), np.nan, dtype=np.float32),
+        "first_opt": np.full((0, len(catalog)), -1, dtype=np.int16),
+        "first_ts": np.full((0, len(catalog)), np.iinfo(np.int64).max, dtype=np.int64),
+        "analysis": {},
+    }
+
+
+def _grow_item_responses(state: dict, n: int) -> None:
+    cap = len(state["best"])
+    if n <= cap:
+        return
+    new_cap = max(n, cap * 2, 64)
+    fills = {"best": np.nan, "best_opt": -1, "first": np.nan, "first_opt": -1, "first_ts": np.iinfo(np.int64).max}
+    for key, fill in fills.items():
+        old = state[key]
+        grown = np.full((new_cap, old.shape[1]), fill, dtype=old.dtype)
+        grown[:cap] = old
+        state[key] = grown
+
+
+def _item_ts_ns(ts: np.ndarray) -> np.ndarray:
+    """로그 시각 → int64 ns. 시각이 없으면 가장 늦은 값으로 취급 (문항 통계의 정렬과 같게)."""
+    parsed = pd.to_datetime(pd.Series(ts), errors="coerce")
+    values = parsed.to_numpy(dtype="datetime64[ns]").view("int64").copy()
+    values[parsed.isna().to_numpy()] = np.iinfo(np.int64).max
+    return values
+
+
+def _pick_per_cell(cell: np.ndarray, *keys) -> np.ndarray:
+    """cell별로 (keys 오름차순) 첫 행의 위치. keys는 np.lexsort 순서(마지막이 1차 키)."""
+    order = np.lexsort(keys + (cell,))
+    sorted_cells = cell[order]
+    head = np.ones(len(order), dtype=bool)
+    head[1:] = sorted_cells[1:] != sorted_cells[:-1]
+    return order[head]
+
+
+def _fold_item_responses(state: dict, frame) -> None:
+    if frame is None or frame.empty:
+        return
+    keys = _question_stats_keys(frame)
+    if keys.empty:
+        return
+    item = keys["question_code"].map(state["item_index"])
+    known = item.notna().to_numpy()
+    if not known.any():
+        return
+    keys = keys[known]
+    item = item[known].to_numpy(dtype=np.int64)
+    pos = keys.index.to_numpy()
+
+    learner_codes, learner_uniques = pd.factorize(keys["learner_key"].to_numpy())
+    learners = state["learners"]
+    rows_of = np.array([learners.setdefault(k, len(learners)) for k in learner_uniques], dtype=np.int64)
+    learner = rows_of[learner_codes]
+    state["n"] = len(learners)
+    _grow_item_responses(state, state["n"])
+
+    is_mcq = state["is_mcq"][item]
+    awarded, max_score = keys["awarded"].to_numpy(), keys["max"].to_numpy()
+    ratio = np.clip(np.divide(awarded, max_score, out=np.zeros(len(keys)), where=max_score > 0), 0.0, 1.0)
+    score = np.where(is_mcq, keys["correct"].to_numpy(dtype=float), ratio)
+
+    # 선택지 번호는 지금 문항 내용과 같은 버전(또는 버전 미기록 = 보기 문구로 역산한 행)만 사용
+    opt = frame["selected_option_index"].to_numpy(dtype=np.int64)[pos]
+    version = frame["content_version"].astype(str).to_numpy()[pos]
+    valid = is_mcq & (opt >= 0) & (opt < state["n_options"][item])
+    valid &= (version == "") | (version == state["content_version"][item])
+    opt = np.where(valid, opt, -1).astype(np.int16)
+
+    seq = np.arange(state["seq"], state["seq"] + len(keys), dtype=np.int64)
+    state["seq"] += len(keys)
+    ts = _item_ts_ns(frame["timestamp"].to_numpy()[pos])
+    cell = learner * len(state["catalog"]) + item
+
+    # 최고점: 점수가 같으면 먼저 기록된 시도
+    pick = _pick_per_cell(cell, seq, -score)
+    r, c = learner[pick], item[pick]
+    cur = state["best"][r, c]
+    upd = np.isnan(cur) | (score[pick] > cur)
+    state["best"][r[upd], c[upd]] = score[pick][upd]
+    state["best_opt"][r[upd], c[upd]] = opt[pick][upd]
+
+    # 첫 시도: 시각이 가장 이른 행 (같으면 먼저 기록된 행)
+    pick = _pick_per_cell(cell, seq, ts)
+    r, c = learner[pick], item[pick]
+    upd = np.isnan(state["first"][r, c]) | (ts[pick] < state["first_ts"][r, c])
+    state["first"][r[upd], c[upd]] = score[pick][upd]
+    state["first_opt"][r[upd], c[upd]] = opt[pick][upd]
+    state["first_ts"][r[upd], c[upd]] = ts[pick][upd]
+
+
+def _item_analysis_result(state: dict, basis: str) -> dict:
+    """응답 행렬 → 문항 지표/선택지 분포/테마별 신뢰도 (모두 행렬 연산)."""
+    catalog = state["catalog"]
+    n_items = len(catalog)
+    n = state["n"]
+    X = state[basis][:n].astype(np.float64)
+    opts = state[f"{basis}_opt"][:n]
+    M = ~np.isnan(X)
+    Xz = np.where(M, X, 0.0)
+    answered = M.sum(axis=0)
+    safe_n = np.maximum(answered, 1)
+    total = Xz.sum(axis=1)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        difficulty = np.where(answered > 0, Xz.sum(axis=0) / safe_n, np.nan)
+
+        # 문항-나머지 총점 상관 (응답한 학습자만, 이분 문항이면 점이연 상관과 같음)
+        rest = total[:, None] - Xz
+        mx = Xz.sum(axis=0) / safe_n
+        my = (rest * M).sum(axis=0) / safe_n
+        dx = np.where(M, Xz - mx, 0.0)
+        dy = np.where(M, rest - my, 0.0)
+        denom = np.sqrt((dx * dx).sum(axis=0) * (dy * dy).sum(axis=0))
+        point_biserial = np.where((answered >= 2) & (denom > 0), (dx * dy).sum(axis=0) / denom, np.nan)
+
+        # 상·하위 27%: 문항마다 응답자 중 총점 순위로 나눈다
+        # float32 저장 오차로 동점 순서가 흔들리지 않도록 반올림한 총점으로 정렬하고,
+        # 동점은 행 번호(로그 배치/읽은 순서에 따라 달라짐)가 아니라 learner_key 순서로 가른다
+        learner_keys = np.empty(n, dtype=object)
+        for key, row in state["learners"].items():
+            if row < n:
+                learner_keys[row] = str(key)
+        key_rank = np.argsort(np.argsort(learner_keys.astype(str), kind="stable"), kind="stable")
+        order = np.lexsort((key_rank, np.round(total, 4)))
+        Ms = M[order]
+        rank = np.cumsum(Ms, axis=0)
+        group = np.maximum(np.round(answered * ITEM_GROUP_RATIO), 1).astype(np.int64)
+        lower_s = Ms & (rank <= group)
+        upper_s = Ms & (rank > answered - group)
+        Xs = Xz[order]
+        upper_p = np.where(answered >= 2, (Xs * upper_s).sum(axis=0) / group, np.nan)
+        lower_p = np.where(answered >= 2, (Xs * lower_s).sum(axis=0) / group, np.nan)
+        discrimination = upper_p - lower_p
+
+    flags = []
+    for cnt, p, d in zip(answered, difficulty, discrimination):
+        if cnt < 2:
+            flags.append("응답 부족")
+            continue
+        notes = []
+        if not np.isnan(p) and p >= 0.9:
+            notes.append("너무 쉬움")
+        if not np.isnan(p) and p <= 0.2:
+            notes.append("너무 어려움")
+        if not np.isnan(d) and d < 0.2:
+            notes.append("변별도 낮음")
+        flags.append(", ".join(notes))
+    items = pd.DataFrame({
+        "question_code": [it["question_code"] for it in catalog],
+        "question_label": [it["question_label"] for it in catalog],
+        "mission_key": [it["mission_key"] for it in catalog],
+        "question_type": [it["question_type"] for it in catalog],
+        "answered": answered,
+        "difficulty": np.round(difficulty, 3),
+        "upper_p": np.round(upper_p, 3),
+        "lower_p": np.round(lower_p, 3),
+        "discrimination": np.round(discrimination, 3),
+        "point_biserial": np.round(point_biserial, 3),
+        "flag": flags,
+    })
+
+    # 선택지 분포 (객관식): 전체/상위/하위 집단별 선택 수
+    upper = np.zeros_like(M)
+    lower = np.zeros_like(M)
+    upper[order] = upper_s
+    lower[order] = lower_s
+    width = max((len(it["options"]) for it in catalog), default=0) or 1
+    chosen = M & (opts >= 0) & state["is_mcq"][None, :]
+    flat = (np.arange(n_items)[None, :] * width + opts.astype(np.int64))[chosen]
+    size = n_items * width
+    counts = np.bincount(flat, minlength=size)
+    upper_counts = np.bincount(flat, weights=upper[chosen], minlength=size)
+    lower_counts = np.bincount(flat, weights=lower[chosen], minlength=size)
+    records = []
+    for i, it in enumerate(catalog):
+        if it["question_type"] != "mcq":
+            continue
+        for j, text in enumerate(it["options"]):
+            k = i * width + j
+            records.append({
+                "question_code": it["question_code"],
+                "question_label": it["question_label"],
+                "option_index": j,
+                "option_text": text,
+                "is_answer": j == it["answer"],
+                "count": int(counts[k]),
+                "share": round(counts[k] / max(int(answered[i]), 1) * 100, 1),
+                "upper_share": round(upper_counts[k] / group[i] * 100, 1) if answered[i] >= 2 else np.nan,
+                "lower_share": round(lower_counts[k] / group[i] * 100, 1) if answered[i] >= 2 else np.nan,
+            })
+    distractors = pd.DataFrame(records, columns=[
+        "question_code", "question_label", "option_index", "option_text", "is_answer",
+        "count", "share", "upper_share", "lower_share",
+    ])
+
+    # 테마별 Cronbach α: 그 테마 문항을 모두 푼 학습자만
+    alpha_rows = []
+    for m_key in SCENARIO_ORDER:
+        cols = [i for i, it in enumerate(catalog) if it["mission_key"] == m_key]
+        complete = M[:, cols].all(axis=1) if cols else np.zeros(n, dtype=bool)
+        Y = X[complete][:, cols]
+        k = len(cols)
+        alpha = np.nan
+        if k >= 2 and len(Y) >= 2:
+            total_var = Y.sum(axis=1).var(ddof=1)
+            if total_var > 0:
+                alpha = k / (k - 1) * (1 - Y.var(axis=0, ddof=1).sum() / total_var)
+        alpha_rows.append({
+            "mission_key": m_key,
+            "theme": SCENARIOS[m_key]["title"],
+            "items": k,
+            "learners": int(complete.sum()),
+            "alpha": round(float(alpha), 3) if not np.isnan(alpha) else np.nan,
+        })
+
+    return {
+        "version": state["version"],
+        "basis": basis,
+        "learners": n,
+        "items": items,
+        "distractors": distractors,
+        "alpha": pd.DataFrame(alpha_rows, columns=["mission_key", "theme", "items", "learners", "alpha"]),
+    }
+
+
+def item_analysis(basis: str = "best"):
+    """문항 분석 결과 (프로세스 공유, 로그 버전마다 한 번 계산). 로그가 없으면 None.
+
+    basis: "best"(학습자별 최고점 시도) | "first"(첫 시도)
+    반환: {version, basis, learners, items, distractors, alpha} — DataFrame은 수정하지 말 것.
+    """
+    if basis not in ITEM_ANALYSIS_BASES:
+        raise ValueError(f"unknown basis: {basis}")
+    if not LOG_FILE.exists() and not _log_segment_paths():
+        return None
+    store = _process_store("item_analysis")
+    with store["lock"]:
+        state = _sync_log_fold(store, ITEM_ANALYSIS_LOG_COLUMNS, _empty_item_responses, _fold_item_responses)
+        cached = state["analysis"].get(basis)
+        if cached is None or cached["version"] != state["version"]:
+            cached = state["analysis"][basis] = _item_analysis_result(state, basis)
+        return cached
+
+
+def render_admin_item_analysis():
+    st.markdown("### 🔬 문항 분석 (난이도 · 변별도 · 신뢰도)")
+    basis = st.radio(
+        "기준 응답",
+        list(ITEM_ANALYSIS_BASES),
+        format_func=lambda b: ITEM_ANALYSIS_BASES[b],
+        horizontal=True,
+        key="admin_item_basis",
+    )
+    try:
+        result = item_analysis(basis)
+    except Exception as e:
+        st.error(f"문항 분석 중 오류가 발생했습니다: {e}")
+        return
+    if result is None:
+        st.info("아직 누적 로그 파일이 없습니다.")
+        return
+    if result["learners"] == 0:
+        st.info("문항 분석을 만들 수 있는 로그가 없습니다.")
+        return
+
+    st.caption(
+        f"학습자 {result['learners']:,}명 · 난이도=평균 점수율(객관식은 정답률), "
+        f"변별도=상위 {int(ITEM_GROUP_RATIO*100)}% − 하위 {int(ITEM_GROUP_RATIO*100)}% 점수율, "
+        "점이연=문항 점수와 나머지 문항 총점의 상관"
+    )
+    safe_dataframe(
+        result["items"][[
+            "question_label", "question_type", "answered", "difficulty", "upper_p", "lower_p",
+            "discrimination", "point_biserial", "flag",
+        ]].rename(columns={
+            "question_label": "문항", "question_type": "유형", "answered": "응답자",
+            "difficulty": "난이도(p)", "upper_p": "상위 집단", "lower_p": "하위 집단",
+            "discrimination": "변별도(D)", "point_biserial": "점이연 상관", "flag": "검토",
+        }),
+        use_container_width=True,
+        hide_index=True,
+    )
+
+    st.markdown("#### 🧪 테마별 신뢰도 (Cronbach α)")
+    safe_dataframe(
+        result["alpha"][["theme", "items", "learners", "alpha"]].rename(columns={
+            "theme": "테마", "items": "문항 수", "learners": "전 문항 응답자", "alpha": "α",
+        }),
+        use_container_width=True,
+        hide_index=True,
+    )
+
+    distractors = result["distractors"]
+    if distractors.empty:
+        return
+    st.markdown("#### 🎯 선택지 분석 (객관식)")
+    labels = dict(zip(distractors["question_code"], distractors["question_label"]))
+    pick = st.selectbox("문항 선택", list(labels), format_func=lambda c: labels[c], key="admin_item_distractor")
+    safe_dataframe(
+        distractors[distractors["question_code"] == pick][[
+            "option_index", "option_text", "is_answer", "count", "share", "upper_share", "lower_share",
+        ]].assign(option_index=lambda d: d["option_index"] + 1).rename(columns={
+            "option_index": "보기", "option_text": "내용", "is_answer": "정답", "count": "선택 수",
+            "share": "선택률(%)", "upper_share": "상위 집단(%)", "lower_share": "하위 집단(%)",
+        }),
+        use_container_width=True,
+        hide_index=True,
+    )
+
 # =========================================================
 # 6) UI 조각들
 
@@ -3493,6 +7053,118 @@ def get_mcq_option_order(m_key: str, q_idx: int, n_options: int):
     mstore[q_idx] = order
     return order
 
+# 퀴즈 문항 영역은 fragment로 실행해 답안 선택/제출 시 전체 페이지(맵 이미지, 사이드바 전광판 등)를
+# 다시 그리지 않는다. 상태 변경은 버튼 on_click 콜백에서 처리하므로 st.rerun() 없이 반영되고,
+# fragment를 지원하지 않는 구버전에서는 평소처럼 전체 리런으로 동작한다.
+if hasattr(st, "fragment"):
+    _quiz_fragment = st.fragment
+elif hasattr(st, "experimental_fragment"):
+    _quiz_fragment = st.experimental_fragment
+else:
+    def _quiz_fragment(func):
+        return func
+
+
+def _on_quiz_edit(m_key: str, q_idx: int):
+    """'답안 수정하기': 제출 기록을 지워 입력 화면으로 되돌린다."""
+    ensure_quiz_progress(m_key)
+    st.session_state.quiz_progress[m_key]["submissions"].pop(q_idx, None)
+
+
+def _on_toggle_model_answer(toggle_key: str):
+    st.session_state[toggle_key] = not st.session_state.get(toggle_key, False)
+
+
+def _on_quiz_nav(m_key: str, new_idx: int):
+    ensure_quiz_progress(m_key)
+    total_q = len(SCENARIOS[m_key]["quiz"])
+    st.session_state.quiz_progress[m_key]["current_idx"] = max(0, min(total_q - 1, int(new_idx)))
+
+
+def _on_submit_mcq(m_key: str, q_idx: int):
+    ensure_quiz_progress(m_key)
+    q_data = SCENARIOS[m_key]["quiz"][q_idx]
+    selected = st.session_state.get(f"radio_{m_key}_{q_idx}")
+    if selected is None:
+        return
+
+    is_correct = selected == q_data["answer"]
+    awarded = q_data["score"] if is_correct else 0
+    st.session_state.attempt_counts[m_key] = st.session_state.attempt_counts.get(m_key, 0) + 1
+
+    result = {
+        "question_type": "mcq",
+        "is_correct": "Y" if is_correct else "N",
+        "awarded_score": awarded,
+        "selected_idx": selected,
+        "selected_text": q_data["options"][selected],
+        "choice_feedback": q_data["choice_feedback"][selected],
+        "explain": q_data["explain"],
+        "wrong_extra": q_data["wrong_extra"],
+    }
+    st.session_state.quiz_progress[m_key]["submissions"][q_idx] = result
+    try:
+        st.toast("정답입니다!" if is_correct else "다시 생각해보세요", icon="✨" if is_correct else "⚠️")
+    except Exception:
+        pass
+
+    append_attempt_log(
+        mission_key=m_key,
+        q_idx=q_idx,
+        q_type="mcq",
+        payload={
+            "selected_or_text": q_data["options"][selected],
+            "selected_option_index": selected,
+            "is_correct": "Y" if is_correct else "N",
+            "awarded_score": awarded,
+        },
+    )
+
+
+def _on_submit_text(m_key: str, q_idx: int):
+    ensure_quiz_progress(m_key)
+    q_data = SCENARIOS[m_key]["quiz"][q_idx]
+    answer_text = str(st.session_state.get(f"text_{m_key}_{q_idx}", "") or "")
+
+    if is_near_copy_answer(answer_text, q_data.get("sample_answer", ""), q_data.get("model_answer", "")):
+        # 콜백에서는 문항 위치에 경고를 그릴 수 없으므로 표시 플래그만 남긴다.
+        st.session_state[f"text_copy_warn_{m_key}_{q_idx}"] = True
+        return
+
+    eval_res = evaluate_text_answer(answer_text, q_data["rubric_keywords"], q_data["score"])
+    st.session_state.attempt_counts[m_key] = st.session_state.attempt_counts.get(m_key, 0) + 1
+
+    result = {
+        "question_type": "text",
+        "is_correct": "PARTIAL" if eval_res["awarded_score"] < q_data["score"] else "Y",
+        "awarded_score": eval_res["awarded_score"],
+        "answer_text": answer_text.strip(),
+        "found_groups": eval_res["found_groups"],
+        "missing_groups": eval_res["missing_groups"],
+        "quality": eval_res["quality"],
+        "score_breakdown": eval_res.get("score_breakdown", []),
+    }
+    st.session_state.quiz_progress[m_key]["submissions"][q_idx] = result
+
+    ratio = (eval_res["awarded_score"] / q_data["score"]) if q_data["score"] else 0
+    is_good = ratio >= TEXT_CORRECT_THRESHOLD
+    try:
+        st.toast("주관식 답안이 잘 작성되었어요!" if is_good else "보완 포인트를 확인해보세요", icon="✨" if is_good else "⚠️")
+    except Exception:
+        pass
+
+    append_attempt_log(
+        mission_key=m_key,
+        q_idx=q_idx,
+        q_type="text",
+        payload={
+            "selected_or_text": answer_text.strip(),
+            "is_correct": result["is_correct"],
+            "awarded_score": eval_res["awarded_score"],
+        },
+    )
+
+
 def render_mcq_question(m_key: str, q_idx: int, q_data: dict):
     ensure_quiz_progress(m_key)
     progress = st.session_state.quiz_progress[m_key]
@@ -3521,9 +7193,7 @@ def render_mcq_question(m_key: str, q_idx: int, q_data: dict):
 
         c_edit, c_hint = st.columns([1.1, 1.9])
         with c_edit:
-            if st.button("✏️ 답안 수정하기", key=f"edit_mcq_{m_key}_{q_idx}", use_container_width=True):
-                submissions.pop(q_idx, None)
-                st.rerun()
+            st.button("✏️ 답안 수정하기", key=f"edit_mcq_{m_key}_{q_idx}", use_container_width=True, on_click=_on_quiz_edit, args=(m_key, q_idx))
         with c_hint:
             st.caption("이전/다음 문제 버튼으로 이동할 수 있습니다. 수정 후 다시 제출하면 최신 답안 기준으로 점수가 반영됩니다.")
         return
@@ -3540,45 +7210,13 @@ def render_mcq_question(m_key: str, q_idx: int, q_data: dict):
         unsafe_allow_html=True,
     )
     opt_order = get_mcq_option_order(m_key, q_idx, len(q_data['options']))
-    selected = st.radio(
+    st.radio(
         "답을 선택하세요",
         options=opt_order,
         format_func=lambda i: q_data["options"][i],
         key=f"radio_{m_key}_{q_idx}",
     )
-
-    if safe_button("제출하기", key=f"submit_mcq_{m_key}_{q_idx}", use_container_width=True, primary=True):
-        is_correct = selected == q_data["answer"]
-        awarded = q_data["score"] if is_correct else 0
-        st.session_state.attempt_counts[m_key] = st.session_state.attempt_counts.get(m_key, 0) + 1
-
-        result = {
-            "question_type": "mcq",
-            "is_correct": "Y" if is_correct else "N",
-            "awarded_score": awarded,
-            "selected_idx": selected,
-            "selected_text": q_data["options"][selected],
-            "choice_feedback": q_data["choice_feedback"][selected],
-            "explain": q_data["explain"],
-            "wrong_extra": q_data["wrong_extra"],
-        }
-        submissions[q_idx] = result
-        try:
-            st.toast("정답입니다!" if is_correct else "다시 생각해보세요", icon="✨" if is_correct else "⚠️")
-        except Exception:
-            pass
-
-        append_attempt_log(
-            mission_key=m_key,
-            q_idx=q_idx,
-            q_type="mcq",
-            payload={
-                "selected_or_text": q_data["options"][selected],
-                "is_correct": "Y" if is_correct else "N",
-                "awarded_score": awarded,
-            },
-        )
-        st.rerun()
+    safe_button("제출하기", key=f"submit_mcq_{m_key}_{q_idx}", use_container_width=True, primary=True, on_click=_on_submit_mcq, args=(m_key, q_idx))
 
 
 def render_text_question(m_key: str, q_idx: int, q_data: dict):
@@ -3627,8 +7265,7 @@ def render_text_question(m_key: str, q_idx: int, q_data: dict):
 
         c_ma_btn, c_ma_sp = st.columns([1.0, 2.0])
         with c_ma_btn:
-            if st.button("모범답안 보기", key=f"btn_{toggle_key}", use_container_width=True):
-                st.session_state[toggle_key] = not st.session_state[toggle_key]
+            st.button("모범답안 보기", key=f"btn_{toggle_key}", use_container_width=True, on_click=_on_toggle_model_answer, args=(toggle_key,))
 
         if st.session_state.get(toggle_key, False):
             model_answer_text = html.escape(str(q_data.get("model_answer", ""))).replace('\n', '<br>')
@@ -3644,9 +7281,7 @@ def render_text_question(m_key: str, q_idx: int, q_data: dict):
 
         c_edit, c_hint = st.columns([1.1, 1.9])
         with c_edit:
-            if st.button("✏️ 답안 수정하기", key=f"edit_text_{m_key}_{q_idx}", use_container_width=True):
-                submissions.pop(q_idx, None)
-                st.rerun()
+            st.button("✏️ 답안 수정하기", key=f"edit_text_{m_key}_{q_idx}", use_container_width=True, on_click=_on_quiz_edit, args=(m_key, q_idx))
         with c_hint:
             st.caption("이전/다음 문제 버튼으로 이동할 수 있습니다. 수정 후 다시 제출하면 최신 답안 기준으로 점수가 반영됩니다.")
         return
@@ -3677,51 +7312,16 @@ def render_text_question(m_key: str, q_idx: int, q_data: dict):
             unsafe_allow_html=True,
         )
 
-    answer_text = st.text_area(
+    st.text_area(
         "답안을 입력하세요",
         key=f"text_{m_key}_{q_idx}",
         height=150,
         placeholder=(sample_answer if sample_answer else "예: 원칙을 설명하고, 가능한 대안(보고/확인/절차)을 함께 적어보세요."),
     )
 
-    if safe_button("제출하기", key=f"submit_text_{m_key}_{q_idx}", use_container_width=True, primary=True):
-        if is_near_copy_answer(answer_text, q_data.get("sample_answer", ""), q_data.get("model_answer", "")):
-            st.warning("예시/모범답안 문장을 그대로 복사한 답안은 제출할 수 없습니다. 같은 뜻이어도 본인 표현으로 바꿔 작성해주세요.")
-            return
-
-        eval_res = evaluate_text_answer(answer_text, q_data["rubric_keywords"], q_data["score"])
-        st.session_state.attempt_counts[m_key] = st.session_state.attempt_counts.get(m_key, 0) + 1
-
-        result = {
-            "question_type": "text",
-            "is_correct": "PARTIAL" if eval_res["awarded_score"] < q_data["score"] else "Y",
-            "awarded_score": eval_res["awarded_score"],
-            "answer_text": answer_text.strip(),
-            "found_groups": eval_res["found_groups"],
-            "missing_groups": eval_res["missing_groups"],
-            "quality": eval_res["quality"],
-            "score_breakdown": eval_res.get("score_breakdown", []),
-        }
-        submissions[q_idx] = result
-
-        ratio = (eval_res["awarded_score"] / q_data["score"]) if q_data["score"] else 0
-        is_good = ratio >= TEXT_CORRECT_THRESHOLD
-        try:
-            st.toast("주관식 답안이 잘 작성되었어요!" if is_good else "보완 포인트를 확인해보세요", icon="✨" if is_good else "⚠️")
-        except Exception:
-            pass
-
-        append_attempt_log(
-            mission_key=m_key,
-            q_idx=q_idx,
-            q_type="text",
-            payload={
-                "selected_or_text": answer_text.strip(),
-                "is_correct": result["is_correct"],
-                "awarded_score": eval_res["awarded_score"],
-            },
-        )
-        st.rerun()
+    safe_button("제출하기", key=f"submit_text_{m_key}_{q_idx}", use_container_width=True, primary=True, on_click=_on_submit_text, args=(m_key, q_idx))
+    if st.session_state.pop(f"text_copy_warn_{m_key}_{q_idx}", False):
+        st.warning("예시/모범답안 문장을 그대로 복사한 답안은 제출할 수 없습니다. 같은 뜻이어도 본인 표현으로 바꿔 작성해주세요.")
 
 
 def render_quiz_navigation_controls(m_key: str):
@@ -3741,23 +7341,25 @@ def render_quiz_navigation_controls(m_key: str):
 
     c1, c2 = st.columns([1, 1], gap='large')
     with c1:
-        if st.button("◀ 이전 문제", key=f"nav_prev_{m_key}_{idx}", use_container_width=True, disabled=(idx <= 0)):
-            progress["current_idx"] = max(0, idx - 1)
-            st.rerun()
+        st.button("◀ 이전 문제", key=f"nav_prev_{m_key}_{idx}", use_container_width=True, disabled=(idx <= 0), on_click=_on_quiz_nav, args=(m_key, idx - 1))
     with c2:
         if idx < total_q - 1:
-            if safe_button("다음 문제 ▶", key=f"nav_next_{m_key}_{idx}", use_container_width=True, disabled=(not current_submitted), primary=True):
-                progress["current_idx"] = min(total_q - 1, idx + 1)
-                st.rerun()
+            safe_button("다음 문제 ▶", key=f"nav_next_{m_key}_{idx}", use_container_width=True, disabled=(not current_submitted), primary=True, on_click=_on_quiz_nav, args=(m_key, idx + 1))
         else:
             all_submitted = len(submissions) == total_q
             mark_theme_complete_if_ready(m_key)
+            # 화면 전환은 fragment 밖(맵)까지 다시 그려야 하므로 전체 리런
             if safe_button("🏁 테마 정복 완료! 맵으로 돌아가기", key=f"nav_finish_{m_key}", use_container_width=True, disabled=(not all_submitted), primary=True):
                 st.session_state.stage = "map"
                 st.rerun()
 
 
-def render_quiz(m_key: str):
+@_quiz_fragment
+def render_quiz_panel(m_key: str):
+    """퀴즈 오른쪽 패널(진행 현황 + 문항 + 이동 버튼).
+
+    fragment로 실행되므로 보기 선택/제출/수정/이동 시 이 패널만 다시 그린다.
+    """
     mission = SCENARIOS[m_key]
     ensure_quiz_progress(m_key)
 
@@ -3770,13 +7372,33 @@ def render_quiz(m_key: str):
     q_data = q_list[current_idx]
     current_theme_score = theme_score_from_submissions(m_key)
     submitted_count = len(progress["submissions"])
+
+    st.markdown(
+        f"<div style='margin:2px 0 8px 0; font-size:0.9rem; color:#D0DCF2;'>문항 진행: {submitted_count} / {len(q_list)} · 테마 점수(누적): {current_theme_score}/{theme_max_score(m_key)}</div>",
+        unsafe_allow_html=True,
+    )
+    if q_data["type"] == "mcq":
+        render_mcq_question(m_key, current_idx, q_data)
+    elif q_data["type"] == "text":
+        render_text_question(m_key, current_idx, q_data)
+    else:
+        st.error("지원하지 않는 문항 타입입니다.")
+
+    # 제출 버튼과 너무 붙지 않도록 하단 여백 + 내비게이션 제공
+    st.markdown("<div style='height:10px;'></div>", unsafe_allow_html=True)
+    render_quiz_navigation_controls(m_key)
+
+
+def render_quiz(m_key: str):
+    mission = SCENARIOS[m_key]
+    ensure_quiz_progress(m_key)
     theme_icon = THEME_ICONS.get(m_key, "🧭")
 
+    # 진행 현황/점수는 답안 제출 때마다 바뀌므로 fragment 안(render_quiz_panel)에서 그린다.
     st.markdown(
         f"""
         <div class='mission-header'>
           <div style='font-size:1.05rem; font-weight:800;'>{theme_icon} {mission['title']} · 퀴즈</div>
-          <div style='margin-top:4px; font-size:0.9rem; opacity:.92;'>문항 진행: {submitted_count} / {len(q_list)} · 테마 점수(누적): {current_theme_score}/{theme_max_score(m_key)}</div>
         </div>
         """,
         unsafe_allow_html=True,
@@ -3797,7 +7419,7 @@ def render_quiz(m_key: str):
         if MASTER_IMAGE.exists():
             img_c1, img_c2, img_c3 = st.columns([0.05, 0.90, 0.05])
             with img_c2:
-                st.image(str(MASTER_IMAGE), use_container_width=True)
+                render_asset_image(MASTER_IMAGE, sizes="(max-width: 768px) 90vw, 33vw")
             st.markdown("<div class='quiz-left-caption'>클린 마스터</div>", unsafe_allow_html=True)
         else:
             st.info("클린 마스터 이미지 없음")
@@ -3819,31 +7441,97 @@ def render_quiz(m_key: str):
 
     with col_right:
         st.markdown("<div style='height:8px;'></div>", unsafe_allow_html=True)
-        if q_data["type"] == "mcq":
-            render_mcq_question(m_key, current_idx, q_data)
-        elif q_data["type"] == "text":
-            render_text_question(m_key, current_idx, q_data)
-        else:
-            st.error("지원하지 않는 문항 타입입니다.")
+        render_quiz_panel(m_key)
+
+# =========================================================
+# 6-1) 운영 CLI (python app.py <명령>) — streamlit run 에서는 실행되지 않음
+# =========================================================
+def _running_in_streamlit() -> bool:
+    try:
+        from streamlit import runtime
+        return bool(runtime.exists())
+    except Exception:
+        return False
+
+
+def _cli_main(argv: list) -> int:
+    import argparse
+    import logging
+
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    parser = argparse.ArgumentParser(prog="python app.py", description="컴플라이언스 어드벤처 운영 명령")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_regrade = sub.add_parser("regrade", help="로그의 주관식 답안을 현재 채점 기준으로 일괄 재채점")
+    p_regrade.add_argument("--workers", type=int, default=None, help="워커 프로세스 수 (기본: CPU 수)")
+    p_regrade.add_argument("--apply", action="store_true", help="시도별 총점 변화를 최종 결과에 반영")
+
+    p_migrate = sub.add_parser("migrate-log", help=f"응시 로그를 현재 스키마(v{LOG_SCHEMA_VERSION})로 변환")
+    p_migrate.add_argument("--check", action="store_true", help="변환 없이 상태만 출력 (변환 필요 시 종료코드 2)")
+
+    p_rotate = sub.add_parser("rotate-log", help="지난 날짜의 응시 로그를 일자별 압축 세그먼트로 분리 (+ 컬럼형 스냅샷)")
+    p_rotate.add_argument("--before", default=None, help="이 날짜(YYYY-MM-DD) 이전 행을 분리 (기본: 오늘)")
+
+    p_bench = sub.add_parser("bench-normalize", help="로그 정규화(행 단위 vs 컬럼 단위) 결과 비교 및 속도 측정")
+    p_bench.add_argument("--rows", type=int, default=1_000_000, help="합성 로그 행 수 (기본 1,000,000)")
+
+    args = parser.parse_args(argv)
+    if args.command == "bench-normalize":
+        return 0 if run_normalize_benchmark(args.rows) else 1
+    if args.command == "rotate-log":
+        res = rotate_log_segments(args.before)
+        print(f"세그먼트 분리: {res['rotated']:,}행 → {len(res['segments'])}개 일자, 활성 로그 {res['kept']:,}행")
+        print(f"컬럼형 스냅샷 생성: {compact_log_snapshots()}개")
+        return 0
+    if args.command == "migrate-log":
+        status = _log_schema_status()
+        print(f"{LOG_FILE.name}: {status} (schema v{LOG_SCHEMA_VERSION})")
+        if args.check:
+            return 2 if status == "migrate" else 0
+        res = migrate_log_file()
+        print(f"변환 {'완료' if res['migrated'] else '불필요'}: {res['rows']:,}행")
+        segments = migrate_log_segments()
+        print(f"세그먼트 변환: {segments}개" + (f" · 컬럼형 스냅샷 생성: {compact_log_snapshots()}개" if segments else ""))
+        return 0
+    if args.command == "regrade":
+        run_regrade(workers=args.workers, apply=args.apply)
+        return 0
+    return 1
+
+
+CLI_COMMANDS = ("regrade", "migrate-log", "rotate-log", "bench-normalize")
+
+if __name__ == "__main__" and len(sys.argv) > 1 and sys.argv[1] in CLI_COMMANDS and not _running_in_streamlit():
+    sys.exit(_cli_main(sys.argv[1:]))
 
-        # 제출 버튼과 너무 붙지 않도록 하단 여백 + 내비게이션 제공
-        st.markdown("<div style='height:10px;'></div>", unsafe_allow_html=True)
-        render_quiz_navigation_controls(m_key)
 
 # =========================================================
 # 7) 메인 화면 분기
 # =========================================================
+inject_app_styles()
 init_state()
 _restore_admin_auth_from_persisted_session()
 
 # Ensure result/log schema files are created once after deployment (prevents missing counts/records)
 try:
     _ensure_results_file()
-    _ensure_log_schema_file()
+    _ensure_log_schema_file(background=True)
+    _maybe_rotate_log_segments()
+    _schedule_log_segment_migration()
 except Exception:
     # Do not block the app if the filesystem is read-only; we'll show a gentle warning later.
     pass
 
+# 이미지 파생본(WebP/AVIF) 생성은 프로세스당 한 번 백그라운드로 시작
+try:
+    _warm_store = _process_store("image_derivatives_warm")
+    with _warm_store["lock"]:
+        if not _warm_store.get("started"):
+            _warm_store["started"] = True
+            _warm_image_derivatives()
+except Exception:
+    pass
+
 # --- 스크롤 위치 초기화: 화면(stage) 전환 시 상단으로 이동 ---
 _prev = st.session_state.get('_prev_stage')
 _cur = st.session_state.get('stage', 'intro')
@@ -3865,7 +7553,7 @@ if pending:
     )
     st.rerun()
 with st.sidebar:
-    # 사이드바에는 관리자 대시보드만 노출합니다. (기관 전광판은 관리자 대시보드 내에서만 확인)
+    # 사이드바: 관리자 대시보드 진입 + (학습 화면에서는) 기관 전광판
     st.caption("관리자")
     if st.button("🔐 관리자 대시보드", use_container_width=True):
         if st.session_state.get("admin_authed", False):
@@ -3878,6 +7566,12 @@ with st.sidebar:
             _clear_persisted_admin_auth()
             st.rerun()
 
+if st.session_state.get("stage") != "admin":
+    try:
+        render_org_electronic_board_sidebar()
+    except Exception:
+        pass
+
 try:
     if st.session_state.stage == "intro":
         render_top_spacer()
@@ -3931,13 +7625,14 @@ try:
             elif emp_df is None or emp_df.empty:
                 st.warning("직원 명단 파일을 찾지 못했습니다. app.py와 같은 폴더에 직원 명단 파일(csv/xlsx)을 넣어주세요.")
             else:
-                exact = emp_df[emp_df["name"].astype(str).str.strip() == q].copy()
-                partial = emp_df[emp_df["name"].astype(str).str.contains(q, case=False, na=False)].copy()
-                candidates = exact if not exact.empty else partial
+                hit_ids, hit_mode = _search_employee_index(_employee_search_index(emp_df), q)
+                candidates = emp_df.iloc[hit_ids]
                 st.session_state.employee_lookup_candidates = candidates.to_dict("records")
                 if candidates.empty:
                     st.warning("일치하는 성명이 없습니다. 성함을 다시 확인해주세요.")
                 else:
+                    if hit_mode in ("chosung", "typo"):
+                        st.info("정확히 일치하는 성명이 없어 초성/유사 이름으로 찾은 결과입니다.")
                     st.success(f"조회 결과 {len(candidates)}건 · 팝업에서 본인 정보를 확인해주세요.")
                     st.session_state.employee_lookup_modal_open = True
 
@@ -4121,7 +7816,7 @@ try:
 
         _ending_img = get_ending_image()
         if _ending_img:
-            st.image(str(_ending_img), use_container_width=True)
+            render_asset_image(_ending_img)
 
         st.markdown("<div class='brief-actions-wrap'></div>", unsafe_allow_html=True)
         c1, c2 = st.columns([1, 1], gap='large')